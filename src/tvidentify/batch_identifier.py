@@ -1,18 +1,95 @@
 
 import argparse
-import json
+import functools
+import hashlib
 import os
+import re
+import sys
 import logging
-from typing import List, Tuple, Optional, Any, Dict
+import textwrap
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Optional, Any, Dict, Iterable, TextIO
 
-from .subtitle_extractor import extract_subtitles, add_extraction_args
-from .episode_identifier import identify_episode, add_llm_args
+from .subtitle_extractor import extract_subtitles, add_extraction_args, SubtitleExtractionSession, batch_ocr_workers
+from .episode_identifier import identify_episode, add_llm_args, set_rate_limits, warm_up_connection
 from .file_renamer import rename_file
-from .utils import check_required_tools, setup_logging, DEFAULT_MODELS, add_logging_args
+from .utils import (
+    check_required_tools,
+    setup_logging,
+    DEFAULT_MODELS,
+    add_logging_args,
+    dumps_json,
+    loads_json,
+    get_cache_dir
+)
 
 logger = logging.getLogger(__name__)
 
-def get_subtitle_fingerprint(video_file: str, subtitle_track_index: Optional[int], offset_minutes: int, scan_duration_minutes: int, num_events: int = 20) -> Tuple[Optional[Tuple[int, ...]], Optional[List[str]]]:
+# File name of the persistent fingerprint cache inside get_cache_dir()
+FINGERPRINT_CACHE_FILE = "fingerprints.json"
+
+# Match the escaped {season...}/{episode...} placeholders in a re.escape()d rename format
+_SEASON_RE = re.compile(r'\\\{season.*?\\\}')
+_EPISODE_RE = re.compile(r'\\\{episode.*?\\\}')
+
+def load_fingerprint_store(path: str) -> Dict[str, Any]:
+    """
+    Loads the persistent fingerprint cache written by save_fingerprint_store.
+    
+    Returns an empty dict if the file is missing or unreadable.
+    """
+    try:
+        with open(path, 'rb') as f:
+            store = loads_json(f.read())
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read fingerprint cache %s: %s", path, e)
+        return {}
+    return store if isinstance(store, dict) else {}
+
+def save_fingerprint_store(store: Dict[str, Any], path: str) -> None:
+    """
+    Atomically writes the persistent fingerprint cache to `path`.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(dumps_json(store))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not save fingerprint cache %s: %s", path, e)
+
+def _fingerprint_subtitles(subtitles: List[str], num_events: int) -> bytes:
+    """
+    Returns the fingerprint of the first num_events subtitles. Unlike hash(), BLAKE2b is
+    stable across processes so the fingerprint can be persisted.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for sub in subtitles[:num_events]:
+        digest.update(sub.encode('utf-8'))
+        digest.update(b'\x1f')
+    return digest.digest()
+
+def _prune_fingerprint_store(store: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Returns the entries of a fingerprint cache whose video file still exists unchanged,
+    so moved, renamed, modified and deleted files don't leave entries behind forever.
+    """
+    pruned = {}
+    for key, entry in store.items():
+        try:
+            st = os.stat(entry["path"])
+            if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+                pruned[key] = entry
+        except (OSError, KeyError, TypeError, ValueError):
+            continue
+    return pruned
+
+def get_subtitle_fingerprint(video_file: str, subtitle_track_index: Optional[int], offset_minutes: int, scan_duration_minutes: int, num_events: int = 20, store: Optional[Dict[str, Any]] = None, ocr_backend: str = "tesseract", session: Optional[SubtitleExtractionSession] = None) -> Tuple[Optional[bytes], Optional[List[str]]]:
     """
     Get a fingerprint of extracted subtitles for duplicate detection.
     
@@ -24,10 +101,42 @@ def get_subtitle_fingerprint(video_file: str, subtitle_track_index: Optional[int
         offset_minutes: Offset in minutes
         scan_duration_minutes: Duration to scan in minutes
         num_events: Number of subtitles to extract for fingerprint (default: 20)
+        store: Optional persistent cache (see load_fingerprint_store). Entries are keyed by
+               the file's path, size and mtime plus the extraction settings, so unchanged
+               files skip subtitle extraction entirely on re-runs.
+        ocr_backend: OCR engine used for extraction (see subtitle_extractor.OCR_BACKENDS)
+        session: Optional subtitle extraction session shared by the files of a batch
     
     Returns:
-        tuple: ((fingerprint as tuple of subtitle hashes, subtitles), or (None, None) if error)
+        tuple: ((fingerprint as a 16-byte BLAKE2b digest, subtitles), or (None, None) if error)
     """
+    store_key = None
+    if store is not None:
+        try:
+            st = os.stat(video_file)
+        except OSError:
+            pass
+        else:
+            abs_path = os.path.abspath(video_file)
+            store_key = (
+                f"{st.st_size}:{st.st_mtime_ns}:{abs_path}"
+                f"|{subtitle_track_index}:{offset_minutes}:{scan_duration_minutes}:{num_events}:{ocr_backend}"
+            )
+            cached = store.get(store_key)
+            if cached:
+                # A hand-edited or older-format entry is treated as a miss
+                try:
+                    fingerprint, subtitles = bytes.fromhex(cached["fingerprint"]), cached["subtitles"]
+                    if not isinstance(subtitles, list) or not all(isinstance(line, str) for line in subtitles):
+                        raise TypeError("subtitles is not a list of strings")
+                    if not subtitles:
+                        raise ValueError("no subtitles")
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.debug("  Ignoring unusable fingerprint cache entry: %s", e)
+                else:
+                    logger.info("  Using cached subtitles for fingerprint.")
+                    return fingerprint, subtitles
+
     try:
         # Extract subtitles to use as fingerprint
         subtitles = extract_subtitles(
@@ -35,19 +144,43 @@ def get_subtitle_fingerprint(video_file: str, subtitle_track_index: Optional[int
             subtitle_track_index=subtitle_track_index,
             offset_minutes=offset_minutes,
             max_frames=num_events,
-            scan_duration_minutes=scan_duration_minutes
+            scan_duration_minutes=scan_duration_minutes,
+            ocr_backend=ocr_backend,
+            session=session
         )
         
         if not subtitles:
             return None, None
         
-        # Create a fingerprint from the subtitle hashes
-        fingerprint = tuple(hash(sub) for sub in subtitles[:num_events])
+        fingerprint = _fingerprint_subtitles(subtitles, num_events)
+        if store_key is not None:
+            store[store_key] = {
+                "fingerprint": fingerprint.hex(),
+                "subtitles": subtitles,
+                # Lets _prune_fingerprint_store drop the entry once the file is gone or changed
+                "path": abs_path,
+                "size": st.st_size,
+                "mtime_ns": st.st_mtime_ns
+            }
         return fingerprint, subtitles  # Return both fingerprint and extracted subtitles
     except Exception as e:
         logger.error("  Error generating fingerprint: %s", e)
         return None, None
 
+@functools.lru_cache(maxsize=32)
+def _compile_name_pattern(series_name: str, rename_format: str) -> re.Pattern:
+    """
+    Build and compile the regex matching filenames produced by rename_format.
+    
+    Cached per (series_name, rename_format) so a batch run compiles it once.
+    """
+    # Replace placeholders with regex groups
+    pattern = re.escape(rename_format)
+    pattern = pattern.replace(r'\{series\}', re.escape(series_name))
+    pattern = _SEASON_RE.sub(r'\\d+', pattern)
+    pattern = _EPISODE_RE.sub(r'\\d+', pattern)
+    return re.compile(f'^{pattern}$', re.IGNORECASE)
+
 def is_already_named(filename: str, series_name: str, rename_format: str = "{series} S{season:02d}E{episode:02d}") -> bool:
     """
     Check if a filename matches the expected naming format.
@@ -60,24 +193,12 @@ def is_already_named(filename: str, series_name: str, rename_format: str = "{ser
     Returns:
         bool: True if the filename matches the expected format, False otherwise
     """
-    import re
-    
     # Get the filename without extension
     name_without_ext = os.path.splitext(filename)[0]
     
-    # Build a regex pattern from the rename_format string
-    # Replace placeholders with regex groups
-    pattern = re.escape(rename_format)
-    pattern = pattern.replace(r'\{series\}', re.escape(series_name))
-    pattern = re.sub(r'\\\{season.*?\\\}', r'\\d+', pattern)
-    pattern = re.sub(r'\\\{episode.*?\\\}', r'\\d+', pattern)
-    pattern = f'^{pattern}$'
-    
     # Check if the filename matches the expected format
     try:
-        match = re.match(pattern, name_without_ext, re.IGNORECASE)
-        if match:
-            return True
+        return _compile_name_pattern(series_name, rename_format).match(name_without_ext) is not None
     except re.error as e:
         # If regex fails, fall back to false
         logger.debug("    [DEBUG] Regex error: %s", e)
@@ -98,27 +219,291 @@ def find_episode_files(directory: str, extension: str = ".mkv", size_threshold:
         list[str]: A list of full paths to the likely episode files.
     """
     files_with_sizes = []
-    for entry in os.scandir(directory):
-        if entry.is_file() and entry.name.lower().endswith(extension):
+    max_size = 0
+    ext_lower = extension.lower()
+    ext_len = len(ext_lower)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            # Check the name first (lowercasing only its tail) so sidecar files are
+            # rejected without a full-name copy or an is_file() stat
+            name = entry.name
+            if len(name) < ext_len or name[len(name) - ext_len:].lower() != ext_lower:
+                continue
+            if not entry.is_file():
+                continue
             try:
                 size = entry.stat().st_size
-                if size > 0:
-                    files_with_sizes.append((entry.path, size))
             except OSError:
                 # Ignore files that can't be stat'd
                 continue
+            if size <= 0:
+                continue
+            files_with_sizes.append((entry.path, size))
+            # Track the largest file while scanning instead of in a second pass
+            if size > max_size:
+                max_size = size
 
     if not files_with_sizes:
         return []
 
-    # Find the size of the largest file
-    max_size = max(size for _, size in files_with_sizes)
     size_limit = max_size * size_threshold
 
     # Filter for files that are close in size to the largest
-    episode_files = [path for path, size in files_with_sizes if size >= size_limit]
-    episode_files.sort()
-    return episode_files
+    return sorted(path for path, size in files_with_sizes if size >= size_limit)
+
+class _FingerprintCache:
+    """
+    Thread-safe map of subtitle fingerprint -> (filename, result) for duplicate detection.
+    
+    Files claim their fingerprints in input order (by the index each was submitted with),
+    so the first file in the input with a given fingerprint is the one identified however
+    the threads are scheduled; later files with the same fingerprint wait for its result
+    instead of calling the LLM again. Every index must either claim() or pass_turn(), and
+    every claimed fingerprint must be published or released.
+    """
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        self._entries = {}
+        self._pending = set()
+        self._next_index = 0
+        self._finished = set()
+
+    def _finish_turn(self, index: int) -> None:
+        """Marks index as done claiming and lets the next indices take their turns. Needs the lock."""
+        self._finished.add(index)
+        while self._next_index in self._finished:
+            self._finished.remove(self._next_index)
+            self._next_index += 1
+        self._lock.notify_all()
+
+    def claim(self, index: int, fingerprint) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """
+        Waits for every earlier index to take its turn, then returns the (filename, result)
+        of an earlier file with this fingerprint, or None if the caller now owns the
+        fingerprint and must call publish() or release(). If the owner releases it, one of
+        the waiting files becomes the new owner.
+        """
+        with self._lock:
+            self._lock.wait_for(lambda: self._next_index == index)
+            self._finish_turn(index)
+            self._lock.wait_for(lambda: fingerprint not in self._pending)
+            if fingerprint in self._entries:
+                return self._entries[fingerprint]
+            self._pending.add(fingerprint)
+            return None
+
+    def pass_turn(self, index: int) -> None:
+        """Gives up the turn of a file that will not claim a fingerprint; a no-op after claim()."""
+        with self._lock:
+            if index >= self._next_index:
+                self._finish_turn(index)
+
+    def publish(self, fingerprint, filename: str, result: Dict[str, Any]) -> None:
+        """Stores the result for a claimed fingerprint and wakes any waiting duplicates."""
+        with self._lock:
+            self._entries[fingerprint] = (filename, result)
+            self._pending.discard(fingerprint)
+            self._lock.notify_all()
+
+    def release(self, fingerprint) -> None:
+        """Gives up a claimed fingerprint without a result; a no-op after publish()."""
+        with self._lock:
+            if fingerprint in self._pending:
+                self._pending.discard(fingerprint)
+                self._lock.notify_all()
+
+
+def _load_prior_result(video_file: str, base_name: str, args: argparse.Namespace) -> Optional[Dict[str, Any]]:
+    """
+    Returns the <base_name>_result.json saved by an earlier run, if it can be reused.
+    
+    A saved result is reused only if it is newer than the video file, was produced by the
+    same provider and model, and did not record an error.
+    """
+    prior_file = os.path.join(args.output_dir, f"{base_name}_result.json")
+    try:
+        if os.stat(prior_file).st_mtime_ns < os.stat(video_file).st_mtime_ns:
+            return None
+        with open(prior_file, 'rb') as f:
+            prior = loads_json(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(prior, dict) or "error" in prior:
+        return None
+    if prior.get("provider") != args.provider or prior.get("model") != args.model:
+        return None
+    return prior
+
+def _rename_if_identified(video_file: str, args: argparse.Namespace, result: Dict[str, Any]) -> None:
+    """
+    Renames the file if --rename was requested and identification was successful.
+    """
+    if args.rename and result.get("season") is not None and result.get("episode") is not None:
+        rename_result = rename_file(
+            video_file,
+            args.series_name,
+            result["season"],
+            result["episode"],
+            args.rename_format
+        )
+        result["rename"] = rename_result
+        if rename_result["success"]:
+            logger.info("  Renamed to: %s", os.path.basename(rename_result['new_path']))
+        else:
+            logger.error("  Rename failed: %s", rename_result['error'])
+
+def _save_individual_result(result: Dict[str, Any], base_name: str, output_dir: str) -> None:
+    """
+    Saves a single file's result to <output_dir>/<base_name>_result.json.
+    """
+    individual_file = os.path.join(output_dir, f"{base_name}_result.json")
+    try:
+        with open(individual_file, 'w', encoding='utf-8') as f:
+            f.write(dumps_json(result))
+    except IOError as e:
+        logger.warning("  Warning: Could not save result for %s: %s", result['input_file_name'], e)
+
+def _process_video_file(index: int, video_file: str, args: argparse.Namespace, fingerprint_cache: _FingerprintCache, fingerprint_store: Optional[Dict[str, Any]] = None, session: Optional[SubtitleExtractionSession] = None) -> Dict[str, Any]:
+    """
+    Runs the fingerprint -> identify -> rename pipeline for a single video file.
+    
+    Args:
+        index: Position of the file in the batch, which decides duplicate originals
+        video_file: Path to the video file
+        args: Parsed command-line arguments
+        fingerprint_cache: Shared cache used to detect duplicate files
+        fingerprint_store: Optional persistent cache of previously extracted subtitles
+        session: Optional subtitle extraction session shared by the files of the batch
+    
+    Returns:
+        dict: The result entry for this file
+    """
+    try:
+        return _process_video_file_in_turn(index, video_file, args, fingerprint_cache, fingerprint_store, session)
+    finally:
+        # Files that end before claiming a fingerprint must not hold up later files
+        fingerprint_cache.pass_turn(index)
+
+def _process_video_file_in_turn(index: int, video_file: str, args: argparse.Namespace, fingerprint_cache: _FingerprintCache, fingerprint_store: Optional[Dict[str, Any]], session: Optional[SubtitleExtractionSession]) -> Dict[str, Any]:
+    """
+    Body of _process_video_file, which makes sure the file's turn is passed on.
+    """
+    filename = os.path.basename(video_file)
+    base_name = os.path.splitext(filename)[0]
+    
+    # Skip already-named files if requested and rename is enabled
+    if args.skip_already_named and args.rename:
+        if is_already_named(filename, args.series_name, args.rename_format):
+            logger.info("--- Skipping: %s (already in expected format) ---", filename)
+            return {
+                "input_file_name": filename,
+                "video_file_path": video_file,
+                "skipped": True,
+                "reason": "Already in expected naming format"
+            }
+    
+    logger.info("--- Processing: %s ---", filename)
+    
+    # Reuse the result saved by a previous run if the video hasn't changed since,
+    # skipping subtitle extraction and the LLM call. Its saved subtitles still go through
+    # duplicate detection, so a later copy of the file is not identified again.
+    prior = None
+    if args.output_dir and not args.no_cache:
+        prior = _load_prior_result(video_file, base_name, args)
+        if prior is not None and not prior.get("subtitles"):
+            prior = None
+    
+    result = {
+        "input_file_name": filename,
+        "video_file_path": video_file  # Store full path for renaming
+    }
+
+    # 1. Generate fingerprint for duplicate detection and extract subtitles
+    if prior is not None:
+        logger.info("  Reusing saved result from a previous run.")
+        subtitles = prior["subtitles"]
+        fingerprint = _fingerprint_subtitles(subtitles, args.max_frames)
+    else:
+        logger.info("  Generating subtitle fingerprint for duplicate detection...")
+        fingerprint, subtitles = get_subtitle_fingerprint(
+            video_file,
+            args.subtitle_track,
+            args.offset,
+            args.scan_duration,
+            num_events=args.max_frames,  # Use max_frames to extract the desired number of subtitles
+            store=fingerprint_store,
+            ocr_backend=args.ocr_backend,
+            session=session
+        )
+    
+    if fingerprint is None:
+        result["error"] = "Could not generate subtitle fingerprint."
+        return result
+    
+    # 2. Check if this is a duplicate
+    cached = fingerprint_cache.claim(index, fingerprint)
+    if cached is not None:
+        original_filename, original_result = cached
+        result["duplicate_of"] = original_filename
+        result["season"] = original_result.get("season")
+        result["episode"] = original_result.get("episode")
+        result["subtitles"] = original_result.get("subtitles", [])
+        result["provider"] = args.provider
+        result["model"] = args.model
+        logger.info("  Duplicate detected! Matches: %s", original_filename)
+        return result
+
+    # 3. Identify episode if subtitles were found
+    try:
+        if prior is not None:
+            prior["video_file_path"] = video_file
+            prior.pop("rename", None)
+            fingerprint_cache.publish(fingerprint, filename, prior)
+            _rename_if_identified(video_file, args, prior)
+            if "rename" in prior:
+                _save_individual_result(prior, base_name, args.output_dir)
+            return prior
+        elif subtitles:
+            id_result = identify_episode(args.series_name, subtitles, model=args.model, provider=args.provider, dedupe=args.dedupe, use_cache=not args.no_cache, early_exit_threshold=args.early_exit_threshold)
+            result.update(id_result)
+            result["subtitles"] = subtitles
+            result["provider"] = args.provider
+            result["model"] = args.model
+            # Cache this result for future duplicates (and wake any waiting ones)
+            fingerprint_cache.publish(fingerprint, filename, result)
+            
+            # 4. Rename file if requested and identification was successful
+            _rename_if_identified(video_file, args, result)
+        else:
+            result["error"] = "Could not extract subtitles."
+    finally:
+        # Without a published result, a waiting duplicate is identified on its own instead
+        fingerprint_cache.release(fingerprint)
+
+    # Save individual result immediately after processing each file
+    if args.output_dir:
+        _save_individual_result(result, base_name, args.output_dir)
+
+    return result
+
+def _write_json_array(results: Iterable[Dict[str, Any]], out: TextIO) -> None:
+    """
+    Writes results to `out` as a JSON array, one element at a time.
+    
+    Produces the same layout as json.dump(list, indent=2) without holding the whole
+    list or its serialized form in memory, and flushes after every element so
+    partial progress is visible on disk.
+    """
+    out.write('[')
+    first = True
+    for result in results:
+        out.write('\n' if first else ',\n')
+        out.write(textwrap.indent(dumps_json(result, pretty=True), '  '))
+        out.flush()
+        first = False
+    out.write(']\n' if first else '\n]\n')
 
 def main():
     """
@@ -145,6 +530,14 @@ def main():
         help='Format for renamed files. Available placeholders: {{series}}, {{season}}, {{episode}}. '
              'Default: "{{series}} S{{season:02d}}E{{episode:02d}}"'
     )
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Number of files to process concurrently (default: 1).'
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Do not read or write the on-disk caches of previously extracted subtitles and LLM answers, or reuse saved results.'
+    )
     
     add_llm_args(parser)
     add_extraction_args(parser)
@@ -169,6 +562,7 @@ def main():
     # Set default model based on provider
     if args.model is None:
         args.model = DEFAULT_MODELS.get(args.provider, "gemini-2.5-flash")
+    set_rate_limits(args.max_rpm, args.max_tpm)
 
     # Find potential episode files based on size
     episode_files = find_episode_files(args.input_dir, size_threshold=args.size_threshold)
@@ -178,119 +572,68 @@ def main():
         return
 
     logger.info("Found %d potential episode files. Processing...", len(episode_files))
+    
+    # Connect to the provider while the first subtitles are extracted
+    warm_up_connection(args.provider)
 
-    all_results = []
-    fingerprint_cache = {}  # Maps fingerprint -> (filename, result)
+    fingerprint_cache = _FingerprintCache()
+    
+    # Load the persistent fingerprint cache so unchanged files skip subtitle extraction
+    fingerprint_store = None
+    fingerprint_store_path = os.path.join(get_cache_dir(), FINGERPRINT_CACHE_FILE)
+    if not args.no_cache:
+        fingerprint_store = load_fingerprint_store(fingerprint_store_path)
+        loaded_store_keys = set(fingerprint_store)
     
     # Create output directory if specified
     if args.output_dir:
         os.makedirs(args.output_dir, exist_ok=True)
     
-    for video_file in episode_files:
-        filename = os.path.basename(video_file)
-        
-        # Skip already-named files if requested and rename is enabled
-        if args.skip_already_named and args.rename:
-            if is_already_named(filename, args.series_name, args.rename_format):
-                logger.info("--- Skipping: %s (already in expected format) ---", filename)
-                result = {
-                    "input_file_name": filename,
-                    "video_file_path": video_file,
-                    "skipped": True,
-                    "reason": "Already in expected naming format"
-                }
-                all_results.append(result)
-                continue
-        
-        logger.info("--- Processing: %s ---", filename)
-        result = {
-            "input_file_name": filename,
-            "video_file_path": video_file  # Store full path for renaming
-        }
-
-        # 1. Generate fingerprint for duplicate detection and extract subtitles
-        logger.info("  Generating subtitle fingerprint for duplicate detection...")
-        fingerprint, subtitles = get_subtitle_fingerprint(
-            video_file,
-            args.subtitle_track,
-            args.offset,
-            args.scan_duration,
-            num_events=args.max_frames  # Use max_frames to extract the desired number of subtitles
-        )
-        
-        if fingerprint is None:
-            result["error"] = "Could not generate subtitle fingerprint."
-            all_results.append(result)
-            continue
-        
-        # 2. Check if this is a duplicate
-        if fingerprint in fingerprint_cache:
-            original_filename, original_result = fingerprint_cache[fingerprint]
-            result["duplicate_of"] = original_filename
-            result["season"] = original_result.get("season")
-            result["episode"] = original_result.get("episode")
-            result["subtitles"] = original_result.get("subtitles", [])
-            result["provider"] = args.provider
-            result["model"] = args.model
-            logger.info("  Duplicate detected! Matches: %s", original_filename)
-            all_results.append(result)
-            continue
-
-        # 3. Identify episode if subtitles were found
-        if subtitles:
-            id_result = identify_episode(args.series_name, subtitles, model=args.model, provider=args.provider)
-            result.update(id_result)
-            result["subtitles"] = subtitles
-            result["provider"] = args.provider
-            result["model"] = args.model
-            # Cache this result for future duplicates
-            fingerprint_cache[fingerprint] = (os.path.basename(video_file), result)
-            
-            # 4. Rename file if requested and identification was successful
-            if args.rename and result.get("season") is not None and result.get("episode") is not None:
-                rename_result = rename_file(
-                    video_file,
-                    args.series_name,
-                    result["season"],
-                    result["episode"],
-                    args.rename_format
-                )
-                result["rename"] = rename_result
-                if rename_result["success"]:
-                    logger.info("  Renamed to: %s", os.path.basename(rename_result['new_path']))
-                else:
-                    logger.error("  Rename failed: %s", rename_result['error'])
-        else:
-            result["error"] = "Could not extract subtitles."
-
-        all_results.append(result)
-        
-        # Save individual result immediately after processing each file
-        if args.output_dir:
-            if "input_file_name" in result:
-                base_name = os.path.splitext(result["input_file_name"])[0]
-                individual_file = os.path.join(args.output_dir, f"{base_name}_result.json")
-                try:
-                    with open(individual_file, 'w') as f:
-                        json.dump(result, f, indent=2)
-                except IOError as e:
-                    logger.warning("  Warning: Could not save result for %s: %s", result['input_file_name'], e)
-
-    # Print the final JSON output
-    logger.info("--- Batch Identification Complete ---")
-    
-    # Save/print batch results summary
+    # Stream the batch summary to batch_results.json, or to stdout if no output_dir specified
+    output_file = None
+    out = sys.stdout  # Keep stdout clean for piping
     if args.output_dir:
         output_file = os.path.join(args.output_dir, "batch_results.json")
         try:
-            with open(output_file, 'w') as f:
-                json.dump(all_results, f, indent=2)
-            logger.info("Batch summary saved to: %s", output_file)
+            out = open(output_file, 'w', encoding='utf-8')
         except IOError as e:
             logger.error("Error saving batch results summary: %s", e)
-    else:
-        # Print to console if no output_dir specified
-        print(json.dumps(all_results, indent=2)) # Keep stdout clean for piping
+            output_file = None
+    
+    # Subtitle extraction and LLM calls are I/O bound, so overlap them across files.
+    # Results are written in input order to keep the summary deterministic.
+    # The files also share one pool of OCR threads, so each thread's OCR engine is
+    # loaded once per batch rather than once per file. Each OCR thread runs its own
+    # tesseract, so the pool is capped at the CPU count however many files are in flight
+    workers = max(1, args.workers)
+    ocr_workers = batch_ocr_workers(workers)
+    try:
+        with SubtitleExtractionSession(ocr_workers=ocr_workers) as session, \
+                ThreadPoolExecutor(max_workers=workers) as executor:
+            # Tasks start in submission order, so a file only waits on earlier files' turns
+            futures = deque(
+                executor.submit(_process_video_file, index, video_file, args, fingerprint_cache, fingerprint_store, session)
+                for index, video_file in enumerate(episode_files)
+            )
+            # Pop each future as it is written so finished results can be released
+            results = (futures.popleft().result() for _ in range(len(futures)))
+            try:
+                _write_json_array(results, out)
+            except IOError as e:
+                logger.error("Error saving batch results summary: %s", e)
+                output_file = None
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if fingerprint_store is not None:
+            # Only rewrite the cache if entries were added or have gone stale
+            fingerprint_store = _prune_fingerprint_store(fingerprint_store)
+            if set(fingerprint_store) != loaded_store_keys:
+                save_fingerprint_store(fingerprint_store, fingerprint_store_path)
+
+    logger.info("--- Batch Identification Complete ---")
+    if output_file:
+        logger.info("Batch summary saved to: %s", output_file)
 
 if __name__ == '__main__':
     main()
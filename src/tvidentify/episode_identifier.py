@@ -1,26 +1,593 @@
 import argparse
+import asyncio
+import atexit
+import contextlib
+import functools
+import glob
+import hashlib
+import importlib.util
 import json
 import os
 import re
+import string
+import time
 import logging
-from typing import List, Dict, Optional, Any, Union
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, List, Dict, Optional, Any, Union, Sequence, Tuple, Iterable, AsyncIterable, Callable
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a character-based estimate
+    tiktoken = None
 
-from google.genai import Client
-from openai import OpenAI
 from .utils import (
     check_required_tools, 
     setup_logging, 
     check_api_key, 
     DEFAULT_MODELS, 
+    API_KEY_ENV_VARS,
     EPISODE_IDENTIFICATION_PROMPT,
-    add_logging_args
+    BATCH_EPISODE_IDENTIFICATION_PROMPT,
+    BATCH_ITEM_TEMPLATE,
+    add_logging_args,
+    dumps_json,
+    get_cache_dir,
+    loads_json
 )
-from .subtitle_extractor import add_extraction_args, extract_subtitles
+from .subtitle_extractor import add_extraction_args, extract_subtitles_batch
+
+# The provider SDKs are slow to import, so each is only imported once that provider is used
+if TYPE_CHECKING:
+    from google.genai import Client
+    from openai import OpenAI, AsyncOpenAI
 
 logger = logging.getLogger(__name__)
 
+PERPLEXITY_BASE_URL = "https://api.perplexity.ai"
+
+# JSON in LLM responses: a fenced code block (```json or bare ```), or else the
+# outermost braces/brackets
+_JSON_BLOCK_RE = re.compile(r"```(?:json)?\s*({.*?})\s*```", re.DOTALL)
+_JSON_BRACE_RE = re.compile(r"\{.*\}", re.DOTALL)
+_JSON_ARRAY_BLOCK_RE = re.compile(r"```(?:json)?\s*(\[.*?\])\s*```", re.DOTALL)
+_JSON_BRACKET_RE = re.compile(r"\[.*\]", re.DOTALL)
+
+# Structured-output settings so providers return bare JSON in the identification format
+_EPISODE_JSON_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "season": {"type": ["integer", "null"]},
+        "episode": {"type": ["integer", "null"]},
+        "confidence_score": {"type": "integer"},
+        "reasoning": {"type": "string"},
+    },
+    "required": ["season", "episode", "confidence_score", "reasoning"],
+}
+_GEMINI_JSON_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {
+        "type": "OBJECT",
+        "properties": {
+            "season": {"type": "INTEGER", "nullable": True},
+            "episode": {"type": "INTEGER", "nullable": True},
+            "confidence_score": {"type": "INTEGER"},
+            "reasoning": {"type": "STRING"},
+        },
+        "required": ["season", "episode", "confidence_score", "reasoning"],
+        # Gemini orders properties alphabetically unless told otherwise; keep the answer
+        # ahead of the reasoning so streamed responses can stop early
+        "property_ordering": ["season", "episode", "confidence_score", "reasoning"],
+    },
+}
+_RESPONSE_FORMATS = {
+    "openai": {"type": "json_object"},
+    "perplexity": {"type": "json_schema", "json_schema": {"schema": _EPISODE_JSON_SCHEMA}},
+}
+
+# Completed "key": value pairs in a partially streamed JSON answer
+_STREAM_FIELD_RES = {
+    key: re.compile(rf'"{key}"\s*:\s*(\d+|null)\s*[,}}]')
+    for key in ("season", "episode", "confidence_score")
+}
+
+# Models that rejected response_format (e.g. gpt-4); later calls to them don't send it
+_NO_JSON_MODE_MODELS = set()
+
+# Subtitle preprocessing: bracketed SDH tags like [music], and a cap on prompt subtitle text
+_BRACKET_TAG_RE = re.compile(r"\[[^\]]+\]")
+MAX_SUBTITLE_CHARS = 4000
+
+
+def preprocess_subtitles(subtitles: List[str], max_chars: int = MAX_SUBTITLE_CHARS) -> List[str]:
+    """
+    Shrinks subtitles for the prompt: strips [tags], drops very short lines and repeats,
+    and stops once max_chars characters have been kept.
+
+    Args:
+        subtitles (list[str]): A list of subtitle strings.
+        max_chars (int): Maximum total length of the returned subtitles.
+
+    Returns:
+        list[str]: The cleaned subtitles, in their original order.
+    """
+    kept = []
+    total = 0
+    for line in dict.fromkeys(_BRACKET_TAG_RE.sub("", s).strip() for s in subtitles):
+        if len(line) <= 3:
+            continue
+        if kept and total + len(line) > max_chars:
+            break
+        kept.append(line)
+        total += len(line) + 1
+    return kept
+
+
+def _subtitle_text(subtitles: List[str], dedupe: bool = True) -> str:
+    """
+    Joins subtitles into a single block of text for the prompt.
+    """
+    if dedupe:
+        # Keep the raw lines if cleaning would leave nothing to send
+        subtitles = preprocess_subtitles(subtitles) or subtitles
+    return "\n".join(subtitles)
+
+
+# Context window sizes in tokens, matched by model-name prefix (more specific names first)
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4o": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "gemini": 1048576,
+    "sonar": 127072,
+}
+DEFAULT_CONTEXT_TOKENS = 8192
+# Room left in the context window for the model's answer
+RESERVED_OUTPUT_TOKENS = 1024
+
+
+def _context_tokens(model: str) -> int:
+    """
+    Returns the context window size for a model, or DEFAULT_CONTEXT_TOKENS if it is unknown.
+    """
+    for name, tokens in MODEL_CONTEXT_TOKENS.items():
+        if model.startswith(name):
+            return tokens
+    return DEFAULT_CONTEXT_TOKENS
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model: str) -> Any:
+    """
+    Returns the tiktoken encoding for a model, or None if tiktoken is unavailable.
+    
+    Models tiktoken doesn't know (e.g. Gemini, Sonar) use cl100k_base as an approximation.
+    """
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # e.g. the encoding file can't be downloaded
+        logger.debug("No tiktoken encoding for %s (%s); estimating tokens from length.", model, e)
+        return None
+
+
+def _count_tokens(prompt: str, model: str) -> int:
+    """
+    Counts the prompt's tokens with tiktoken, or estimates them (about 4 characters per token).
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(prompt))
+    return len(prompt) // 4
+
+
+def _truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """
+    Cuts text down to at most max_tokens tokens, counted like _count_tokens.
+    """
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens])
+    return text[:max_tokens * 4]
+
+
+@functools.lru_cache(maxsize=32)
+def make_prompt_builder(series_name: str) -> Callable[[str], str]:
+    """
+    Returns a function that builds EPISODE_IDENTIFICATION_PROMPT for this series from the
+    subtitle text.
+    
+    The template is formatted once per series; each prompt is then a single concatenation,
+    and every prompt for the series shares the same prefix.
+    """
+    prefix, suffix = EPISODE_IDENTIFICATION_PROMPT.split("{subtitle_text}")
+    prefix = prefix.format(series_name=series_name)
+    suffix = suffix.format()
+    return lambda subtitle_text: prefix + subtitle_text + suffix
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Parses a str.format template once and returns a function that renders it from keyword
+    arguments, giving the same result as template.format(**fields).
+    
+    Templates used on every request then skip re-parsing their (long) literal text.
+    """
+    parts = [(literal, field, spec) for literal, field, spec, _ in string.Formatter().parse(template)]
+    
+    def render(**fields: Any) -> str:
+        return "".join(
+            literal if field is None else literal + format(fields[field], spec)
+            for literal, field, spec in parts
+        )
+    return render
+
+
+_render_batch_item = compile_template(BATCH_ITEM_TEMPLATE)
+_render_batch_prompt = compile_template(BATCH_EPISODE_IDENTIFICATION_PROMPT)
+
+
+def _build_prompt(series_name: str, subtitles: List[str], model: str, dedupe: bool = True) -> str:
+    """
+    Builds the identification prompt, dropping trailing subtitles until it fits the model's
+    context window (less RESERVED_OUTPUT_TOKENS). A single subtitle that is still too long
+    is cut short.
+    """
+    if dedupe:
+        subtitles = preprocess_subtitles(subtitles) or subtitles
+    limit = _context_tokens(model) - RESERVED_OUTPUT_TOKENS
+    build = make_prompt_builder(series_name)
+    
+    prompt = build("\n".join(subtitles))
+    while len(subtitles) > 1 and _count_tokens(prompt, model) > limit:
+        subtitles = subtitles[:int(len(subtitles) * 0.9)]
+        prompt = build("\n".join(subtitles))
+    if subtitles and _count_tokens(prompt, model) > limit:
+        budget = max(limit - _count_tokens(build(""), model), 0)
+        prompt = build(_truncate_to_tokens(subtitles[0], budget, model))
+    return prompt
+
+
+# Successful identifications are cached on disk, one file per prompt, under get_cache_dir()
+RESULT_CACHE_SUBDIR = "results"
+
+
+def _result_cache_path(prompt: str, model: str, provider: str) -> str:
+    """
+    Returns the cache file for a provider's model's answer to a prompt (which includes the
+    series name and subtitles).
+    """
+    key = hashlib.sha256(f"{provider.lower()}|{model}|{prompt}".encode("utf-8")).hexdigest()
+    return os.path.join(get_cache_dir(), RESULT_CACHE_SUBDIR, f"{key}.json")
+
+
+def _load_cached_result(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the identification result cached at path, or None if there isn't a usable one.
+    """
+    try:
+        with open(path, 'rb') as f:
+            result = loads_json(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read cached result %s: %s", path, e)
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def _save_cached_result(path: str, result: Dict[str, Any]) -> None:
+    """
+    Atomically caches a successful identification result at path; errors are not cached.
+    """
+    if "error" in result:
+        return
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(dumps_json(result))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not save cached result %s: %s", path, e)
+
+
+# Transient failures (429 rate limits, 5xx, timeouts) are retried by the SDKs themselves
+# with exponential backoff and jitter
+LLM_MAX_RETRIES = 5
+_GEMINI_HTTP_OPTIONS = {
+    "retry_options": {"attempts": LLM_MAX_RETRIES + 1, "initial_delay": 1.0, "max_delay": 60.0}
+}
+
+# HTTP/2 multiplexes concurrent requests over one connection; httpx needs the optional h2
+# package for it. (Not for Gemini's async client when it uses aiohttp, which has no HTTP/2.)
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+if HTTP2_AVAILABLE:
+    _GEMINI_HTTP_OPTIONS["client_args"] = {"http2": True}
+    if importlib.util.find_spec("aiohttp") is None:
+        _GEMINI_HTTP_OPTIONS["async_client_args"] = {"http2": True}
+
+
+def _openai_http_client(async_client: bool = False) -> Any:
+    """
+    Returns an HTTP/2 httpx client for the OpenAI SDK, or None (the SDK's default
+    HTTP/1.1 client) if h2 is not installed.
+    """
+    if not HTTP2_AVAILABLE:
+        return None
+    import httpx
+    import openai
+    
+    client_class = openai.DefaultAsyncHttpxClient if async_client else openai.DefaultHttpxClient
+    return client_class(http2=True, limits=httpx.Limits(max_connections=100, max_keepalive_connections=20))
+
+
+class RateLimiter:
+    """
+    Rolling one-minute request and token budget shared by all LLM calls in the process.
+    
+    Safe to use from several threads and from asyncio tasks.
+    """
+    
+    def __init__(self, max_rpm: Optional[int] = None, max_tpm: Optional[int] = None):
+        self.max_rpm = max_rpm
+        self.max_tpm = max_tpm
+        self._lock = threading.Lock()
+        self._calls = deque()  # (monotonic time, tokens) of calls in the last minute
+        self._tokens = 0
+    
+    def _reserve(self, tokens: int) -> float:
+        """
+        Records a call if the budget allows it now; otherwise returns how long to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._calls and now - self._calls[0][0] >= 60:
+                self._tokens -= self._calls.popleft()[1]
+            
+            wait = 0.0
+            if self.max_rpm and len(self._calls) >= self.max_rpm:
+                wait = self._calls[len(self._calls) - self.max_rpm][0] + 60 - now
+            if self.max_tpm and self._calls and self._tokens + tokens > self.max_tpm:
+                # Wait until enough of the oldest calls' tokens have aged out of the window
+                freed = 0
+                for started, used in self._calls:
+                    freed += used
+                    if self._tokens - freed + tokens <= self.max_tpm:
+                        break
+                wait = max(wait, started + 60 - now)
+            
+            if wait <= 0:
+                self._calls.append((now, tokens))
+                self._tokens += tokens
+            return wait
+    
+    def acquire(self, tokens: int = 0) -> None:
+        """
+        Blocks until a call using the given number of tokens fits in the budget.
+        """
+        wait = self._reserve(tokens)
+        while wait > 0:
+            logger.debug("Rate limit reached; waiting %.1fs.", wait)
+            time.sleep(wait)
+            wait = self._reserve(tokens)
+    
+    async def acquire_async(self, tokens: int = 0) -> None:
+        """
+        Async version of acquire.
+        """
+        wait = self._reserve(tokens)
+        while wait > 0:
+            logger.debug("Rate limit reached; waiting %.1fs.", wait)
+            await asyncio.sleep(wait)
+            wait = self._reserve(tokens)
+
+
+# Process-wide limiter set by set_rate_limits(); None means unlimited
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def set_rate_limits(max_rpm: Optional[int] = None, max_tpm: Optional[int] = None) -> None:
+    """
+    Limits LLM requests (and estimated prompt tokens) per minute for this process.
+    Passing neither limit removes any limit.
+    """
+    global _rate_limiter
+    _rate_limiter = RateLimiter(max_rpm, max_tpm) if (max_rpm or max_tpm) else None
+
+
+def _wait_for_rate_limit(prompt: str, model: str) -> None:
+    """
+    Blocks until the prompt fits in the process-wide rate limit, if one is set.
+    """
+    if _rate_limiter is not None:
+        _rate_limiter.acquire(_count_tokens(prompt, model))
+
+
+async def _wait_for_rate_limit_async(prompt: str, model: str) -> None:
+    """
+    Async version of _wait_for_rate_limit.
+    """
+    if _rate_limiter is not None:
+        await _rate_limiter.acquire_async(_count_tokens(prompt, model))
+
+
+@functools.lru_cache(maxsize=None)
+def _get_gemini_client(api_key: Optional[str]) -> "Client":
+    """
+    Returns a Gemini client shared by all calls with this API key, so its connection pool is reused.
+    """
+    from google.genai import Client
+    client = Client(api_key=api_key, http_options=_GEMINI_HTTP_OPTIONS)
+    atexit.register(client.close)
+    return client
+
+
+@functools.lru_cache(maxsize=None)
+def _get_openai_client(api_key: Optional[str], base_url: Optional[str] = None) -> "OpenAI":
+    """
+    Returns an OpenAI (or OpenAI-compatible) client shared by all calls with this API key and
+    base URL, so its connection pool is reused.
+    """
+    from openai import OpenAI
+    client = OpenAI(api_key=api_key, base_url=base_url, max_retries=LLM_MAX_RETRIES, http_client=_openai_http_client())
+    atexit.register(client.close)
+    return client
+
+
+def _early_answer(response_text: str, threshold: int) -> Optional[Dict[str, Any]]:
+    """
+    Returns the answer from a partially streamed response once its season, episode and
+    confidence_score are complete and the confidence is at least threshold.
+    """
+    values = {}
+    for key, pattern in _STREAM_FIELD_RES.items():
+        match = pattern.search(response_text)
+        if not match:
+            return None
+        values[key] = None if match.group(1) == "null" else int(match.group(1))
+    if values["confidence_score"] is None or values["confidence_score"] < threshold:
+        return None
+    return values
+
+
+def _read_stream(texts: Iterable[Optional[str]], early_exit_threshold: int) -> str:
+    """
+    Joins streamed response text, stopping as soon as a confident answer has arrived.
+    
+    Returns:
+        str: The full response text, or (after an early exit) the answer as a JSON object
+             without its reasoning.
+    """
+    response_text = ""
+    for text in texts:
+        if text:
+            response_text += text
+            answer = _early_answer(response_text, early_exit_threshold)
+            if answer is not None:
+                logger.debug("Confident answer received; closing the response stream early.")
+                return dumps_json(answer)
+    return response_text
+
+
+async def _read_stream_async(texts: AsyncIterable[Optional[str]], early_exit_threshold: int) -> str:
+    """
+    Async version of _read_stream.
+    """
+    response_text = ""
+    async for text in texts:
+        if text:
+            response_text += text
+            answer = _early_answer(response_text, early_exit_threshold)
+            if answer is not None:
+                logger.debug("Confident answer received; closing the response stream early.")
+                return dumps_json(answer)
+    return response_text
+
+
+def _chat_response_text(response: Any, early_exit_threshold: Optional[int]) -> str:
+    """
+    Returns the text of a chat completion, reading (and closing) it if it was streamed.
+    """
+    if early_exit_threshold is None:
+        return response.choices[0].message.content
+    with contextlib.closing(response):
+        return _read_stream((chunk.choices[0].delta.content for chunk in response if chunk.choices), early_exit_threshold)
+
 
-def identify_episode(series_name: str, subtitles: List[str], model: str = "gemini-2.5-flash", provider: str = "google") -> Dict[str, Any]:
+def warm_up_connection(provider: str) -> Optional[threading.Thread]:
+    """
+    Opens a connection to the provider in the background (DNS, TCP and TLS), so the first
+    identification request doesn't wait for it. Failures are ignored.
+    
+    Only the shared sync client is warmed; does nothing if the provider's API key is not set.
+    
+    Returns:
+        threading.Thread: The daemon thread making the warm-up request, or None.
+    """
+    provider = provider.lower()
+    api_key = os.environ.get(API_KEY_ENV_VARS.get(provider, ""))
+    if not api_key:
+        return None
+    # Create the client here so the thread only makes the (cheap, unbilled) model list request
+    if provider == "google":
+        client = _get_gemini_client(api_key)
+    else:
+        client = _get_openai_client(api_key, PERPLEXITY_BASE_URL if provider == "perplexity" else None)
+    
+    def warm_up():
+        try:
+            client.models.list()
+        except Exception as e:
+            logger.debug("Connection warm-up for %s failed: %s", provider, e)
+    
+    thread = threading.Thread(target=warm_up, name=f"{provider}-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def _json_chat_completion(client: "OpenAI", model: str, prompt: str, provider: str, early_exit_threshold: Optional[int] = None) -> str:
+    """
+    Runs a chat completion in the provider's JSON mode and returns the response text.
+    
+    Falls back to a plain completion for models that don't support JSON mode. With an
+    early_exit_threshold, the response is streamed and cut short once it is confident enough.
+    """
+    from openai import BadRequestError
+    
+    request = {"model": model, "messages": [{"role": "user", "content": prompt}], "temperature": 0}
+    if early_exit_threshold is not None:
+        request["stream"] = True
+    if model not in _NO_JSON_MODE_MODELS:
+        try:
+            response = client.chat.completions.create(response_format=_RESPONSE_FORMATS[provider], **request)
+            return _chat_response_text(response, early_exit_threshold)
+        except BadRequestError as e:
+            logger.debug("%s rejected JSON mode (%s); retrying without it.", model, e)
+            _NO_JSON_MODE_MODELS.add(model)
+    response = client.chat.completions.create(**request)
+    return _chat_response_text(response, early_exit_threshold)
+
+
+async def _chat_response_text_async(response: Any, early_exit_threshold: Optional[int]) -> str:
+    """
+    Async version of _chat_response_text.
+    """
+    if early_exit_threshold is None:
+        return response.choices[0].message.content
+    try:
+        return await _read_stream_async((chunk.choices[0].delta.content async for chunk in response if chunk.choices), early_exit_threshold)
+    finally:
+        await response.close()
+
+
+async def _json_chat_completion_async(client: "AsyncOpenAI", model: str, prompt: str, provider: str, early_exit_threshold: Optional[int] = None) -> str:
+    """
+    Async version of _json_chat_completion.
+    """
+    from openai import BadRequestError
+    
+    request = {"model": model, "messages": [{"role": "user", "content": prompt}], "temperature": 0}
+    if early_exit_threshold is not None:
+        request["stream"] = True
+    if model not in _NO_JSON_MODE_MODELS:
+        try:
+            response = await client.chat.completions.create(response_format=_RESPONSE_FORMATS[provider], **request)
+            return await _chat_response_text_async(response, early_exit_threshold)
+        except BadRequestError as e:
+            logger.debug("%s rejected JSON mode (%s); retrying without it.", model, e)
+            _NO_JSON_MODE_MODELS.add(model)
+    response = await client.chat.completions.create(**request)
+    return await _chat_response_text_async(response, early_exit_threshold)
+
+
+def identify_episode(series_name: str, subtitles: List[str], model: str = "gemini-2.5-flash", provider: str = "google", dedupe: bool = True, use_cache: bool = True, early_exit_threshold: Optional[int] = None) -> Dict[str, Any]:
     """
     Uses an LLM to identify the season and episode number from a list of subtitles.
 
@@ -29,6 +596,12 @@ def identify_episode(series_name: str, subtitles: List[str], model: str = "gemin
         subtitles (list[str]): A list of subtitle strings.
         model (str): The model to use (e.g., "gemini-2.5-flash", "gpt-4", "sonar").
         provider (str): The LLM provider - "google", "openai", or "perplexity".
+        dedupe (bool): If True, clean and deduplicate the subtitles before building the prompt.
+        use_cache (bool): If True, reuse (and save) results cached on disk for the same
+                          model and prompt, skipping the LLM call entirely on a hit.
+        early_exit_threshold (int): If set, stream the response and stop reading it as soon as
+                                    the answer has a confidence_score of at least this value
+                                    (its reasoning is then left out). Disabled by default.
 
     Returns:
         dict: A dictionary containing the season and episode, or an error message.
@@ -36,33 +609,37 @@ def identify_episode(series_name: str, subtitles: List[str], model: str = "gemin
     if not subtitles:
         return {"error": "Could not identify episode: No subtitles provided."}
     
+    # Build the prompt from the centralized template, trimmed to fit the model's context
+    prompt = _build_prompt(series_name, subtitles, model, dedupe)
+    
+    cache_path = _result_cache_path(prompt, model, provider) if use_cache else None
+    if cache_path:
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            logger.info("Using cached identification from %s.", cache_path)
+            return cached
+    
     # Check for API key before proceeding
     if not check_api_key(provider):
         return {"error": f"Missing API key for provider: {provider}"}
 
-    # Join the subtitles into a single block of text for the prompt
-    subtitle_text = "\n".join(subtitles)
-
-    # Use the centralized prompt template
-    prompt = EPISODE_IDENTIFICATION_PROMPT.format(
-        series_name=series_name,
-        subtitle_text=subtitle_text
-    )
+    call = _PROVIDERS.get(provider.lower())
+    if call is None:
+        return {"error": f"Unknown provider: {provider}. Supported providers: google, openai, perplexity"}
+    logger.info("Asking %s to identify the episode...", model)
     try:
-        if provider.lower() == "google":
-            return _identify_episode_google(prompt, model)
-        elif provider.lower() == "openai":
-            return _identify_episode_openai(prompt, model)
-        elif provider.lower() == "perplexity":
-            return _identify_episode_perplexity(prompt, model)
-        else:
-            return {"error": f"Unknown provider: {provider}. Supported providers: google, openai, perplexity"}
+        result = _result_from_response_text(call(prompt, model, early_exit_threshold))
     except Exception as e:
         return {
             "season": None,
             "episode": None,
             "error": f"An error occurred: {e}"
         }
+    
+    # An answer cut short by an early exit has no reasoning; don't serve it to later full requests
+    if cache_path and (early_exit_threshold is None or "reasoning" in result):
+        _save_cached_result(cache_path, result)
+    return result
 
 
 def _parse_json_response(response_text: str) -> Optional[Dict[str, Any]]:
@@ -70,131 +647,561 @@ def _parse_json_response(response_text: str) -> Optional[Dict[str, Any]]:
     Helper function to parse JSON from LLM response text.
     Handles responses wrapped in markdown code blocks or plain JSON.
     """
+    # JSON mode usually returns the bare object; parse it without any regex scan
+    stripped = response_text.strip()
+    if stripped.startswith('{') and stripped.endswith('}') and '```' not in stripped:
+        return loads_json(stripped)
+    
     # Try markdown code block first
-    json_match = re.search(r"```json\n({.*?})\n```", response_text, re.DOTALL)
+    json_match = _JSON_BLOCK_RE.search(response_text)
     if json_match:
         json_str = json_match.group(1)
     else:
         # Fallback for plain JSON output
-        json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
+        json_match = _JSON_BRACE_RE.search(response_text)
+        if not json_match:
+            return None
+        json_str = json_match.group()
+    
+    return loads_json(json_str)
+
+
+def _parse_json_array_response(response_text: str) -> Optional[List[Any]]:
+    """
+    Helper function to parse a JSON array from LLM response text.
+    Handles responses wrapped in markdown code blocks or plain JSON.
+    """
+    stripped = response_text.strip()
+    if stripped.startswith('[') and stripped.endswith(']') and '```' not in stripped:
+        return loads_json(stripped)
+    
+    json_match = _JSON_ARRAY_BLOCK_RE.search(response_text)
+    if json_match:
+        json_str = json_match.group(1)
+    else:
+        json_match = _JSON_BRACKET_RE.search(response_text)
         if not json_match:
             return None
         json_str = json_match.group()
     
-    return json.loads(json_str)
+    return loads_json(json_str)
+
+
+def _call_google(prompt: str, model: str, early_exit_threshold: Optional[int] = None, *, json_mode: bool = True) -> str:
+    """
+    Sends the prompt to Google Gemini and returns the response text. In JSON mode, the
+    response is a single identification object.
+    """
+    gemini_client = _get_gemini_client(os.environ.get(API_KEY_ENV_VARS["google"]))
+    _wait_for_rate_limit(prompt, model)
+    config = _GEMINI_JSON_CONFIG if json_mode else None
+    if early_exit_threshold is None:
+        return gemini_client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=config,
+        ).text
+    
+    stream = gemini_client.models.generate_content_stream(
+        model=model,
+        contents=prompt,
+        config=config,
+    )
+    with contextlib.closing(stream):
+        return _read_stream((chunk.text for chunk in stream), early_exit_threshold)
+
+
+def _call_openai_compatible(prompt: str, model: str, early_exit_threshold: Optional[int] = None, *, provider: str, base_url: Optional[str] = None, json_mode: bool = True) -> str:
+    """
+    Sends the prompt to OpenAI, or an OpenAI-compatible API such as Perplexity, and returns
+    the response text. In JSON mode, the response is a single identification object.
+    """
+    client = _get_openai_client(os.environ.get(API_KEY_ENV_VARS[provider]), base_url)
+    _wait_for_rate_limit(prompt, model)
+    if json_mode:
+        return _json_chat_completion(client, model, prompt, provider, early_exit_threshold)
+    response = client.chat.completions.create(
+        model=model,
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0,
+        stream=early_exit_threshold is not None,
+    )
+    return _chat_response_text(response, early_exit_threshold)
+
+
+# Sends a prompt to each provider: (prompt, model, early_exit_threshold, *, json_mode=True) -> response text.
+# json_mode=False is for prompts whose answer is not a single identification object.
+_PROVIDERS = {
+    "google": _call_google,
+    "openai": functools.partial(_call_openai_compatible, provider="openai"),
+    "perplexity": functools.partial(
+        _call_openai_compatible, provider="perplexity", base_url=PERPLEXITY_BASE_URL
+    ),
+}
+
+
+def _complete_prompt(prompt: str, model: str, provider: str) -> str:
+    """
+    Sends a prompt to the provider and returns the raw response text.
+    
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    call = _PROVIDERS.get(provider.lower())
+    if call is None:
+        raise ValueError(f"Unknown provider: {provider}")
+    logger.info("Asking %s to identify the episodes...", model)
+    return call(prompt, model, json_mode=False)
+
+
+def _build_batch_prompt(jobs: Sequence[Tuple[str, List[str]]], model: str, dedupe: bool = True) -> Optional[str]:
+    """
+    Builds the batched identification prompt, dropping trailing subtitles from every item
+    until it fits the model's context window (less RESERVED_OUTPUT_TOKENS).
+    
+    Returns:
+        str: The prompt, or None if it can't be made to fit.
+    """
+    if dedupe:
+        subtitle_lists = [preprocess_subtitles(subtitles) or subtitles for _, subtitles in jobs]
+    else:
+        subtitle_lists = [list(subtitles) for _, subtitles in jobs]
+    limit = _context_tokens(model) - RESERVED_OUTPUT_TOKENS
+    
+    def build(lists: List[List[str]]) -> str:
+        items = "\n".join(
+            _render_batch_item(index=i, series_name=series_name, subtitle_text="\n".join(subtitles))
+            for i, ((series_name, _), subtitles) in enumerate(zip(jobs, lists))
+        )
+        return _render_batch_prompt(count=len(jobs), last_index=len(jobs) - 1, items=items)
+    
+    prompt = build(subtitle_lists)
+    while _count_tokens(prompt, model) > limit:
+        if all(len(subtitles) <= 1 for subtitles in subtitle_lists):
+            return None
+        subtitle_lists = [subtitles[:max(int(len(subtitles) * 0.9), 1)] for subtitles in subtitle_lists]
+        prompt = build(subtitle_lists)
+    return prompt
 
 
-def _identify_episode_google(prompt: str, model: str) -> Dict[str, Any]:
+def _is_valid_batch_item(item: Any, count: int) -> bool:
     """
-    Identify episode using Google Gemini API.
+    Checks one item of a batched response: an object with an in-range integer index and
+    integer (or null) season and episode.
     """
+    def is_int(value: Any) -> bool:
+        return isinstance(value, int) and not isinstance(value, bool)
+    
+    return (
+        isinstance(item, dict)
+        and is_int(item.get("index")) and 0 <= item["index"] < count
+        and all(item.get(key) is None or is_int(item[key]) for key in ("season", "episode"))
+    )
+
+
+def _identify_batch(jobs: Sequence[Tuple[str, List[str]]], model: str, provider: str, dedupe: bool = True) -> Optional[List[Optional[Dict[str, Any]]]]:
+    """
+    Identifies several episodes with a single LLM request.
+    
+    Returns:
+        list[dict]: One result per job, in order, with None for items the response has no
+                    valid answer for; or None if the response could not be used at all.
+    """
+    prompt = _build_batch_prompt(jobs, model, dedupe)
+    if prompt is None:
+        logger.warning("Batched prompt does not fit %s's context window; identifying items one at a time.", model)
+        return None
     try:
-        api_key = os.environ.get("GOOGLE_API_KEY")
-        # Note: redundant check as check_api_key handles this, but kept for type safety locally
-        if not api_key:
-            return {"error": "GOOGLE_API_KEY environment variable not set"}
-        
-        with Client(api_key=api_key) as  gemini_client:
-            logger.info("Asking %s to identify the episode...", model)
-            response = gemini_client.models.generate_content(
-                model=model,
-                contents=prompt,
-            )        
-            parsed = _parse_json_response(response.text)
-            if parsed:
-                return parsed
+        parsed = _parse_json_array_response(_complete_prompt(prompt, model, provider))
+    except Exception as e:
+        logger.warning("Batched identification failed (%s); identifying items one at a time.", e)
+        return None
+    
+    if not isinstance(parsed, list):
+        logger.warning("LLM returned an unusable batched response; identifying items one at a time.")
+        return None
+    
+    # Match answers to items by their reported index; the first valid answer for an item wins
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    for item in parsed:
+        if _is_valid_batch_item(item, len(jobs)) and results[item["index"]] is None:
+            results[item.pop("index")] = item
+    invalid = results.count(None)
+    if invalid:
+        logger.warning("LLM returned no valid answer for %d of %d batched items; identifying them one at a time.", invalid, len(jobs))
+    return results
+
+
+def identify_episodes_batched(jobs: Sequence[Tuple[str, List[str]]], model: str = "gemini-2.5-flash", provider: str = "google", rows_per_call: int = 5, dedupe: bool = True, use_cache: bool = True, early_exit_threshold: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Identifies several episodes, packing up to rows_per_call of them into each LLM request.
+    
+    Items whose batched answer is missing or invalid are identified one at a time instead.
+
+    Args:
+        jobs: A sequence of (series_name, subtitles) pairs.
+        model (str): The model to use.
+        provider (str): The LLM provider - "google", "openai", or "perplexity".
+        rows_per_call (int): Maximum number of episodes per request.
+        dedupe (bool): If True, clean and deduplicate the subtitles before building the prompt.
+        use_cache (bool): If True, reuse (and save) results cached on disk, shared with
+                          identify_episode.
+        early_exit_threshold (int): If set, stop reading the streamed responses of items
+                                    identified one at a time once confident enough.
+
+    Returns:
+        list[dict]: One identification result per job, in the same order as jobs.
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    cache_paths: Dict[int, str] = {}
+    
+    # Jobs without subtitles (or without an API key) get their error from identify_episode
+    pending = []
+    for i, (series_name, subtitles) in enumerate(jobs):
+        if not subtitles or not check_api_key(provider):
+            results[i] = identify_episode(series_name, subtitles, model=model, provider=provider, dedupe=dedupe, use_cache=use_cache, early_exit_threshold=early_exit_threshold)
+            continue
+        if use_cache:
+            # Keyed like identify_episode's cache, so either path can serve the other
+            cache_paths[i] = _result_cache_path(_build_prompt(series_name, subtitles, model, dedupe), model, provider)
+            cached = _load_cached_result(cache_paths[i])
+            if cached is not None:
+                logger.info("Using cached identification from %s.", cache_paths[i])
+                results[i] = cached
+                continue
+        pending.append(i)
+    
+    for start in range(0, len(pending), max(rows_per_call, 1)):
+        chunk = pending[start:start + max(rows_per_call, 1)]
+        batch = _identify_batch([jobs[i] for i in chunk], model, provider, dedupe) if len(chunk) > 1 else None
+        for offset, i in enumerate(chunk):
+            if batch is not None and batch[offset] is not None:
+                results[i] = batch[offset]
+                if i in cache_paths:
+                    _save_cached_result(cache_paths[i], results[i])
             else:
-                return {
-                    "season": None,
-                    "episode": None,
-                    "error": "LLM did not return a valid JSON object.",
-                    "llm_response": response.text,
-                }
-    except json.JSONDecodeError as e:
-        return {
-            "season": None,
-            "episode": None,
-            "error": f"Failed to parse JSON from LLM response: {e}",
-        }
+                series_name, subtitles = jobs[i]
+                results[i] = identify_episode(series_name, subtitles, model=model, provider=provider, dedupe=dedupe, use_cache=use_cache, early_exit_threshold=early_exit_threshold)
+    
+    return results
+
+
+def _run_openai_batch(prompts: List[str], model: str, poll_interval: float) -> List[Dict[str, Any]]:
+    """
+    Runs prompts through the OpenAI Batch API and waits for the results.
+    """
+    client = _get_openai_client(os.environ.get(API_KEY_ENV_VARS["openai"]))
+    lines = [
+        json.dumps({
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": 0
+            }
+        })
+        for i, prompt in enumerate(prompts)
+    ]
+    input_file = client.files.create(file=("tvidentify_batch.jsonl", "\n".join(lines).encode("utf-8")), purpose="batch")
+    batch = client.batches.create(input_file_id=input_file.id, endpoint="/v1/chat/completions", completion_window="24h")
+    logger.info("Submitted OpenAI batch %s with %d requests; waiting for it to complete...", batch.id, len(prompts))
+    
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+        logger.debug("OpenAI batch %s status: %s", batch.id, batch.status)
+    
+    if batch.status != "completed" or not batch.output_file_id:
+        error = {"season": None, "episode": None, "error": f"OpenAI batch {batch.id} ended with status: {batch.status}"}
+        return [dict(error) for _ in prompts]
+    
+    results: List[Dict[str, Any]] = [
+        {"season": None, "episode": None, "error": "No response for this request in the batch output."}
+        for _ in prompts
+    ]
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        i = int(record["custom_id"])
+        response = record.get("response") or {}
+        if record.get("error") or response.get("status_code") != 200:
+            results[i] = {"season": None, "episode": None, "error": f"Batch request failed: {record.get('error') or response.get('body')}"}
+        else:
+            results[i] = _result_from_response_text(response["body"]["choices"][0]["message"]["content"])
+    return results
+
+
+def _run_google_batch(prompts: List[str], model: str, poll_interval: float) -> List[Dict[str, Any]]:
+    """
+    Runs prompts through the Gemini Batch API (inline requests) and waits for the results.
+    """
+    from google.genai import types as genai_types
+    
+    done_states = {
+        genai_types.JobState.JOB_STATE_SUCCEEDED,
+        genai_types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        genai_types.JobState.JOB_STATE_FAILED,
+        genai_types.JobState.JOB_STATE_CANCELLED,
+        genai_types.JobState.JOB_STATE_EXPIRED,
+    }
+    gemini_client = _get_gemini_client(os.environ.get(API_KEY_ENV_VARS["google"]))
+    job = gemini_client.batches.create(
+        model=model,
+        src=[
+            {"contents": [{"role": "user", "parts": [{"text": prompt}]}], "config": _GEMINI_JSON_CONFIG}
+            for prompt in prompts
+        ],
+        config={"display_name": "tvidentify"}
+    )
+    logger.info("Submitted Gemini batch %s with %d requests; waiting for it to complete...", job.name, len(prompts))
+    
+    while job.state not in done_states:
+        time.sleep(poll_interval)
+        job = gemini_client.batches.get(name=job.name)
+        logger.debug("Gemini batch %s state: %s", job.name, job.state)
+    
+    responses = (job.dest.inlined_responses or []) if job.dest else []
+    if job.state not in (genai_types.JobState.JOB_STATE_SUCCEEDED, genai_types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED) or not responses:
+        error = {"season": None, "episode": None, "error": f"Gemini batch {job.name} ended with state: {job.state}"}
+        return [dict(error) for _ in prompts]
+    
+    results: List[Dict[str, Any]] = []
+    for i in range(len(prompts)):
+        inlined = responses[i] if i < len(responses) else None
+        if inlined is None or inlined.error or inlined.response is None:
+            error = inlined.error if inlined is not None else "missing response"
+            results.append({"season": None, "episode": None, "error": f"Batch request failed: {error}"})
+        else:
+            results.append(_result_from_response_text(inlined.response.text))
+    return results
+
+
+def identify_episodes_offline(jobs: Sequence[Tuple[str, List[str]]], model: str = "gemini-2.5-flash", provider: str = "google", poll_interval: float = 30.0, dedupe: bool = True, use_cache: bool = True, early_exit_threshold: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Identifies several episodes through the provider's Batch API.
+    
+    Batch requests are billed at a discount but may take minutes to hours to finish.
+    Perplexity has no Batch API, so its jobs are identified one at a time instead.
+
+    Args:
+        jobs: A sequence of (series_name, subtitles) pairs.
+        model (str): The model to use.
+        provider (str): The LLM provider - "google" or "openai" (others fall back to real-time).
+        poll_interval (float): Seconds to wait between batch status checks.
+        dedupe (bool): If True, clean and deduplicate the subtitles before building the prompt.
+        use_cache (bool): If True, jobs identified in real time instead reuse (and save)
+                          results cached on disk.
+        early_exit_threshold (int): If set, stop reading the streamed responses of jobs
+                                    identified in real time once confident enough.
+
+    Returns:
+        list[dict]: One identification result per job, in the same order as jobs.
+    """
+    provider = provider.lower()
+    results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    
+    # Jobs that can't be batched (no subtitles, no API key, no Batch API) take the normal path,
+    # which also produces the usual error results
+    pending = []
+    for i, (series_name, subtitles) in enumerate(jobs):
+        if subtitles and provider in ("google", "openai") and check_api_key(provider):
+            pending.append(i)
+        else:
+            results[i] = identify_episode(series_name, subtitles, model=model, provider=provider, dedupe=dedupe, use_cache=use_cache, early_exit_threshold=early_exit_threshold)
+    
+    if pending:
+        prompts = [
+            _build_prompt(jobs[i][0], jobs[i][1], model, dedupe)
+            for i in pending
+        ]
+        run_batch = _run_google_batch if provider == "google" else _run_openai_batch
+        try:
+            batch_results = run_batch(prompts, model, poll_interval)
+        except Exception as e:
+            batch_results = [{"season": None, "episode": None, "error": f"An error occurred: {e}"} for _ in pending]
+        for i, result in zip(pending, batch_results):
+            results[i] = result
+    
+    return results
 
 
-def _identify_episode_openai(prompt: str, model: str) -> Dict[str, Any]:
+def _result_from_response_text(response_text: str) -> Dict[str, Any]:
     """
-    Identify episode using OpenAI API.
+    Helper function to turn raw LLM response text into an identification result.
     """
     try:
-        api_key = os.environ.get("OPENAI_API_KEY")
-        if not api_key:
-            return {"error": "OPENAI_API_KEY environment variable not set"}
-        
-        from openai import OpenAI
-        client = OpenAI(api_key=api_key)
-        
-        logger.info("Asking %s to identify the episode...", model)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
-        )
-        
-        response_text = response.choices[0].message.content
         parsed = _parse_json_response(response_text)
-        if parsed:
-            return parsed
-        else:
-            return {
-                "season": None,
-                "episode": None,
-                "error": "LLM did not return a valid JSON object.",
-                "llm_response": response_text,
-            }
     except json.JSONDecodeError as e:
         return {
             "season": None,
             "episode": None,
             "error": f"Failed to parse JSON from LLM response: {e}",
         }
+    if parsed:
+        return parsed
+    return {
+        "season": None,
+        "episode": None,
+        "error": "LLM did not return a valid JSON object.",
+        "llm_response": response_text,
+    }
 
 
-def _identify_episode_perplexity(prompt: str, model: str) -> Dict[str, Any]:
+async def identify_episode_async(series_name: str, subtitles: List[str], model: str = "gemini-2.5-flash", provider: str = "google", client: Any = None, dedupe: bool = True, use_cache: bool = True, early_exit_threshold: Optional[int] = None) -> Dict[str, Any]:
     """
-    Identify episode using Perplexity API (OpenAI-compatible).
+    Async version of identify_episode, using each provider's async SDK client.
+
+    Args:
+        series_name (str): The name of the TV series.
+        subtitles (list[str]): A list of subtitle strings.
+        model (str): The model to use (e.g., "gemini-2.5-flash", "gpt-4", "sonar").
+        provider (str): The LLM provider - "google", "openai", or "perplexity".
+        client: Optional async client from _open_async_client to share between calls.
+                If not given, a client is opened for this call only.
+        dedupe (bool): If True, clean and deduplicate the subtitles before building the prompt.
+        use_cache (bool): If True, reuse (and save) results cached on disk for the same
+                          model and prompt.
+        early_exit_threshold (int): If set, stop reading a streamed response once its
+                                    confidence_score reaches this value.
+
+    Returns:
+        dict: A dictionary containing the season and episode, or an error message.
     """
+    if not subtitles:
+        return {"error": "Could not identify episode: No subtitles provided."}
+    
+    prompt = _build_prompt(series_name, subtitles, model, dedupe)
+    
+    cache_path = _result_cache_path(prompt, model, provider) if use_cache else None
+    if cache_path:
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            logger.info("Using cached identification from %s.", cache_path)
+            return cached
+    
+    if not check_api_key(provider):
+        return {"error": f"Missing API key for provider: {provider}"}
+
     try:
-        api_key = os.environ.get("PERPLEXITY_API_KEY")
-        if not api_key:
-            return {"error": "PERPLEXITY_API_KEY environment variable not set"}
-        
-        from openai import OpenAI
-        client = OpenAI(
-            api_key=api_key,
-            base_url="https://api.perplexity.ai"
-        )
-        
-        logger.info("Asking %s to identify the episode...", model)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0
-        )
-        
-        response_text = response.choices[0].message.content
-        parsed = _parse_json_response(response_text)
-        if parsed:
-            return parsed
+        if provider.lower() == "google":
+            result = await _identify_episode_google_async(prompt, model, client, early_exit_threshold)
+        elif provider.lower() in ("openai", "perplexity"):
+            result = await _identify_episode_openai_async(prompt, model, provider.lower(), client, early_exit_threshold)
         else:
-            return {
-                "season": None,
-                "episode": None,
-                "error": "LLM did not return a valid JSON object.",
-                "llm_response": response_text,
-            }
-    except json.JSONDecodeError as e:
+            return {"error": f"Unknown provider: {provider}. Supported providers: google, openai, perplexity"}
+    except Exception as e:
         return {
             "season": None,
             "episode": None,
-            "error": f"Failed to parse JSON from LLM response: {e}",
+            "error": f"An error occurred: {e}"
         }
+    
+    # An answer cut short by an early exit has no reasoning; don't serve it to later full requests
+    if cache_path and (early_exit_threshold is None or "reasoning" in result):
+        _save_cached_result(cache_path, result)
+    return result
+
+
+@contextlib.asynccontextmanager
+async def _open_async_client(provider: str):
+    """
+    Opens the provider's async SDK client, closing it (and its connection pool) on exit.
+    
+    Yields None for unknown providers or when the provider's API key is not set.
+    """
+    provider = provider.lower()
+    key_env = API_KEY_ENV_VARS.get(provider)
+    api_key = os.environ.get(key_env) if key_env else None
+    if not api_key:
+        yield None
+    elif provider == "google":
+        from google.genai import Client
+        async with Client(api_key=api_key, http_options=_GEMINI_HTTP_OPTIONS).aio as client:
+            yield client
+    else:
+        from openai import AsyncOpenAI
+        base_url = PERPLEXITY_BASE_URL if provider == "perplexity" else None
+        async with AsyncOpenAI(
+            api_key=api_key, base_url=base_url, max_retries=LLM_MAX_RETRIES, http_client=_openai_http_client(async_client=True)
+        ) as client:
+            yield client
+
+
+async def _identify_episode_google_async(prompt: str, model: str, gemini_client: Any = None, early_exit_threshold: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Identify episode using the async Google Gemini API.
+    """
+    if gemini_client is None:
+        async with _open_async_client("google") as gemini_client:
+            return await _identify_episode_google_async(prompt, model, gemini_client, early_exit_threshold)
+    
+    logger.info("Asking %s to identify the episode...", model)
+    await _wait_for_rate_limit_async(prompt, model)
+    if early_exit_threshold is None:
+        response = await gemini_client.models.generate_content(
+            model=model,
+            contents=prompt,
+            config=_GEMINI_JSON_CONFIG,
+        )
+        return _result_from_response_text(response.text)
+    
+    stream = await gemini_client.models.generate_content_stream(
+        model=model,
+        contents=prompt,
+        config=_GEMINI_JSON_CONFIG,
+    )
+    try:
+        return _result_from_response_text(await _read_stream_async((chunk.text async for chunk in stream), early_exit_threshold))
+    finally:
+        await stream.aclose()
+
+
+async def _identify_episode_openai_async(prompt: str, model: str, provider: str, client: Any = None, early_exit_threshold: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Identify episode using the async OpenAI API (or the OpenAI-compatible Perplexity API).
+    """
+    if client is None:
+        async with _open_async_client(provider) as client:
+            return await _identify_episode_openai_async(prompt, model, provider, client, early_exit_threshold)
+    
+    logger.info("Asking %s to identify the episode...", model)
+    await _wait_for_rate_limit_async(prompt, model)
+    return _result_from_response_text(await _json_chat_completion_async(client, model, prompt, provider, early_exit_threshold))
+
+
+async def identify_episodes(jobs: Sequence[Tuple[str, List[str]]], model: str = "gemini-2.5-flash", provider: str = "google", max_concurrency: int = 10, dedupe: bool = True, use_cache: bool = True, early_exit_threshold: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Identifies several episodes concurrently.
+
+    Args:
+        jobs: A sequence of (series_name, subtitles) pairs.
+        model (str): The model to use.
+        provider (str): The LLM provider - "google", "openai", or "perplexity".
+        max_concurrency (int): Maximum number of requests in flight at once.
+        dedupe (bool): If True, clean and deduplicate the subtitles before building the prompt.
+        use_cache (bool): If True, reuse (and save) results cached on disk.
+        early_exit_threshold (int): If set, stop reading each streamed response once its
+                                    confidence_score reaches this value.
+
+    Returns:
+        list[dict]: One identification result per job, in the same order as jobs.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # One client (and connection pool) is shared by every request in the run
+    async with _open_async_client(provider) as client:
+        async def run(series_name: str, subtitles: List[str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await identify_episode_async(series_name, subtitles, model=model, provider=provider, client=client, dedupe=dedupe, use_cache=use_cache, early_exit_threshold=early_exit_threshold)
+
+        results = await asyncio.gather(*(run(series_name, subtitles) for series_name, subtitles in jobs), return_exceptions=True)
+    return [
+        {"season": None, "episode": None, "error": f"An error occurred: {r}"} if isinstance(r, BaseException) else r
+        for r in results
+    ]
 
 
 def add_llm_args(parser: argparse.ArgumentParser) -> None:
@@ -207,12 +1214,32 @@ def add_llm_args(parser: argparse.ArgumentParser) -> None:
     group.add_argument('--model', type=str, default=None,
                         help='Model name. If not provided, defaults based on provider (google: gemini-2.5-flash, openai: gpt-4, perplexity: sonar).')
     group.add_argument('--series-name', required=True, help='The name of the TV series.')
+    group.add_argument('--max-rpm', type=int, default=None,
+                        help='Maximum LLM requests per minute (default: no limit).')
+    group.add_argument('--max-tpm', type=int, default=None,
+                        help='Maximum estimated LLM prompt tokens per minute (default: no limit).')
+    group.add_argument('--early-exit-threshold', type=int, default=None, metavar='SCORE',
+                        help='Stream LLM responses and stop reading once the confidence score is at least SCORE, skipping the reasoning (default: disabled).')
+    group.add_argument('--dedupe', dest='dedupe', action='store_true', default=True,
+                        help='Strip [tags], short lines and repeated lines from the subtitles sent to the LLM (default).')
+    group.add_argument('--no-dedupe', dest='dedupe', action='store_false',
+                        help='Send the subtitles to the LLM exactly as extracted.')
 
 def main():
-    parser = argparse.ArgumentParser(description='Identify the season and episode of a TV show from a video file or provided subtitles.')
-    parser.add_argument('input_file', nargs='?', help='The input video file (optional if --subtitles-json is provided).')
+    parser = argparse.ArgumentParser(description='Identify the season and episode of a TV show from video files or provided subtitles.')
+    parser.add_argument('input_files', nargs='*', metavar='input_file', help='One or more input video files or glob patterns (optional if --subtitles-json is provided).')
     parser.add_argument('--subtitles-json', type=str, default=None,
                         help='Path to a JSON file containing subtitle strings (array of strings). If provided, skips subtitle extraction.')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of video files to extract subtitles from concurrently (default: 1).')
+    parser.add_argument('--max-concurrency', type=int, default=10,
+                        help='Maximum number of concurrent LLM requests when identifying several files (default: 10).')
+    parser.add_argument('--batch-size', type=int, default=1,
+                        help='Number of files to identify per LLM request when identifying several files (default: 1).')
+    parser.add_argument('--batch-mode', type=str, default='realtime', choices=['realtime', 'batch'],
+                        help='"batch" submits all requests through the provider\'s discounted Batch API (google, openai) and waits for it to finish (default: realtime).')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Always ask the LLM, ignoring and not saving cached identification results.')
     
     add_llm_args(parser)
     add_extraction_args(parser)
@@ -236,11 +1263,15 @@ def main():
     # Set default model based on provider
     if args.model is None:
         args.model = DEFAULT_MODELS.get(args.provider, "gemini-2.5-flash")
+    set_rate_limits(args.max_rpm, args.max_tpm)
 
-    # Determine where to get subtitles from
-    subtitles = None
+    # Determine where to get subtitles from: a list of (source file, subtitles) jobs
+    jobs = []
     
     if args.subtitles_json:
+        # A single job, identified on the shared sync client
+        warm_up_connection(args.provider)
+        
         # Load subtitles from JSON file
         try:
             with open(args.subtitles_json, 'r') as f:
@@ -264,6 +1295,8 @@ def main():
                 return
             
             logger.info("Loaded %d subtitles from %s", len(subtitles), args.subtitles_json)
+            if subtitles:
+                jobs.append((args.subtitles_json, subtitles))
         except FileNotFoundError:
             logger.error("Error: Subtitles JSON file not found: %s", args.subtitles_json)
             return
@@ -271,28 +1304,81 @@ def main():
             logger.error("Error: Invalid JSON in subtitles file: %s", e)
             return
     else:
-        # Extract subtitles from video file
-        if not args.input_file:
+        # Extract subtitles from the video files
+        if not args.input_files:
             logger.error("Error: Either input_file or --subtitles-json must be provided.")
             parser.print_help()
             return
         
-        # Step 1: Extract subtitles from the video file
-        subtitles = extract_subtitles(
-            video_file=args.input_file,
+        # Expand glob patterns ourselves, for shells (like cmd.exe) that don't
+        input_files = []
+        for pattern in args.input_files:
+            input_files.extend(sorted(glob.glob(pattern)) or [pattern])
+        
+        # Connect to the provider while subtitles are extracted. Only the shared sync client
+        # can be warmed, and several files identified concurrently use their own async client.
+        if args.batch_mode == 'batch' or len(input_files) == 1 or args.batch_size > 1:
+            warm_up_connection(args.provider)
+        
+        # Step 1: Extract subtitles from each video file, several files at once
+        all_subtitles = extract_subtitles_batch(
+            input_files,
+            max_workers=args.workers,
             subtitle_track_index=args.subtitle_track,
             offset_minutes=args.offset,
             max_frames=args.max_frames,
-            scan_duration_minutes=args.scan_duration
+            scan_duration_minutes=args.scan_duration,
+            ocr_backend=args.ocr_backend
         )
+        for input_file, subtitles in zip(input_files, all_subtitles):
+            if subtitles:
+                jobs.append((input_file, subtitles))
+            else:
+                logger.error("Could not extract any subtitles from %s to send to the LLM.", input_file)
 
-    # Step 2: Identify the episode using the extracted subtitles
-    if subtitles:
-        # Check API key before making the call
-        if not check_api_key(args.provider):
-            return
+    if not jobs:
+        if args.subtitles_json:
+            logger.error("Could not extract any subtitles to send to the LLM.")
+        return
 
-        result = identify_episode(args.series_name, subtitles, model=args.model, provider=args.provider)
+    # Check API key before making the call
+    if not check_api_key(args.provider):
+        return
+
+    # Step 2: Identify the episodes, concurrently (or several per request) if there are several
+    if args.batch_mode == 'batch':
+        results = identify_episodes_offline(
+            [(args.series_name, subtitles) for _, subtitles in jobs],
+            model=args.model,
+            provider=args.provider,
+            dedupe=args.dedupe,
+            use_cache=not args.no_cache,
+            early_exit_threshold=args.early_exit_threshold
+        )
+    elif len(jobs) == 1:
+        results = [identify_episode(args.series_name, jobs[0][1], model=args.model, provider=args.provider, dedupe=args.dedupe, use_cache=not args.no_cache, early_exit_threshold=args.early_exit_threshold)]
+    elif args.batch_size > 1:
+        results = identify_episodes_batched(
+            [(args.series_name, subtitles) for _, subtitles in jobs],
+            model=args.model,
+            provider=args.provider,
+            rows_per_call=args.batch_size,
+            dedupe=args.dedupe,
+            use_cache=not args.no_cache,
+            early_exit_threshold=args.early_exit_threshold
+        )
+    else:
+        results = asyncio.run(identify_episodes(
+            [(args.series_name, subtitles) for _, subtitles in jobs],
+            model=args.model,
+            provider=args.provider,
+            max_concurrency=args.max_concurrency,
+            dedupe=args.dedupe,
+            use_cache=not args.no_cache,
+            early_exit_threshold=args.early_exit_threshold
+        ))
+
+    for (source_file, subtitles), result in zip(jobs, results):
         result["subtitles"] = subtitles
         result["provider"] = args.provider
         result["model"] = args.model
@@ -301,27 +1387,20 @@ def main():
         if args.output_dir:
             os.makedirs(args.output_dir, exist_ok=True)
             
-            # Create a safe filename from the series name and input file
-            if args.input_file:
-                base_name = os.path.splitext(os.path.basename(args.input_file))[0]
-                output_file = os.path.join(args.output_dir, f"{base_name}_identification.json")
-            else:
-                # If using subtitles JSON, use that filename
-                base_name = os.path.splitext(os.path.basename(args.subtitles_json))[0]
-                output_file = os.path.join(args.output_dir, f"{base_name}_identification.json")
+            # Create a safe filename from the input file (or the subtitles JSON file)
+            base_name = os.path.splitext(os.path.basename(source_file))[0]
+            output_file = os.path.join(args.output_dir, f"{base_name}_identification.json")
             
             try:
-                with open(output_file, 'w') as f:
-                    json.dump(result, f, indent=2)
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(dumps_json(result, pretty=True))
                 logger.info("JSON output saved to: %s", output_file)
             except IOError as e:
                 logger.error("Error saving JSON output: %s", e)
         else:
             # Print to console if no output_dir specified
             logger.info("--- LLM Identification Result ---")
-            print(json.dumps(result, indent=2)) # Keep print for JSON output pipeability
-    else:
-        logger.error("Could not extract any subtitles to send to the LLM.")
+            print(dumps_json(result, pretty=True)) # Keep print for JSON output pipeability
 
 
 if __name__ == '__main__':
@@ -2,6 +2,8 @@ import argparse
 import os
 import json
 
+from .utils import dumps_json, loads_json
+
 
 def rename_file(video_file, series_name, season, episode, rename_format="{series} S{season:02d}E{episode:02d}"):
     """
@@ -23,7 +25,9 @@ def rename_file(video_file, series_name, season, episode, rename_format="{series
             - new_path (str): New file path (if successful)
             - error (str): Error message (if failed)
     """
-    if not os.path.exists(video_file):
+    try:
+        src_stat = os.stat(video_file)
+    except FileNotFoundError:
         return {
             "success": False,
             "old_path": video_file,
@@ -66,23 +70,32 @@ def rename_file(video_file, series_name, season, episode, rename_format="{series
         }
     
     new_filename = new_filename + ext
+    new_path = os.path.join(os.path.dirname(video_file), new_filename)
     
-    # Get directory and construct new path
-    directory = os.path.dirname(video_file)
-    new_path = os.path.join(directory, new_filename)
-    
-    # Check if target file already exists
-    if os.path.exists(new_path) and os.path.abspath(video_file) != os.path.abspath(new_path):
-        return {
-            "success": False,
-            "old_path": video_file,
-            "new_path": new_path,
-            "error": f"Target file already exists: {new_path}"
-        }
+    # Check if target file already exists. Like os.path.samefile, compare by inode
+    # (reusing the source stat) so case-only renames and links to the source itself
+    # are not treated as conflicts.
+    try:
+        dst_stat = os.stat(new_path)
+    except FileNotFoundError:
+        dst_stat = None  # Target doesn't exist; proceed
+    else:
+        if not os.path.samestat(src_stat, dst_stat):
+            return {
+                "success": False,
+                "old_path": video_file,
+                "new_path": new_path,
+                "error": f"Target file already exists: {new_path}"
+            }
     
-    # Perform the rename
+    # Perform the rename (os.replace behaves the same on POSIX and Windows)
     try:
-        os.rename(video_file, new_path)
+        if dst_stat is not None and not _is_same_directory_entry(video_file, new_path):
+            # The target is another hard link to the source, over which os.replace
+            # does nothing; dropping the source's name completes the rename
+            os.unlink(video_file)
+        else:
+            os.replace(video_file, new_path)
         return {
             "success": True,
             "old_path": video_file,
@@ -100,6 +113,42 @@ def rename_file(video_file, series_name, season, episode, rename_format="{series
         }
 
 
+def _is_same_directory_entry(path, other_path):
+    """
+    Returns True if two paths to the same file name one directory entry, rather than
+    two hard links: the same path, or (on a case-insensitive filesystem) paths that
+    differ only in case.
+    """
+    path, other_path = os.path.abspath(path), os.path.abspath(other_path)
+    if os.path.normcase(path) == os.path.normcase(other_path):
+        return True
+    if path.casefold() != other_path.casefold():
+        return False
+    # Both names are listed only if they are separate links
+    names = os.listdir(os.path.dirname(other_path))
+    return not (os.path.basename(path) in names and os.path.basename(other_path) in names)
+
+
+def _fsync_directory(directory):
+    """
+    Flushes a directory's entries (e.g. completed renames) to disk.
+    
+    A no-op on platforms that cannot open directories, such as Windows.
+    """
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    try:
+        fd = os.open(directory or os.curdir, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
 def rename_files_from_batch_results(batch_results, series_name, rename_format="{series} S{season:02d}E{episode:02d}", dry_run=False):
     """
     Renames multiple files based on batch identification results.
@@ -114,52 +163,50 @@ def rename_files_from_batch_results(batch_results, series_name, rename_format="{
         list: List of rename operation results
     """
     rename_results = []
+    renamed_dirs = set()
     
     for result in batch_results:
-        # Skip if this was a duplicate or had an error
-        if "duplicate_of" in result or "error" in result:
-            rename_results.append({
-                "input_file_name": result.get("input_file_name", "unknown"),
-                "skipped": True,
-                "reason": result.get("duplicate_of") and f"Duplicate of {result['duplicate_of']}" or result.get("error", "Unknown reason")
-            })
-            continue
-        
-        # Check if season and episode are available
+        input_file_name = result.get("input_file_name", "unknown")
+        duplicate_of = result.get("duplicate_of")
         season = result.get("season")
         episode = result.get("episode")
+        video_file = result.get("video_file_path")
         
-        if season is None or episode is None:
-            rename_results.append({
-                "input_file_name": result.get("input_file_name", "unknown"),
-                "skipped": True,
-                "reason": "Season and/or episode could not be determined"
-            })
-            continue
+        if "duplicate_of" in result or "error" in result:
+            # Skip if this was a duplicate or had an error
+            reason = f"Duplicate of {duplicate_of}" if duplicate_of else result.get("error") or "Unknown reason"
+        elif season is None or episode is None:
+            reason = "Season and/or episode could not be determined"
+        elif not video_file:
+            # No file path from batch processing
+            reason = "File path not available in result"
+        else:
+            reason = None
         
-        # If we have the file path from batch processing
-        video_file = result.get("video_file_path")
-        if not video_file:
+        if reason is not None:
             rename_results.append({
-                "input_file_name": result.get("input_file_name", "unknown"),
+                "input_file_name": input_file_name,
                 "skipped": True,
-                "reason": "File path not available in result"
+                "reason": reason
             })
-            continue
-        
-        # Perform rename
-        if dry_run:
+        elif dry_run:
             # Just show what would happen
             _, ext = os.path.splitext(video_file)
             new_filename = rename_format.format(series=series_name, season=int(season), episode=int(episode)) + ext
             rename_results.append({
-                "input_file_name": result.get("input_file_name", "unknown"),
+                "input_file_name": input_file_name,
                 "dry_run": True,
                 "would_rename_to": new_filename
             })
         else:
             rename_result = rename_file(video_file, series_name, season, episode, rename_format)
             rename_results.append(rename_result)
+            if rename_result["success"]:
+                renamed_dirs.add(os.path.dirname(rename_result["new_path"]))
+    
+    # Make the renames durable with one directory fsync each, rather than per file
+    for directory in renamed_dirs:
+        _fsync_directory(directory)
     
     return rename_results
 
@@ -180,8 +227,8 @@ def main():
     
     # Load batch results
     try:
-        with open(args.batch_results, 'r') as f:
-            batch_results = json.load(f)
+        with open(args.batch_results, 'rb') as f:
+            batch_results = loads_json(f.read())
     except FileNotFoundError:
         print(f"Error: Batch results file not found: {args.batch_results}")
         return
@@ -203,13 +250,19 @@ def main():
     
     # Print results
     print("\n--- File Rename Results ---")
-    print(json.dumps(rename_results, indent=2))
+    print(dumps_json(rename_results, pretty=True))
     
     # Summary
-    successful = sum(1 for r in rename_results if r.get("success", False))
-    skipped = sum(1 for r in rename_results if r.get("skipped", False))
-    failed = sum(1 for r in rename_results if not r.get("success") and not r.get("skipped") and not r.get("dry_run"))
-    dry_runs = sum(1 for r in rename_results if r.get("dry_run", False))
+    successful = skipped = failed = dry_runs = 0
+    for r in rename_results:
+        if r.get("success"):
+            successful += 1
+        elif r.get("skipped"):
+            skipped += 1
+        elif r.get("dry_run"):
+            dry_runs += 1
+        else:
+            failed += 1
     
     print(f"\nSummary:")
     if args.dry_run:
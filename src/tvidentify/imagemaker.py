@@ -57,9 +57,15 @@ def ycbcr2rgb(ar):
     np.putmask(rgb, rgb < 0, 0)
     return np.uint8(rgb)
 
-def px_rgb_a(ods, pds, swap):
+def palette_indices(ods):
     px = read_rle_bytes(ods.img_data)
-    px = np.array([[255]*(ods.width - len(l)) + l for l in px], dtype=np.uint8)
+    return np.array([[255]*(ods.width - len(l)) + l for l in px], dtype=np.uint8)
+
+def alpha_lut(pds):
+    return np.fromiter((entry.Alpha for entry in pds.palette), dtype=np.uint8, count=len(pds.palette))
+
+def px_rgb_a(ods, pds, swap):
+    px = palette_indices(ods)
     
     # Extract the YCbCrA palette data, swapping channels if requested.
     if swap:
@@ -70,8 +76,7 @@ def px_rgb_a(ods, pds, swap):
     rgb = ycbcr2rgb(ycbcr)
     
     # Separate the Alpha channel from the YCbCr palette data
-    a = [entry.Alpha for entry in pds.palette]
-    a = np.array([[a[x] for x in l] for l in px], dtype=np.uint8)
+    a = np.take(alpha_lut(pds), px)
 
     return px, rgb, a
 
@@ -81,4 +86,9 @@ def make_image(ods, pds, swap=False):
     img = Image.fromarray(px, mode='P')
     img.putpalette(rgb)
     img.putalpha(alpha)
-    return img
\ No newline at end of file
+    return img
+
+def make_alpha_image(ods, pds):
+    # Just the alpha channel of make_image's result, looked up straight from the palette
+    # indices without building the colour image
+    return np.take(alpha_lut(pds), palette_indices(ods))
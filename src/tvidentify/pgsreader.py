@@ -20,7 +20,14 @@ class InvalidSegmentError(Exception):
 class PGSReader:
 
     def __init__(self, filepath):
+        if hasattr(filepath, 'read'):
+            # A binary stream (e.g. ffmpeg's stdout); segments are parsed as they arrive
+            self.filedir, self.file = '', ''
+            self.stream = filepath
+            self.bytes = None
+            return
         self.filedir, self.file = pathsplit(filepath) 
+        self.stream = None
         with open(filepath, 'rb') as f:
             self.bytes = f.read()
             
@@ -30,12 +37,27 @@ class PGSReader:
         return cls(bytes_)
 
     def iter_segments(self):
+        if self.stream is not None:
+            yield from self.iter_stream_segments()
+            return
         bytes_ = self.bytes[:]
         while bytes_:
             size = 13 + int(bytes_[11:13].hex(), 16)
             yield self.make_segment(bytes_[:size])
             bytes_ = bytes_[size:]
 
+    def iter_stream_segments(self):
+        # A stream can only be read once; a truncated final segment is dropped
+        while True:
+            header = self.stream.read(13)
+            if len(header) < 13:
+                return
+            size = int(header[11:13].hex(), 16)
+            body = self.stream.read(size)
+            if len(body) < size:
+                return
+            yield self.make_segment(header + body)
+
     def iter_displaysets(self):
         ds = []
         for s in self.iter_segments():
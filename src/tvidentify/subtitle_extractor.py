@@ -1,5 +1,6 @@
 import subprocess
 import os
+import shutil
 import cv2
 import argparse
 import pytesseract
@@ -7,16 +8,118 @@ import numpy as np
 import re
 import json
 import tempfile
+import contextlib
 import logging
-from typing import List, Dict, Optional, Any
+import functools
+import importlib.util
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Callable, Iterator, Sequence, Tuple, Union, BinaryIO
 from PIL import Image
+
+# Tesseract's OpenMP threads cost more than they save on subtitle-sized images, and we
+# already OCR several images at once. Only tesseract gets this limit (unless the user set
+# one): it is passed to each tesseract process, and set while tesserocr loads, as OpenMP
+# reads it then.
+TESSERACT_OMP_THREADS = "1"
+
+
+def _tesseract_env() -> Dict[str, str]:
+    """Returns the environment for a tesseract process, with OpenMP limited to one thread."""
+    env = dict(os.environ)
+    env.setdefault("OMP_THREAD_LIMIT", TESSERACT_OMP_THREADS)
+    return env
+
+
+def _import_tesserocr() -> Any:
+    """Imports tesserocr (or returns None) with OMP_THREAD_LIMIT set only for its loading."""
+    previous = os.environ.get("OMP_THREAD_LIMIT")
+    os.environ.setdefault("OMP_THREAD_LIMIT", TESSERACT_OMP_THREADS)
+    try:
+        import tesserocr
+        return tesserocr
+    except ImportError:  # tesserocr is optional; fall back to pytesseract (a tesseract process per image)
+        return None
+    finally:
+        if previous is None:
+            os.environ.pop("OMP_THREAD_LIMIT", None)
+
+
+try:
+    import re2
+except ImportError:  # google-re2 is optional; clean_subtitle_text's patterns also work with re
+    re2 = None
+
+tesserocr = _import_tesserocr()
 from .pgsreader import PGSReader
-from .imagemaker import make_image
-from .imagemaker import make_image
+from .imagemaker import make_alpha_image
 from .utils import check_required_tools, setup_logging, add_logging_args
 
 logger = logging.getLogger(__name__)
 
+# ffmpeg input options for SUP extraction. The stream index is already known from
+# ffprobe, so ffmpeg only needs a short probe, and it must never read stdin (which
+# stalls when several extractions run in parallel).
+FFMPEG_INPUT_ARGS = ['-nostdin', '-hide_banner', '-analyzeduration', '1M', '-probesize', '1M']
+
+# Subtitle bitmaps OCRed at once per SUP file. Each tesseract run is a separate process
+# (released from the GIL while threads wait on it); gains flatten out beyond ~4.
+OCR_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def batch_ocr_workers(file_workers: int) -> int:
+    """
+    Returns the number of OCR threads for `file_workers` files extracted at once: OCR_WORKERS
+    per file, but no more than the CPU count (or OCR_WORKERS, if that is larger).
+    """
+    return min(OCR_WORKERS * max(1, file_workers), max(OCR_WORKERS, os.cpu_count() or 1))
+
+# Images per tesseract run (see ocr_images); large lists can make tesseract hang
+OCR_BATCH_SIZE = 8
+MAX_TESSERACT_IMAGE_LIST = 500
+TESSERACT_ARGS = ['--oem', '3', '--psm', '6', '--dpi', '300']
+
+# Glyph height (in pixels) that subtitle images are upscaled towards before OCR
+OCR_TARGET_GLYPH_HEIGHT = 30
+MAX_OCR_SCALE = 3
+
+# Subtitle images with fewer opaque pixels than this (blank or near-blank frames) are
+# dropped before OCR, which would only return "" for them
+MIN_OCR_INK_PIXELS = 50
+
+# clean_subtitle_text patterns: a | misread for I at the start of a line, SDH tags such as
+# (Music) or [Screams], and runs of whitespace. Compiled with RE2's linear-time engine
+# when it is installed.
+_regex = re2 if re2 is not None else re
+_LINE_START_PIPE_RE = _regex.compile(r'(?m)^\|')
+_SDH_TAG_RE = _regex.compile(r'[\(\[].*?[\)\]]')
+_WHITESPACE_RE = _regex.compile(r'\s+')
+
+# OCR engines for subtitle images. EasyOCR (optional, imported on first use as it pulls in
+# PyTorch) runs its recognition network on a batch of images at once, on the GPU if any.
+OCR_BACKENDS = ("tesseract", "easyocr")
+EASYOCR_AVAILABLE = importlib.util.find_spec("easyocr") is not None
+EASYOCR_BATCH_SIZE = 32
+EASYOCR_RECOGNITION_BATCH = 64
+_easyocr_lock = threading.Lock()
+
+# Per-thread tesserocr sessions; each keeps its language model loaded between images
+_tesserocr_local = threading.local()
+
+
+def _get_tesserocr_api() -> Any:
+    """
+    Returns this thread's tesserocr API, configured like the pytesseract call in ocr_image
+    (--oem 3 --psm 6). It is freed when the thread exits.
+    """
+    api = getattr(_tesserocr_local, "api", None)
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(psm=tesserocr.PSM.SINGLE_BLOCK, oem=tesserocr.OEM.DEFAULT)
+        _tesserocr_local.api = api
+    return api
+
 
 def clean_subtitle_text(text: str) -> str:
     """
@@ -28,57 +131,161 @@ def clean_subtitle_text(text: str) -> str:
     text = text.strip()
     
     # Fix common | vs I errors at start of lines
-    text = re.sub(r'^\|', 'I', text) 
-    text = re.sub(r'(?<=\n)\|', 'I', text)
+    text = _LINE_START_PIPE_RE.sub('I', text)
     
     # Fix common "l" vs "I" errors
     text = text.replace("l'm", "I'm").replace("l'll", "I'll")
 
     # Remove SDH (Hearing Impaired) tags like (Music), [Screams]
-    text = re.sub(r'[\(\[].*?[\)\]]', '', text)
+    text = _SDH_TAG_RE.sub('', text)
     
     # Remove musical notes
     text = text.replace('♪', '')
 
     # Collapse multiple spaces
-    text = re.sub(r'\s+', ' ', text).strip()
+    text = _WHITESPACE_RE.sub(' ', text).strip()
     
     return text
 
 
-def ocr_image(cv_img: np.ndarray) -> str:
+@functools.lru_cache(maxsize=None)
+def _get_easyocr_reader() -> Any:
     """
-    Performs OCR on a single PGS bitmap (OpenCV format).
+    Returns the shared EasyOCR reader for English, loading its models on first use.
+    
+    EasyOCR uses the GPU when PyTorch can see one and falls back to the CPU otherwise.
+    """
+    import easyocr
+    return easyocr.Reader(['en'], gpu=True, verbose=False)
+
+
+def _ocr_scale_factor(processed_img: np.ndarray) -> int:
+    """
+    Returns the integer upscale that brings the median glyph (dark connected component) of
+    a black-on-white image to about OCR_TARGET_GLYPH_HEIGHT pixels, between 1 and MAX_OCR_SCALE.
+    """
+    count, _, stats, _ = cv2.connectedComponentsWithStats((processed_img < 128).view(np.uint8))
+    # Skip the background (label 0) and specks such as dots and commas
+    heights = stats[1:, cv2.CC_STAT_HEIGHT][stats[1:, cv2.CC_STAT_AREA] >= 4]
+    if count <= 1 or not heights.size:
+        return 1
+    return int(min(MAX_OCR_SCALE, max(1, round(OCR_TARGET_GLYPH_HEIGHT / float(np.median(heights))))))
+
+
+def preprocess_for_ocr(cv_img: np.ndarray) -> np.ndarray:
+    """
+    Turns a PGS bitmap (BGRA, BGR, or just its alpha channel as a 2D array) into the
+    upscaled, padded black-on-white grayscale image that tesseract reads best.
     """
     # 1. Handle Transparency (PGS is RGBA)
     # We invert the alpha channel: Text (opaque) -> Black, Background (transparent) -> White
-    if cv_img.shape[2] == 4:
+    if cv_img.ndim == 2:
+        processed_img = cv2.bitwise_not(cv_img)
+    elif cv_img.shape[2] == 4:
         alpha = cv_img[:, :, 3]
         processed_img = cv2.bitwise_not(alpha)
     else:
+        # Threshold and invert in one pass: light (text) pixels -> black, the rest -> white
         gray = cv2.cvtColor(cv_img, cv2.COLOR_BGR2GRAY)
-        _, processed_img = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY)
-        processed_img = cv2.bitwise_not(processed_img)
+        _, processed_img = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
 
-    # 2. Upscale (Critical for accuracy)
-    scale_factor = 3
+    # 2. Upscale small text (critical for accuracy). HD subtitles are usually already
+    # tall enough, so they skip the (9x more pixels) resize entirely.
+    # 3. Add Padding (White Border). The image is resized (or copied) straight into the
+    # middle of a white canvas, rather than resized and then copied again with a border.
+    scale_factor = _ocr_scale_factor(processed_img)
     height, width = processed_img.shape
-    processed_img = cv2.resize(processed_img, (width * scale_factor, height * scale_factor), interpolation=cv2.INTER_CUBIC)
+    pad = 20
+    canvas = np.full((height * scale_factor + 2 * pad, width * scale_factor + 2 * pad), 255, dtype=np.uint8)
+    interior = canvas[pad:-pad, pad:-pad]
+    if scale_factor > 1:
+        # The image is a near-binary mask, so bilinear (OpenCV's SIMD fast path) is as good
+        # for OCR as bicubic
+        cv2.resize(processed_img, (width * scale_factor, height * scale_factor), dst=interior, interpolation=cv2.INTER_LINEAR)
+    else:
+        interior[:] = processed_img
+    return canvas
 
-    # 3. Add Padding (White Border)
-    processed_img = cv2.copyMakeBorder(processed_img, 20, 20, 20, 20, cv2.BORDER_CONSTANT, value=255)
 
-    # 4. Run OCR
-    custom_config = r'--oem 3 --psm 6'
-    text = pytesseract.image_to_string(processed_img, config=custom_config)
+def ocr_image(cv_img: np.ndarray, api: Any = None) -> str:
+    """
+    Performs OCR on a single PGS bitmap: OpenCV format (BGRA or BGR), or just its alpha
+    channel as a 2D array.
+    
+    Uses an in-process tesserocr session when tesserocr is installed (`api`, or one kept per
+    thread), and otherwise runs tesseract on the image piped to its stdin.
+    """
+    processed_img = preprocess_for_ocr(cv_img)
+    
+    if api is None and tesserocr is not None:
+        api = _get_tesserocr_api()
+    if api is not None:
+        api.SetImage(Image.fromarray(processed_img))
+        api.SetSourceResolution(300)
+        text = api.GetUTF8Text()
+    else:
+        # Piped as uncompressed PGM: no temporary file, and next to nothing to encode
+        _, encoded = cv2.imencode('.pgm', processed_img)
+        result = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, 'stdin', 'stdout', *TESSERACT_ARGS],
+            input=encoded.tobytes(),
+            capture_output=True,
+            check=True,
+            env=_tesseract_env()
+        )
+        text = result.stdout.decode('utf-8', errors='replace')
     
     return clean_subtitle_text(text)
 
 
-def get_subtitle_tracks(video_file: str) -> List[Dict[str, Any]]:
+def ocr_images(cv_imgs: List[np.ndarray], api: Any = None) -> List[str]:
     """
-    Uses ffprobe to get information about subtitle tracks in the video file.
-    Returns the index of the first English subtitle stream, or 0 if not found.
+    Performs OCR on several PGS bitmaps (as accepted by ocr_image).
+    
+    Without tesserocr, the images are written to PGMs and read by a single tesseract run
+    from an image list, so tesseract starts and loads its model once rather than per image.
+    
+    Returns:
+        list[str]: The cleaned text of each image, in order.
+    """
+    if api is None and tesserocr is not None:
+        api = _get_tesserocr_api()
+    if api is not None or len(cv_imgs) <= 1:
+        return [ocr_image(cv_img, api) for cv_img in cv_imgs]
+    if len(cv_imgs) > MAX_TESSERACT_IMAGE_LIST:
+        return ocr_images(cv_imgs[:MAX_TESSERACT_IMAGE_LIST]) + ocr_images(cv_imgs[MAX_TESSERACT_IMAGE_LIST:])
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        image_paths = []
+        for i, cv_img in enumerate(cv_imgs):
+            image_path = os.path.join(temp_dir, f"frame_{i:05d}.pgm")
+            cv2.imwrite(image_path, preprocess_for_ocr(cv_img))
+            image_paths.append(image_path)
+        image_list_path = os.path.join(temp_dir, "imagelist.txt")
+        with open(image_list_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(image_paths) + '\n')
+        
+        result = subprocess.run(
+            [pytesseract.pytesseract.tesseract_cmd, image_list_path, 'stdout', *TESSERACT_ARGS],
+            capture_output=True,
+            check=True,
+            env=_tesseract_env()
+        )
+    
+    # tesseract ends each image's text with a form feed
+    texts = result.stdout.decode('utf-8', errors='replace').split('\f')
+    if len(texts) != len(cv_imgs) + 1:
+        logger.debug("tesseract returned %d pages for %d images; OCRing them one by one.", len(texts) - 1, len(cv_imgs))
+        return [ocr_image(cv_img) for cv_img in cv_imgs]
+    return [clean_subtitle_text(text) for text in texts[:-1]]
+
+
+def _probe_subtitle_tracks(video_file: str) -> List[Dict[str, Any]]:
+    """
+    Runs ffprobe on the video file and returns its subtitle streams.
+    
+    Raises:
+        subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError: If probing fails.
     """
     command = [
         'ffprobe',
@@ -87,12 +294,8 @@ def get_subtitle_tracks(video_file: str) -> List[Dict[str, Any]]:
         '-show_streams',
         video_file
     ]
-    try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        data = json.loads(result.stdout)
-    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
-        logger.error("Error getting subtitle track info: %s", e)
-        return []
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+    data = json.loads(result.stdout)
     
     subtitle_streams = []
     for stream in data.get('streams', []):
@@ -102,6 +305,34 @@ def get_subtitle_tracks(video_file: str) -> List[Dict[str, Any]]:
     return subtitle_streams
 
 
+@functools.lru_cache(maxsize=256)
+def _cached_subtitle_tracks(video_file: str, mtime_ns: int, size: int) -> List[Dict[str, Any]]:
+    """
+    _probe_subtitle_tracks, cached per file version. Failures raise, so they are not cached.
+    """
+    return _probe_subtitle_tracks(video_file)
+
+
+def get_subtitle_tracks(video_file: str) -> List[Dict[str, Any]]:
+    """
+    Uses ffprobe to get information about subtitle tracks in the video file.
+    Returns the list of subtitle streams, or [] if probing fails.
+    
+    Results are cached in memory by (path, modification time, size), so asking again
+    about an unchanged file doesn't run ffprobe again.
+    """
+    try:
+        try:
+            st = os.stat(video_file)
+        except OSError:
+            # Let ffprobe report the problem; nothing to key a cache entry on
+            return _probe_subtitle_tracks(video_file)
+        return list(_cached_subtitle_tracks(video_file, st.st_mtime_ns, st.st_size))
+    except (subprocess.CalledProcessError, FileNotFoundError, json.JSONDecodeError) as e:
+        logger.error("Error getting subtitle track info: %s", e)
+        return []
+
+
 def find_subtitle_stream(video_file: str, subtitle_track_index: Optional[int] = None) -> Optional[int]:
     """
     Find a suitable subtitle stream index using ffprobe.
@@ -141,10 +372,81 @@ def find_subtitle_stream(video_file: str, subtitle_track_index: Optional[int] =
     return first_stream_index
 
 
+def open_sup_stream(video_file: str, subtitle_stream_index: int, offset_minutes: int = 0, scan_duration_minutes: int = 15) -> Optional[subprocess.Popen]:
+    """
+    Starts ffmpeg extracting a subtitle stream as SUP data written to its stdout.
+    
+    The SUP data can be OCRed while ffmpeg is still demuxing; pass the process to
+    close_sup_stream once done reading.
+    
+    Args:
+        video_file: Path to the input video file
+        subtitle_stream_index: The ffprobe stream index of the subtitle (e.g., 0:s:1 for second subtitle stream)
+        offset_minutes: Skip the first N minutes
+        scan_duration_minutes: How many minutes to scan for subtitles
+    
+    Returns:
+        subprocess.Popen: The running ffmpeg process, or None if ffmpeg could not be started
+    """
+    # Calculate start and end times
+    start_time = offset_minutes * 60  # Convert to seconds
+    duration = scan_duration_minutes * 60  # Convert to seconds
+    
+    ffmpeg_cmd = [
+        'ffmpeg',
+        *FFMPEG_INPUT_ARGS,
+        # Jump to the nearest seek point; the subtitle packets are copied, not decoded
+        '-ss', str(start_time), '-noaccurate_seek',
+        '-i', video_file,
+        '-t', str(duration),
+        '-map', f'0:{subtitle_stream_index}',
+        '-vn', '-an', '-dn',
+        '-c:s', 'copy',
+        # Only errors go to stderr, so its pipe can't fill up while stdout is being read
+        '-loglevel', 'error', '-nostats',
+        '-f', 'sup',
+        'pipe:1'
+    ]
+    
+    logger.info("Extracting subtitle stream from video...")
+    try:
+        return subprocess.Popen(ffmpeg_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError:
+        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install it.")
+        return None
+
+
+def close_sup_stream(proc: subprocess.Popen, stopped_early: bool = False) -> bool:
+    """
+    Waits for an ffmpeg process started by open_sup_stream and reports whether it succeeded.
+    
+    Args:
+        proc: The ffmpeg process
+        stopped_early: True if the caller stopped reading before the end of the SUP data;
+                       ffmpeg is then killed and its exit status ignored.
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if stopped_early:
+        proc.kill()
+    _, stderr = proc.communicate()
+    if stopped_early or proc.returncode == 0:
+        return True
+    
+    logger.error("Error extracting subtitle stream (ffmpeg exited with code %s).", proc.returncode)
+    logger.error("  Command: %s", ' '.join(proc.args))
+    logger.error("  Stderr:\n%s", stderr.decode('utf-8', errors='replace'))
+    return False
+
+
 def extract_sup_file(video_file: str, output_sup_path: str, subtitle_stream_index: int, offset_minutes: int = 0, scan_duration_minutes: int = 15) -> bool:
     """
     Use ffmpeg to extract a subtitle stream to a SUP file.
     
+    extract_subtitles now reads the SUP data straight from ffmpeg (see open_sup_stream);
+    this writes the same data to a file instead.
+    
     Args:
         video_file: Path to the input video file
         output_sup_path: Path where the SUP file should be saved
@@ -155,91 +457,177 @@ def extract_sup_file(video_file: str, output_sup_path: str, subtitle_stream_inde
     Returns:
         bool: True if successful, False otherwise
     """
-    try:
-        # Calculate start and end times
-        start_time = offset_minutes * 60  # Convert to seconds
-        duration = scan_duration_minutes * 60  # Convert to seconds
-        
-        ffmpeg_cmd = [
-            'ffmpeg',
-            '-ss', str(start_time),
-            '-i', video_file,
-            '-t', str(duration),
-            '-map', f'0:{subtitle_stream_index}',
-            '-c', 'copy',
-            '-f', 'sup',
-            output_sup_path,
-            '-y'
-        ]
-        
-        logger.info("Extracting subtitle stream to SUP file...")
-        subprocess.run(ffmpeg_cmd, check=True, capture_output=True, text=True)
-        
-        if os.path.exists(output_sup_path) and os.path.getsize(output_sup_path) > 0:
-            logger.debug("Successfully created SUP file: %s", output_sup_path)
-            return True
-        else:
-            logger.error("Failed to create SUP file or file is empty.")
-            return False
-            
-    except subprocess.CalledProcessError as e:
-        logger.error("Error extracting SUP file (ffmpeg exited with code %s).", e.returncode)
-        logger.error("  Command: %s", ' '.join(e.cmd))
-        logger.error("  Stderr:\n%s", e.stderr)
+    proc = open_sup_stream(video_file, subtitle_stream_index, offset_minutes, scan_duration_minutes)
+    if proc is None:
         return False
-    except FileNotFoundError:
-        logger.error("Error: ffmpeg is not installed or not in your PATH. Please install it.")
+    with open(output_sup_path, 'wb') as f:
+        shutil.copyfileobj(proc.stdout, f)
+    if not close_sup_stream(proc):
         return False
+    
+    if os.path.getsize(output_sup_path) > 0:
+        logger.debug("Successfully created SUP file: %s", output_sup_path)
+        return True
+    logger.error("Failed to create SUP file or file is empty.")
+    return False
+
+
+def ocr_images_easyocr(cv_imgs: List[np.ndarray]) -> List[str]:
+    """
+    Performs OCR on several PGS bitmaps (as accepted by ocr_image) with EasyOCR.
+    
+    The preprocessed images are padded with white to a common size so the whole list
+    goes through EasyOCR in one batched call. Calls from several threads take turns, as
+    they would only compete for the same GPU.
+    
+    Returns:
+        list[str]: The cleaned text of each image, in order.
+    """
+    if not cv_imgs:
+        return []
+    processed = [preprocess_for_ocr(cv_img) for cv_img in cv_imgs]
+    height = max(img.shape[0] for img in processed)
+    width = max(img.shape[1] for img in processed)
+    batch = [
+        cv2.copyMakeBorder(img, 0, height - img.shape[0], 0, width - img.shape[1], cv2.BORDER_CONSTANT, value=255)
+        for img in processed
+    ]
+    
+    reader = _get_easyocr_reader()
+    with _easyocr_lock:
+        results = reader.readtext_batched(batch, detail=0, paragraph=True, batch_size=EASYOCR_RECOGNITION_BATCH)
+    return [clean_subtitle_text('\n'.join(lines)) for lines in results]
+
+
+def _iter_subtitle_bitmaps(pgs: PGSReader) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Yields (alpha channel, count) for each subtitle image in a SUP file, in display order.
+    
+    OCR only needs the alpha channel, so the colour image is never built. Runs of
+    consecutive images with exactly the same opaque pixels (repeats, or the steps of a
+    fade) are yielded once, with `count` set to the length of the run. Anything short of
+    an exact match is OCRed again, since similar-looking subtitles ("Yes, sir." and
+    "No, sir.") can differ in only a few pixels.
+    """
+    previous, previous_mask, count = None, None, 0
+    for alpha in _iter_alpha_images(pgs):
+        mask = alpha > 0
+        if previous_mask is not None and np.array_equal(mask, previous_mask):
+            count += 1
+            continue
+        if previous is not None:
+            yield previous, count
+        previous, previous_mask, count = alpha, mask, 1
+    if previous is not None:
+        yield previous, count
+
+
+def _iter_alpha_images(pgs: PGSReader) -> Iterator[np.ndarray]:
+    """
+    Yields the alpha channel of each subtitle image in a SUP file, in display order,
+    skipping images with fewer than MIN_OCR_INK_PIXELS opaque pixels.
+    """
+    for ds in pgs.iter_displaysets():
+        # Only process if this display set has an image (start of a subtitle)
+        if not ds.has_image:
+            continue
+        try:
+            alpha = make_alpha_image(
+                ods=ds.ods[0],
+                pds=ds.pds[0],
+            )
+        except Exception as e:
+            logger.warning("  Error processing display set: %s", e)
+            continue
+        # Cheap check that spares tesseract blank and near-blank frames
+        if np.count_nonzero(alpha > 127) >= MIN_OCR_INK_PIXELS:
+            yield alpha
+
+
+def _ocr_each(ocr: Callable[[List[np.ndarray]], List[str]], images: Sequence[np.ndarray]) -> List[str]:
+    """
+    OCRs images one at a time with `ocr` (ocr_images or ocr_images_easyocr), giving ""
+    for any image that fails.
+    """
+    texts = []
+    for image in images:
+        try:
+            texts.extend(ocr([image]))
+        except Exception as e:
+            logger.warning("  Error processing display set: %s", e)
+            texts.append("")
+    return texts
 
 
-def extract_text_from_sup(sup_file_path: str, max_subtitles: Optional[int] = None) -> List[str]:
+def extract_text_from_sup(sup_file_path: Union[str, BinaryIO], max_subtitles: Optional[int] = None, workers: int = OCR_WORKERS, ocr_backend: str = "tesseract", executor: Optional[ThreadPoolExecutor] = None) -> List[str]:
     """
-    Extracts text from SUP file up to `max_subtitles` entries.
+    Extracts text from a SUP file or stream up to `max_subtitles` entries.
+    
+    Images are OCRed in small batches (see ocr_images and ocr_images_easyocr) on `workers` threads, a few ahead
+    of the one being collected, so results keep their display order and little extra work
+    is done past `max_subtitles`. Consecutive repeats of an image are OCRed once and their
+    text is reused.
     
     Args:
-        sup_file_path: Path to the SUP file
+        sup_file_path: Path to the SUP file, or a binary stream of SUP data (read as it arrives)
         max_subtitles: Maximum number of subtitles to extract
+        workers: Number of images to OCR concurrently
+        ocr_backend: One of OCR_BACKENDS
+        executor: Optional long-lived thread pool to OCR on (see SubtitleExtractionSession);
+                  by default one with `workers` threads is created for this call.
     
     Returns:
         list[str]: List of extracted subtitle strings
     """
+    workers = max(1, workers)
+    if ocr_backend == "easyocr":
+        ocr, batch_size = ocr_images_easyocr, EASYOCR_BATCH_SIZE
+    else:
+        ocr, batch_size = ocr_images, OCR_BATCH_SIZE
+    if max_subtitles is not None:
+        # Don't OCR much more than needed when only a few subtitles are wanted
+        batch_size = max(1, min(batch_size, -(-max_subtitles // workers)))
     try:
         pgs = PGSReader(sup_file_path)
+        bitmaps = _iter_subtitle_bitmaps(pgs)
         subtitles = []
-        count = 0
         
-        # Iterate through Display Sets
-        for ds in pgs.iter_displaysets():
-            
-            # Stop if we hit the limit
-            if max_subtitles is not None and count >= max_subtitles:
-                break
-
-            # Only process if this display set has an image (start of a subtitle)
-            if ds.has_image:
+        with ThreadPoolExecutor(max_workers=workers) if executor is None else contextlib.nullcontext(executor) as executor:
+            pending = deque()
+            while max_subtitles is None or len(subtitles) < max_subtitles:
+                # Keep one batch per worker queued behind the one being collected
+                while len(pending) <= workers:
+                    batch = list(itertools.islice(bitmaps, batch_size))
+                    if not batch:
+                        break
+                    images, counts = zip(*batch)
+                    pending.append((executor.submit(ocr, list(images)), images, counts))
+                if not pending:
+                    break
+                
+                future, images, counts = pending.popleft()
                 try:
-                    pil_image = make_image(
-                        ods=ds.ods[0],
-                        pds=ds.pds[0],
-                    )
-                    
-                    if pil_image:
-                        # Convert PIL (RGBA) -> OpenCV (BGRA)
-                        pil_image = pil_image.convert("RGBA")
-                        open_cv_image = np.array(pil_image)
-                        open_cv_image = open_cv_image[:, :, ::-1].copy()
-                        
-                        # Perform OCR
-                        text = ocr_image(open_cv_image)
-                        
-                        # Only add if we actually got text back (ignores empty glitches)
-                        if text:
-                            subtitles.append(text)
-                            logger.debug("  Extracted subtitle %d: \"%s\"", count + 1, text)
-                            count += 1
+                    texts = future.result()
                 except Exception as e:
-                    logger.warning("  Error processing display set: %s", e)
-                    continue
+                    # Retry one image at a time, so a bad bitmap only loses its own text
+                    logger.warning("  Error processing display sets (%s); retrying them one at a time.", e)
+                    texts = _ocr_each(ocr, images)
+                
+                for text, count in zip(texts, counts):
+                    # Only add if we actually got text back (ignores empty glitches)
+                    if not text:
+                        continue
+                    for _ in range(count):
+                        subtitles.append(text)
+                        logger.debug("  Extracted subtitle %d: \"%s\"", len(subtitles), text)
+                        if len(subtitles) == max_subtitles:
+                            break
+                    if len(subtitles) == max_subtitles:
+                        break
+            
+            # Don't OCR images past the limit
+            for future, _, _ in pending:
+                future.cancel()
         
         return subtitles
         
@@ -248,14 +636,14 @@ def extract_text_from_sup(sup_file_path: str, max_subtitles: Optional[int] = Non
         return []
 
 
-def extract_subtitles(video_file: str, subtitle_track_index: Optional[int] = None, offset_minutes: int = 0, max_frames: Optional[int] = None, scan_duration_minutes: int = 15, output_dir: Optional[str] = None) -> List[str]:
+def extract_subtitles(video_file: str, subtitle_track_index: Optional[int] = None, offset_minutes: int = 0, max_frames: Optional[int] = None, scan_duration_minutes: int = 15, output_dir: Optional[str] = None, ocr_backend: str = "tesseract", session: Optional["SubtitleExtractionSession"] = None) -> List[str]:
     """
     Extracts subtitles from a video file using FFmpeg and OCR.
     
     This function:
     1. Uses ffprobe to find the English subtitle stream
-    2. Uses ffmpeg to extract the subtitle stream to a SUP file
-    3. Extracts text from the SUP file using PGSReader and OCR
+    2. Uses ffmpeg to extract the subtitle stream as SUP data over a pipe
+    3. Extracts text from the SUP data using PGSReader and OCR, while ffmpeg is still running
     
     Args:
         video_file (str): Path to the video file.
@@ -264,6 +652,8 @@ def extract_subtitles(video_file: str, subtitle_track_index: Optional[int] = Non
         max_frames (int): Maximum number of subtitles to extract.
         scan_duration_minutes (int): How many minutes of the video to scan for subtitles.
         output_dir (str): Optional directory to save JSON output. If None, prints to console.
+        ocr_backend (str): OCR engine, one of OCR_BACKENDS.
+        session (SubtitleExtractionSession): Optional session whose OCR threads are reused.
 
     Returns:
         list[str]: A list of extracted subtitle strings.
@@ -271,6 +661,10 @@ def extract_subtitles(video_file: str, subtitle_track_index: Optional[int] = Non
     if not os.path.exists(video_file):
         logger.error("Error: File not found at %s", video_file)
         return []
+    
+    if ocr_backend == "easyocr" and not EASYOCR_AVAILABLE:
+        logger.error("Error: EasyOCR is not installed. Install it with: pip install tvidentify[easyocr]")
+        return []
 
     # Find the English subtitle stream
     subtitle_stream_index = find_subtitle_stream(video_file, subtitle_track_index)
@@ -278,25 +672,32 @@ def extract_subtitles(video_file: str, subtitle_track_index: Optional[int] = Non
         logger.error("Error: Could not find a suitable subtitle stream in the video file.")
         return []
 
-    all_subtitles = []
+    # Stream the subtitle track out of the video
+    proc = open_sup_stream(
+        video_file,
+        subtitle_stream_index,
+        offset_minutes=offset_minutes,
+        scan_duration_minutes=scan_duration_minutes
+    )
+    if proc is None:
+        logger.error("Failed to extract subtitle stream.")
+        return []
     
-    with tempfile.TemporaryDirectory() as temp_dir:
-        sup_file_path = os.path.join(temp_dir, "extracted.sup")
-        
-        # Extract the subtitle stream to a SUP file
-        if not extract_sup_file(
-            video_file,
-            sup_file_path,
-            subtitle_stream_index,
-            offset_minutes=offset_minutes,
-            scan_duration_minutes=scan_duration_minutes
-        ):
-            logger.error("Failed to extract subtitle stream to SUP file.")
-            return []
-        
-        # Extract text from the SUP file
-        logger.info("Performing OCR on subtitle frames...")
-        all_subtitles = extract_text_from_sup(sup_file_path, max_subtitles=max_frames)
+    # Extract text from the SUP data as ffmpeg produces it
+    logger.info("Performing OCR on subtitle frames...")
+    all_subtitles = []
+    try:
+        all_subtitles = extract_text_from_sup(
+            proc.stdout,
+            max_subtitles=max_frames,
+            ocr_backend=ocr_backend,
+            executor=session.ocr_executor if session is not None else None
+        )
+    finally:
+        stopped_early = max_frames is not None and len(all_subtitles) >= max_frames
+        if not close_sup_stream(proc, stopped_early=stopped_early):
+            logger.error("Failed to extract subtitle stream.")
+            all_subtitles = []
 
     # Save to JSON if output_dir is specified
     if output_dir:
@@ -322,6 +723,55 @@ def extract_subtitles(video_file: str, subtitle_track_index: Optional[int] = Non
 
     return all_subtitles
 
+class SubtitleExtractionSession:
+    """
+    Shares one pool of OCR threads between extract_subtitles calls.
+    
+    Each OCR thread keeps its tesserocr session (and so the loaded language model) for its
+    lifetime, so reusing the threads across files saves reloading it for every file.
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, ocr_workers: int = OCR_WORKERS):
+        self.ocr_executor = ThreadPoolExecutor(max_workers=max(1, ocr_workers), thread_name_prefix="ocr")
+
+    def extract(self, video_file: str, **kwargs: Any) -> List[str]:
+        """Runs extract_subtitles for the file (with the same keyword arguments) in this session."""
+        return extract_subtitles(video_file, session=self, **kwargs)
+
+    def close(self) -> None:
+        self.ocr_executor.shutdown()
+
+    def __enter__(self) -> "SubtitleExtractionSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def extract_subtitles_batch(video_files: List[str], max_workers: int = 1, **kwargs: Any) -> List[List[str]]:
+    """
+    Extracts subtitles from several video files at once.
+    
+    Each file gets its own ffmpeg (see extract_subtitles), and all files share one session's
+    OCR threads. The work runs outside the GIL, so the files are handled on threads.
+    
+    Args:
+        video_files: Paths to the video files.
+        max_workers: Number of files to extract at once (default: 1). Each file already OCRs
+                     several images at a time, and the OCR threads they share are capped
+                     (see batch_ocr_workers).
+        **kwargs: Passed on to extract_subtitles for every file.
+    
+    Returns:
+        list[list[str]]: The subtitles of each file, in the order of `video_files`.
+    """
+    max_workers = max(1, max_workers)
+    with SubtitleExtractionSession(ocr_workers=batch_ocr_workers(max_workers)) as session, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda video_file: session.extract(video_file, **kwargs), video_files))
+
+
 def add_extraction_args(parser: argparse.ArgumentParser) -> None:
     """
     Adds standard subtitle extraction arguments to the provided argparse parser.
@@ -332,6 +782,7 @@ def add_extraction_args(parser: argparse.ArgumentParser) -> None:
     group.add_argument('--offset', type=int, default=0, help='Skip the first N minutes of the video.')
     group.add_argument('--scan-duration', type=int, default=15, help='How many minutes of the video to scan for subtitles from the offset (default: 15).')
     group.add_argument('--output-dir', type=str, default=None, help='Optional directory to save JSON output instead of printing to console.')
+    group.add_argument('--ocr-backend', choices=OCR_BACKENDS, default='tesseract', help='OCR engine for subtitle images (default: tesseract). easyocr needs the optional easyocr package and is fastest with a CUDA GPU.')
 
 def main():
     parser = argparse.ArgumentParser(description='Extract subtitles from a video file using FFmpeg and OCR.')
@@ -361,7 +812,8 @@ def main():
         offset_minutes=args.offset,
         max_frames=args.max_frames,
         scan_duration_minutes=args.scan_duration,
-        output_dir=args.output_dir
+        output_dir=args.output_dir,
+        ocr_backend=args.ocr_backend
     )
 
     logger.info("--- All Extracted Subtitles ---")
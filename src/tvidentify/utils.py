@@ -1,10 +1,24 @@
 
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
-import subprocess
+import time
+import shutil
 import argparse
-from typing import Optional, Dict
+import functools
+from dataclasses import dataclass
+from typing import Any, Optional, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+logger = logging.getLogger(__name__)
 
 # --- Constants ---
 
@@ -14,12 +28,24 @@ DEFAULT_MODELS = {
     "perplexity": "sonar"
 }
 
-# The single source of truth for the LLM prompt
+# Environment variable holding each provider's API key
+API_KEY_ENV_VARS = {
+    "google": "GOOGLE_API_KEY",
+    "openai": "OPENAI_API_KEY",
+    "perplexity": "PERPLEXITY_API_KEY"
+}
+
+# Third-party loggers that report every HTTP request; only their warnings are shown
+QUIET_LOGGERS = ("httpx", "httpcore", "google_genai")
+
+# The single source of truth for the LLM prompt. Everything that is the same for every
+# episode of a series comes before the subtitles, so providers' automatic prompt-prefix
+# caching can reuse it across calls.
 EPISODE_IDENTIFICATION_PROMPT = """
 You are an expert TV series database assistant. Your task is to identify a TV episode strictly based on the provided subtitle snippet and series name.
 
 Instructions:
-1. Analyze the subtitle text below.
+1. Analyze the subtitle text at the end of this message.
 2. Identify specific character names, unique plot points, or dialogue lines.
 3. Match these details to your internal knowledge of the series "{series_name}".
 4. DO NOT perform a web search unless absolutely necessary. Rely on your training data.
@@ -27,11 +53,6 @@ Instructions:
 6. You must provide a confidence score (0-100) indicating how certain you are about the match.
 7. Provide a brief reasoning for your identification based on the subtitle content.
 
-Subtitles:
----
-{subtitle_text}
----
-
 Output Format:
 Return ONLY a raw JSON object with the format below. Do not output markdown code blocks:
 {{
@@ -40,65 +61,294 @@ Return ONLY a raw JSON object with the format below. Do not output markdown code
   "confidence_score": <0-100>,
   "reasoning": "<brief explanation of which line confirmed the match>"
 }}
+
+Subtitles:
+---
+{subtitle_text}
+---
+"""
+
+# Prompt for identifying several episodes in one request; {items} is built from
+# BATCH_ITEM_TEMPLATE, one block per episode
+BATCH_EPISODE_IDENTIFICATION_PROMPT = """
+You are an expert TV series database assistant. Your task is to identify {count} TV episodes, each strictly based on its own subtitle snippet and series name.
+
+Instructions:
+1. Treat each item below independently. Analyze its subtitle text.
+2. Identify specific character names, unique plot points, or dialogue lines.
+3. Match these details to your internal knowledge of the item's series.
+4. DO NOT perform a web search unless absolutely necessary. Rely on your training data.
+5. If an item's text is generic (e.g., "Hello", "How are you"), return null for that item.
+6. You must provide a confidence score (0-100) for each item indicating how certain you are about the match.
+7. Provide a brief reasoning for each identification based on the subtitle content.
+
+Output Format:
+Return ONLY a raw JSON array with exactly {count} objects, one per item in order (index 0 to {last_index}). Do not output markdown code blocks:
+[
+  {{
+    "index": <item index>,
+    "season": <int or null>,
+    "episode": <int or null>,
+    "confidence_score": <0-100>,
+    "reasoning": "<brief explanation of which line confirmed the match>"
+  }}
+]
+
+{items}"""
+
+BATCH_ITEM_TEMPLATE = """### Item {index} - Series: {series_name}
+Subtitles:
+---
+{subtitle_text}
+---
 """
 
 
+def dumps_json(obj: Any, pretty: bool = False) -> str:
+    """
+    Serializes obj to a JSON string, using orjson when it is installed.
+    
+    Args:
+        obj: The JSON-serializable object.
+        pretty: If True, indent with 2 spaces (same layout as json.dumps(indent=2)).
+                Otherwise the output is compact, with no whitespace between tokens.
+    
+    Returns:
+        str: The JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode('utf-8')
+    if pretty:
+        return json.dumps(obj, indent=2)
+    return json.dumps(obj, separators=(',', ':'))
+
+def loads_json(data: Union[str, bytes]) -> Any:
+    """
+    Parses a JSON document, using orjson when it is installed.
+    
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON (orjson's error subclasses it).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def get_cache_dir() -> str:
+    """
+    Returns the directory used for tvidentify's on-disk caches.
+    
+    Honors TVIDENTIFY_CACHE_DIR, then XDG_CACHE_HOME, and defaults to ~/.cache/tvidentify.
+    The directory is not created here.
+    """
+    override = os.environ.get("TVIDENTIFY_CACHE_DIR")
+    if override:
+        return override
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tvidentify")
+
+
+def _level_prefix(levelno: int) -> str:
+    """Console prefix for a log level: errors and warnings are made to pop."""
+    if levelno >= logging.ERROR:
+        return "❌ Error: "
+    if levelno >= logging.WARNING:
+        return "⚠️  Warning: "
+    return ""
+
+
+# Console prefix per level number, precomputed for the standard levels; others are added
+# on first use
+_LEVEL_PREFIXES = {
+    level: _level_prefix(level)
+    for level in (logging.NOTSET, logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+}
+
+
+class HumanFormatter(logging.Formatter):
+    """
+    Console log format: the bare message (like print()) for INFO and below, with a prefix
+    for warnings and errors.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        prefix = _LEVEL_PREFIXES.get(record.levelno)
+        if prefix is None:
+            prefix = _LEVEL_PREFIXES[record.levelno] = _level_prefix(record.levelno)
+        # Get the message with arguments applied (e.g. "Found %d files" -> "Found 5 files")
+        return prefix + record.getMessage()
+
+
+class DetailedFormatter(logging.Formatter):
+    """
+    Log file format: timestamp, level, logger and source location for every record.
+    
+    The date and time part of the timestamp is formatted once per second and reused for
+    the records logged within it; only the milliseconds are formatted per record.
+    """
+
+    FORMAT = '%(asctime)s [%(levelname)s] %(name)s (%(funcName)s:%(lineno)d): %(message)s'
+
+    def __init__(self):
+        super().__init__(self.FORMAT)
+        self._second_cache = (None, '')
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        second = int(record.created)
+        cached_second, formatted = self._second_cache
+        if second != cached_second:
+            formatted = time.strftime(self.default_time_format, self.converter(second))
+            self._second_cache = (second, formatted)
+        return self.default_msec_format % (formatted, record.msecs)
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    A FileHandler that writes through a 64 KiB buffer instead of flushing after every record.
+    
+    The buffer is flushed when a record arrives at least `flush_interval` seconds after the
+    last flush, for every ERROR or worse record, when the handler is closed (which logging
+    does at exit), and by the logging thread once no record has arrived for `flush_interval`
+    seconds (see _FlushingQueueListener).
+    """
+
+    buffer_size = 64 * 1024
+
+    def __init__(self, filename: str, mode: str = 'a', encoding: Optional[str] = None, flush_interval: float = 1.0):
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._pending = False
+        super().__init__(filename, mode=mode, encoding=encoding)
+
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=self.buffer_size, encoding=self.encoding)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._force_flush = record.levelno >= logging.ERROR
+        self._pending = True
+        super().emit(record)
+
+    def flush(self) -> None:
+        # Called by StreamHandler.emit after each record; only flush when it's due
+        now = time.monotonic()
+        if getattr(self, '_force_flush', True) or now - self._last_flush >= self.flush_interval:
+            self._last_flush = now
+            self._pending = False
+            super().flush()
+
+    def flush_pending(self) -> None:
+        """Flushes any records still held in the buffer."""
+        if self._pending:
+            self._force_flush = True
+            self.flush()
+
+    def close(self) -> None:
+        self._force_flush = True
+        super().close()
+
+
+class _FlushingQueueListener(logging.handlers.QueueListener):
+    """
+    A QueueListener that flushes its BufferedFileHandlers whenever the queue has been idle
+    for their flush interval, so the last records of a burst reach the disk without waiting
+    for the next one.
+    """
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        buffered = [h for h in self.handlers if isinstance(h, BufferedFileHandler)]
+        if not block or not buffered:
+            return super().dequeue(block)
+        timeout = min(h.flush_interval for h in buffered)
+        while True:
+            try:
+                return self.queue.get(timeout=timeout)
+            except queue.Empty:
+                for handler in buffered:
+                    handler.flush_pending()
+
+
+# Writes queued log records to the real handlers on a background thread (see setup_logging)
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_log_listener() -> None:
+    """Writes out any queued log records, stops the logging thread and closes its handlers."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.close()
+        _log_listener = None
+
+
+atexit.register(_stop_log_listener)
+
+
 def setup_logging(console_level: int = logging.INFO, log_file: Optional[str] = None, file_level: int = logging.INFO) -> None:
     """
     Configures the root logger with dual handlers:
     1. Console Handler: Human-friendly format (message only for INFO, prefixed for errors).
     2. File Handler (Optional): Detailed format with timestamps for machine debugging.
     
+    The handlers run on a background thread behind a QueueHandler, so logging calls only
+    enqueue the record and never wait on console or disk writes. Queued records are
+    written out at exit.
+    
     Args:
         console_level: Logging level for the console output (default: INFO)
         log_file: Path to a log file. If provided, logs are written here.
         file_level: Logging level for the log file (default: INFO).
     """
     root_log = logging.getLogger()
-    root_log.setLevel(logging.DEBUG)  # Capture everything at the root level
 
-    # Clear existing handlers to prevent duplicate logs on re-import/re-run
-    # Do not iterate over the list while modifying it
-    for handler in list(root_log.handlers):
-        root_log.removeHandler(handler)
+    # Clear existing handlers to prevent duplicate logs on re-import/re-run. The list is
+    # swapped out in one step, then the old handlers are closed to release their files.
+    old_handlers = root_log.handlers[:]
+    root_log.handlers[:] = []
+    for handler in old_handlers:
+        try:
+            handler.close()
+        except Exception:
+            pass
+    _stop_log_listener()
+    handlers = []
 
     # --- 1. Console Handler (Human Friendly) ---
     console_handler = logging.StreamHandler(sys.stderr)
     console_handler.setLevel(console_level)
 
-    class HumanFormatter(logging.Formatter):
-        def format(self, record):
-            # Get the message with arguments applied (e.g. "Found %d files" -> "Found 5 files")
-            message = record.getMessage()
-            
-            # For critical errors, make them pop.
-            if record.levelno >= logging.ERROR:
-                return f"❌ Error: {message}"
-            # For warnings, add a small prefix
-            elif record.levelno >= logging.WARNING:
-                return f"⚠️  Warning: {message}"
-            # For INFO and below, just print the message cleanly (like print())
-            return message
-
     console_handler.setFormatter(HumanFormatter())
-    root_log.addHandler(console_handler)
+    handlers.append(console_handler)
+
+    # Keep per-request HTTP client chatter out of the logs, even with --debug
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
 
     # --- 2. File Handler (Machine Friendly / Audit Trail) ---
     if log_file:
         try:
-            file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+            file_handler = BufferedFileHandler(log_file, mode='a', encoding='utf-8')
             file_handler.setLevel(file_level)  # Capture logs at correct level on disk
             
             # Standard detailed log format: Timestamp [Level] LoggerName (Func:Line): Message
-            detailed_formatter = logging.Formatter(
-                '%(asctime)s [%(levelname)s] %(name)s (%(funcName)s:%(lineno)d): %(message)s'
-            )
-            file_handler.setFormatter(detailed_formatter)
-            root_log.addHandler(file_handler)
+            file_handler.setFormatter(DetailedFormatter())
+            handlers.append(file_handler)
         except Exception as e:
             # Fallback if we can't write to the log file (e.g. permissions)
             sys.stderr.write(f"⚠️  Warning: Could not open log file '{log_file}': {e}\n")
 
+    # Records below every handler's level are dropped at the logger, before being queued
+    root_log.setLevel(min(handler.level for handler in handlers))
+
+    # --- 3. Hand records to the handlers on a background thread ---
+    global _log_listener
+    log_queue = queue.Queue(-1)
+    _log_listener = _FlushingQueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    root_log.addHandler(logging.handlers.QueueHandler(log_queue))
+
 def add_logging_args(parser: argparse.ArgumentParser) -> None:
     """
     Adds standard logging arguments to the provided argparse parser.
@@ -125,14 +375,7 @@ def check_api_key(provider: str) -> bool:
     Returns:
         bool: True if key exists, False otherwise.
     """
-    logger = logging.getLogger(__name__)
-    key_map = {
-        "google": "GOOGLE_API_KEY",
-        "openai": "OPENAI_API_KEY",
-        "perplexity": "PERPLEXITY_API_KEY"
-    }
-    
-    env_var = key_map.get(provider.lower())
+    env_var = API_KEY_ENV_VARS.get(provider.lower())
     if not env_var:
         logger.error("Unknown provider: %s", provider)
         return False
@@ -143,27 +386,51 @@ def check_api_key(provider: str) -> bool:
         
     return True
 
+# External tools needed for subtitle extraction: (command, display name)
+REQUIRED_TOOLS = (
+    ('ffmpeg', 'ffmpeg'),
+    ('ffprobe', 'ffprobe'),
+    ('tesseract', 'Tesseract OCR')
+)
+
+
+@dataclass(frozen=True)
+class ToolStatus:
+    """Whether each of the REQUIRED_TOOLS was found on the PATH."""
+    ffmpeg: bool
+    ffprobe: bool
+    tesseract: bool
+
+    def all_available(self) -> bool:
+        return self.ffmpeg and self.ffprobe and self.tesseract
+
+
+@functools.lru_cache(maxsize=1)
+def get_tool_status() -> ToolStatus:
+    """
+    Looks up the required tools on the PATH (without running them).
+    
+    The result is cached for the rest of the process.
+    """
+    return ToolStatus(**{tool_cmd: shutil.which(tool_cmd) is not None for tool_cmd, _ in REQUIRED_TOOLS})
+
+
+@functools.lru_cache(maxsize=1)
 def check_required_tools() -> bool:
     """
     Check if required tools are installed: ffmpeg, ffprobe, and tesseract.
     
+    The tools are looked up on the PATH rather than run, and the result is cached for
+    the rest of the process, so missing tools are only reported once.
+    
     Returns:
         bool: True if all tools are available, False otherwise
     """
-    logger = logging.getLogger(__name__)
-    tools = [
-        ('ffmpeg', 'ffmpeg', '-version'),
-        ('ffprobe', 'ffprobe', '-version'),
-        ('tesseract', 'Tesseract OCR', '--version')
-    ]
-    
-    all_available = True
-    for tool_cmd, tool_name, arg in tools:
-        try:
-            subprocess.run([tool_cmd, arg], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    status = get_tool_status()
+    for tool_cmd, tool_name in REQUIRED_TOOLS:
+        if getattr(status, tool_cmd):
             logger.debug("%s is available", tool_name)
-        except FileNotFoundError:
+        else:
             logger.error("%s is not installed or not in your PATH. Please install it.", tool_name)
-            all_available = False
     
-    return all_available
+    return status.all_available()
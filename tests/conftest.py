@@ -7,8 +7,10 @@ like ffmpeg, ffprobe, tesseract, and LLM API clients.
 
 import json
 import os
+import shutil
 import tempfile
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -18,6 +20,45 @@ import pytest
 # Environment Fixtures
 # ============================================================================
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(monkeypatch, tmp_path):
+    """Point tvidentify's on-disk caches at a per-test directory."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setenv("TVIDENTIFY_CACHE_DIR", str(cache_dir))
+    return cache_dir
+
+
+@pytest.fixture(autouse=True)
+def fresh_llm_clients():
+    """Drop LLM clients cached by earlier tests so each test sees its own mocks."""
+    from tvidentify.episode_identifier import _get_gemini_client, _get_openai_client
+    _get_gemini_client.cache_clear()
+    _get_openai_client.cache_clear()
+    yield
+    _get_gemini_client.cache_clear()
+    _get_openai_client.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_subtitle_track_cache():
+    """Drop ffprobe results cached by earlier tests."""
+    from tvidentify.subtitle_extractor import _cached_subtitle_tracks
+    _cached_subtitle_tracks.cache_clear()
+    yield
+    _cached_subtitle_tracks.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_tool_check():
+    """Forget required-tool checks cached by earlier tests."""
+    from tvidentify.utils import check_required_tools, get_tool_status
+    check_required_tools.cache_clear()
+    get_tool_status.cache_clear()
+    yield
+    check_required_tools.cache_clear()
+    get_tool_status.cache_clear()
+
+
 @pytest.fixture
 def mock_google_api_key(monkeypatch):
     """Set a mock Google API key in the environment."""
@@ -54,10 +95,18 @@ def clear_api_keys(monkeypatch):
 # FFprobe/FFmpeg Fixtures
 # ============================================================================
 
-@pytest.fixture
+# The canned ffprobe results are read-only, so each is built (and serialized) once
+# per session and can be handed straight to mocker.patch("subprocess.run", return_value=...)
+
+def _ffprobe_result(payload):
+    """Returns a successful subprocess.run result whose stdout is payload as JSON."""
+    return SimpleNamespace(returncode=0, stdout=json.dumps(payload), stderr="")
+
+
+@pytest.fixture(scope="session")
 def mock_ffprobe_english_subtitle():
-    """Returns mock ffprobe output with an English subtitle stream."""
-    return {
+    """Returns a mock ffprobe run whose output has an English subtitle stream."""
+    return _ffprobe_result({
         "streams": [
             {"index": 0, "codec_type": "video"},
             {"index": 1, "codec_type": "audio"},
@@ -74,13 +123,13 @@ def mock_ffprobe_english_subtitle():
                 "tags": {"language": "spa"}
             }
         ]
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ffprobe_no_english_subtitle():
-    """Returns mock ffprobe output without English subtitles."""
-    return {
+    """Returns a mock ffprobe run whose output has no English subtitles."""
+    return _ffprobe_result({
         "streams": [
             {"index": 0, "codec_type": "video"},
             {"index": 1, "codec_type": "audio"},
@@ -91,46 +140,63 @@ def mock_ffprobe_no_english_subtitle():
                 "tags": {"language": "spa"}
             }
         ]
-    }
+    })
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_ffprobe_no_subtitles():
-    """Returns mock ffprobe output with no subtitle streams."""
-    return {
+    """Returns a mock ffprobe run whose output has no subtitle streams."""
+    return _ffprobe_result({
         "streams": [
             {"index": 0, "codec_type": "video"},
             {"index": 1, "codec_type": "audio"}
         ]
-    }
+    })
 
 
 @pytest.fixture
 def mock_subprocess_success(mocker):
     """Mock subprocess.run to always succeed."""
-    mock_result = MagicMock()
-    mock_result.returncode = 0
-    mock_result.stdout = b""
-    mock_result.stderr = b""
-    return mocker.patch("subprocess.run", return_value=mock_result)
+    return mocker.patch("subprocess.run", return_value=SimpleNamespace(returncode=0, stdout=b"", stderr=b""))
 
 
 # ============================================================================
 # LLM Response Fixtures
 # ============================================================================
 
-@pytest.fixture
+class CallSpy:
+    """
+    A minimal stand-in for a mocked client class: counts calls and returns a fixed
+    client, without MagicMock's call recording.
+    """
+    __slots__ = ("call_count", "return_value")
+
+    def __init__(self, return_value=None):
+        self.call_count = 0
+        self.return_value = return_value
+
+    def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        return self.return_value
+
+
+_LLM_RESPONSE_SUCCESS = {
+    "season": 3,
+    "episode": 7,
+    "confidence_score": 95,
+    "reasoning": "The dialogue mentions Walter's confession which occurs in S03E07."
+}
+# Serialized once for the mock clients rather than in every test
+_LLM_RESPONSE_SUCCESS_JSON = json.dumps(_LLM_RESPONSE_SUCCESS)
+
+
+@pytest.fixture(scope="session")
 def mock_llm_response_success():
     """Returns a successful LLM identification response."""
-    return {
-        "season": 3,
-        "episode": 7,
-        "confidence_score": 95,
-        "reasoning": "The dialogue mentions Walter's confession which occurs in S03E07."
-    }
+    return _LLM_RESPONSE_SUCCESS
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_llm_response_null():
     """Returns an LLM response with null values (couldn't identify)."""
     return {
@@ -141,7 +207,7 @@ def mock_llm_response_null():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_llm_response_markdown():
     """Returns an LLM response wrapped in markdown code blocks."""
     return '''```json
@@ -155,37 +221,42 @@ def mock_llm_response_markdown():
 
 
 @pytest.fixture
-def mock_google_client(mocker, mock_llm_response_success):
-    """Mock the Google GenAI client."""
-    mock_response = MagicMock()
-    mock_response.text = json.dumps(mock_llm_response_success)
-    
-    mock_client_instance = MagicMock()
-    mock_client_instance.models.generate_content.return_value = mock_response
-    
-    # The Client is used as a context manager, so we need to mock __enter__
-    mock_client_class = MagicMock()
-    mock_client_class.return_value.__enter__ = MagicMock(return_value=mock_client_instance)
-    mock_client_class.return_value.__exit__ = MagicMock(return_value=False)
+def google_client_factory(mocker):
+    """
+    Returns a function that patches the Google GenAI client to answer every request
+    with the given response text, returning (client class CallSpy, mock client instance).
+    """
+    def make(response_text):
+        # Responses are plain data, so they need no MagicMock
+        mock_response = SimpleNamespace(text=response_text)
+        
+        mock_client_instance = MagicMock()
+        mock_client_instance.models.generate_content.return_value = mock_response
+        
+        # A single cached Client is reused across calls, so it is used directly
+        return mocker.patch("google.genai.Client", CallSpy(mock_client_instance)), mock_client_instance
     
-    return mocker.patch("tvidentify.episode_identifier.Client", mock_client_class)
+    return make
+
+
+@pytest.fixture
+def mock_google_client(google_client_factory):
+    """Mock the Google GenAI client."""
+    mock_client_class, _ = google_client_factory(_LLM_RESPONSE_SUCCESS_JSON)
+    return mock_client_class
 
 
 
 @pytest.fixture
-def mock_openai_client(mocker, mock_llm_response_success):
+def mock_openai_client(mocker):
     """Mock the OpenAI client."""
-    mock_choice = MagicMock()
-    mock_choice.message.content = json.dumps(mock_llm_response_success)
-    
-    mock_response = MagicMock()
-    mock_response.choices = [mock_choice]
+    mock_choice = SimpleNamespace(message=SimpleNamespace(content=_LLM_RESPONSE_SUCCESS_JSON))
+    mock_response = SimpleNamespace(choices=[mock_choice])
     
     mock_client = MagicMock()
     mock_client.chat.completions.create.return_value = mock_response
     
-    # Patch at openai.OpenAI since it's imported locally in the function
-    return mocker.patch("openai.OpenAI", return_value=mock_client)
+    return mocker.patch("openai.OpenAI", CallSpy(mock_client))
 
 
 
@@ -193,8 +264,81 @@ def mock_openai_client(mocker, mock_llm_response_success):
 # Filesystem Fixtures
 # ============================================================================
 
+def _create_sparse_file(filepath, size):
+    """Create a file of the given size with a single ftruncate (no data blocks written)."""
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        os.ftruncate(fd, size)
+    finally:
+        os.close(fd)
+
+
+def _populate_video_dir(template_dir, tmpdir):
+    """
+    Fill tmpdir with hard links to the mock videos in template_dir.
+    
+    Tests get their own directory entries to rename or add to, without re-creating the
+    files. Falls back to creating the sparse files where hard links are unavailable.
+    """
+    for filename in os.listdir(template_dir):
+        src = os.path.join(template_dir, filename)
+        dst = os.path.join(tmpdir, filename)
+        try:
+            os.link(src, dst)
+        except OSError:
+            _create_sparse_file(dst, os.path.getsize(src))
+
+
 @pytest.fixture
-def temp_video_dir():
+def fake_large_file():
+    """Returns a function (path, size) that creates a sparse file with the given apparent size."""
+    return _create_sparse_file
+
+
+@pytest.fixture(scope="session")
+def _video_dir_template(tmp_path_factory):
+    """Mock video files for temp_video_dir, created once per test session."""
+    template_dir = tmp_path_factory.mktemp("videos")
+    # We use sparse files to simulate sizes without using disk space
+    files = [
+        ("episode_01.mkv", 1_000_000_000),  # 1GB
+        ("episode_02.mkv", 1_000_000_000),  # 1GB
+        ("episode_03.mkv", 950_000_000),    # 950MB (still within threshold)
+        ("bonus_feature.mkv", 100_000_000), # 100MB (below threshold)
+        ("sample.mkv", 50_000_000),         # 50MB (below threshold)
+    ]
+    
+    for filename, size in files:
+        _create_sparse_file(os.path.join(template_dir, filename), size)
+    
+    return str(template_dir)
+
+
+@pytest.fixture(scope="session")
+def discovered_files(_video_dir_template):
+    """find_episode_files' result for the temp_video_dir layout, computed once per session."""
+    from tvidentify.batch_identifier import find_episode_files
+    return tuple(find_episode_files(_video_dir_template))
+
+
+@pytest.fixture(scope="session")
+def _already_named_dir_template(tmp_path_factory):
+    """Mock video files for temp_video_dir_already_named, created once per test session."""
+    template_dir = tmp_path_factory.mktemp("already_named")
+    files = [
+        ("Breaking Bad S01E01.mkv", 1_000_000_000),
+        ("Breaking Bad S01E02.mkv", 1_000_000_000),
+        ("random_file.mkv", 1_000_000_000),
+    ]
+    
+    for filename, size in files:
+        _create_sparse_file(os.path.join(template_dir, filename), size)
+    
+    return str(template_dir)
+
+
+@pytest.fixture
+def temp_video_dir(_video_dir_template):
     """
     Create a temporary directory with mock video files of varying sizes.
     
@@ -206,25 +350,41 @@ def temp_video_dir():
     - sample.mkv (50MB - simulated, should be excluded)
     """
     with tempfile.TemporaryDirectory() as tmpdir:
-        # Create mock video files with different sizes
-        # We use sparse files to simulate sizes without using disk space
-        files = [
-            ("episode_01.mkv", 1_000_000_000),  # 1GB
-            ("episode_02.mkv", 1_000_000_000),  # 1GB
-            ("episode_03.mkv", 950_000_000),    # 950MB (still within threshold)
-            ("bonus_feature.mkv", 100_000_000), # 100MB (below threshold)
-            ("sample.mkv", 50_000_000),         # 50MB (below threshold)
-        ]
-        
-        for filename, size in files:
-            filepath = os.path.join(tmpdir, filename)
-            with open(filepath, 'wb') as f:
-                f.seek(size - 1)
-                f.write(b'\0')
-        
+        _populate_video_dir(_video_dir_template, tmpdir)
         yield tmpdir
 
 
+@pytest.fixture(scope="session")
+def fake_video_proto(tmp_path_factory):
+    """
+    A directory holding one tiny fake video, test.mkv, shared by the whole session.
+    
+    Only for tests that read the video path; tests that rename or add files use
+    fake_video_dir.
+    """
+    proto_dir = tmp_path_factory.mktemp("proto")
+    (proto_dir / "test.mkv").write_bytes(b"fake")
+    return proto_dir
+
+
+@pytest.fixture
+def fake_video_dir(fake_video_proto, tmp_path):
+    """A per-test copy of fake_video_proto that the test may modify."""
+    video_dir = tmp_path / "videos"
+    shutil.copytree(fake_video_proto, video_dir)
+    return video_dir
+
+
+@pytest.fixture
+def make_file(tmp_path):
+    """Returns a function (name, data="test") that creates a text file in tmp_path and returns its path."""
+    def make(name, data="test"):
+        path = tmp_path / name
+        path.write_text(data)
+        return str(path)
+    return make
+
+
 @pytest.fixture
 def temp_video_dir_empty():
     """Create an empty temporary directory."""
@@ -233,23 +393,12 @@ def temp_video_dir_empty():
 
 
 @pytest.fixture
-def temp_video_dir_already_named():
+def temp_video_dir_already_named(_already_named_dir_template):
     """
     Create a temporary directory with files already in the correct format.
     """
     with tempfile.TemporaryDirectory() as tmpdir:
-        files = [
-            ("Breaking Bad S01E01.mkv", 1_000_000_000),
-            ("Breaking Bad S01E02.mkv", 1_000_000_000),
-            ("random_file.mkv", 1_000_000_000),
-        ]
-        
-        for filename, size in files:
-            filepath = os.path.join(tmpdir, filename)
-            with open(filepath, 'wb') as f:
-                f.seek(size - 1)
-                f.write(b'\0')
-        
+        _populate_video_dir(_already_named_dir_template, tmpdir)
         yield tmpdir
 
 
@@ -273,3 +422,19 @@ def sample_subtitles():
 def empty_subtitles():
     """Empty subtitle list for testing."""
     return []
+
+
+# ============================================================================
+# CLI Fixtures
+# ============================================================================
+
+@pytest.fixture(scope="session")
+def cli_mains():
+    """The CLI entry points, imported once for the whole test session."""
+    from tvidentify import batch_identifier, episode_identifier, file_renamer, subtitle_extractor
+    return {
+        "subtitle_extractor": subtitle_extractor.main,
+        "episode_identifier": episode_identifier.main,
+        "batch_identifier": batch_identifier.main,
+        "file_renamer": file_renamer.main,
+    }
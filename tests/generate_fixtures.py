@@ -12,9 +12,24 @@ import os
 import struct
 from pathlib import Path
 
+import numpy as np
+
 # Ensure PIL is available (it comes with opencv-python)
 from PIL import Image, ImageDraw, ImageFont
 
+# Segment header: "PG" magic, PTS, DTS, segment type, segment size
+_SEGMENT_HEADER = struct.Struct('>2sIIBH')
+# PCS: video width/height, frame rate, composition number, composition state, palette
+# update flag, palette ID, object count, then one composition object: object ID,
+# window ID, cropped flag, X/Y position
+_PCS = struct.Struct('>HHBHBBBBHBBHH')
+# WDS: window count, then one window: window ID, X/Y position, width, height
+_WDS = struct.Struct('>BBHHHH')
+# PDS: palette ID, palette version, then two entries of (index, Y, Cr, Cb, alpha)
+_PDS = struct.Struct('>BB' + 'BBBBB' * 2)
+# ODS header: object ID, object version, sequence flag, 24-bit data length, width, height
+_ODS_HEADER = struct.Struct('>HBB3sHH')
+
 
 def create_subtitle_test_image():
     """Create a subtitle-style image (white text on transparent background)."""
@@ -48,13 +63,7 @@ def create_sup_segment(segment_type, pts, data):
     - 2 bytes: segment size
     - N bytes: segment data
     """
-    magic = b'PG'
-    pts_bytes = struct.pack('>I', pts)  # Big-endian 4 bytes
-    dts_bytes = struct.pack('>I', 0)
-    type_byte = struct.pack('B', segment_type)
-    size_bytes = struct.pack('>H', len(data))
-    
-    return magic + pts_bytes + dts_bytes + type_byte + size_bytes + data
+    return _SEGMENT_HEADER.pack(b'PG', pts, 0, segment_type, len(data)) + data
 
 
 def create_minimal_sup_file(width=200, height=40):
@@ -68,68 +77,51 @@ def create_minimal_sup_file(width=200, height=40):
     - ODS (Object Definition Segment) - 0x15
     - END (End of Display Set) - 0x80
     """
-    segments = []
     pts = 90000  # 1 second in 90kHz clock
     
+    # Create a simple pattern: white rectangle that tesseract can read as text
+    # We'll draw "TEST" using a simple pixel pattern
+    rle_data = create_rle_text_image(width, height)
+    
+    # The file is packed straight into one buffer of exactly the right size
+    payload_sizes = (_PCS.size, _WDS.size, _PDS.size, _ODS_HEADER.size + len(rle_data), 0)
+    buf = bytearray(len(payload_sizes) * _SEGMENT_HEADER.size + sum(payload_sizes))
+    offset = 0
+    
+    def write(fmt, *fields):
+        nonlocal offset
+        fmt.pack_into(buf, offset, *fields)
+        offset += fmt.size
+    
     # 1. PCS - Presentation Composition Segment
-    pcs_data = bytearray()
-    pcs_data += struct.pack('>H', 1920)  # Video width
-    pcs_data += struct.pack('>H', 1080)  # Video height
-    pcs_data += struct.pack('B', 0x10)   # Frame rate
-    pcs_data += struct.pack('>H', 1)     # Composition number
-    pcs_data += struct.pack('B', 0x80)   # Composition state: Epoch Start
-    pcs_data += struct.pack('B', 0)      # Palette update flag
-    pcs_data += struct.pack('B', 0)      # Palette ID
-    pcs_data += struct.pack('B', 1)      # Number of composition objects
-    # Composition object
-    pcs_data += struct.pack('>H', 0)     # Object ID
-    pcs_data += struct.pack('B', 0)      # Window ID
-    pcs_data += struct.pack('B', 0)      # Object cropped flag
-    pcs_data += struct.pack('>H', 100)   # X position
-    pcs_data += struct.pack('>H', 500)   # Y position
-    segments.append(create_sup_segment(0x16, pts, bytes(pcs_data)))
+    # 1920x1080, Epoch Start, one composition object (ID 0, window 0) at (100, 500)
+    write(_SEGMENT_HEADER, b'PG', pts, 0, 0x16, _PCS.size)
+    write(_PCS, 1920, 1080, 0x10, 1, 0x80, 0, 0, 1, 0, 0, 0, 100, 500)
     
     # 2. WDS - Window Definition Segment
-    wds_data = bytearray()
-    wds_data += struct.pack('B', 1)      # Number of windows
-    wds_data += struct.pack('B', 0)      # Window ID
-    wds_data += struct.pack('>H', 100)   # X position
-    wds_data += struct.pack('>H', 500)   # Y position
-    wds_data += struct.pack('>H', width) # Width
-    wds_data += struct.pack('>H', height) # Height
-    segments.append(create_sup_segment(0x17, pts, bytes(wds_data)))
+    # One window (ID 0) at (100, 500) covering the subtitle
+    write(_SEGMENT_HEADER, b'PG', pts, 0, 0x17, _WDS.size)
+    write(_WDS, 1, 0, 100, 500, width, height)
     
     # 3. PDS - Palette Definition Segment
-    pds_data = bytearray()
-    pds_data += struct.pack('B', 0)      # Palette ID
-    pds_data += struct.pack('B', 0)      # Palette version
-    # Palette entry 0: transparent (Y=0, Cr=128, Cb=128, Alpha=0)
-    pds_data += struct.pack('BBBBB', 0, 16, 128, 128, 0)
-    # Palette entry 1: white (Y=235, Cr=128, Cb=128, Alpha=255)
-    pds_data += struct.pack('BBBBB', 1, 235, 128, 128, 255)
-    segments.append(create_sup_segment(0x14, pts, bytes(pds_data)))
+    # Palette 0, version 0. Entry 0: transparent (Y=16, Cr=128, Cb=128, Alpha=0);
+    # entry 1: white (Y=235, Cr=128, Cb=128, Alpha=255)
+    write(_SEGMENT_HEADER, b'PG', pts, 0, 0x14, _PDS.size)
+    write(_PDS, 0, 0, 0, 16, 128, 128, 0, 1, 235, 128, 128, 255)
     
     # 4. ODS - Object Definition Segment with RLE-encoded image
-    # Create a simple pattern: white rectangle that tesseract can read as text
-    # We'll draw "TEST" using a simple pixel pattern
-    ods_data = bytearray()
-    ods_data += struct.pack('>H', 0)     # Object ID
-    ods_data += struct.pack('B', 0)      # Object version
-    ods_data += struct.pack('B', 0xC0)   # Sequence flag: First and Last
-    
-    # RLE data placeholder - we'll build the image
-    rle_data = create_rle_text_image(width, height)
-    
-    ods_data += struct.pack('>I', len(rle_data) + 4)[1:]  # Data length (3 bytes)
-    ods_data += struct.pack('>H', width)   # Width
-    ods_data += struct.pack('>H', height)  # Height
-    ods_data += rle_data
-    segments.append(create_sup_segment(0x15, pts, bytes(ods_data)))
+    # Object 0, version 0, sequence flag First and Last; the data length counts the
+    # width/height fields too
+    data_length = (len(rle_data) + 4).to_bytes(3, 'big')
+    write(_SEGMENT_HEADER, b'PG', pts, 0, 0x15, _ODS_HEADER.size + len(rle_data))
+    write(_ODS_HEADER, 0, 0, 0xC0, data_length, width, height)
+    buf[offset:offset + len(rle_data)] = rle_data
+    offset += len(rle_data)
     
     # 5. END - End of Display Set
-    segments.append(create_sup_segment(0x80, pts, b''))
+    write(_SEGMENT_HEADER, b'PG', pts, 0, 0x80, 0)
     
-    return b''.join(segments)
+    return bytes(buf)
 
 
 def create_rle_text_image(width, height):
@@ -155,34 +147,17 @@ def create_rle_text_image(width, height):
     
     draw.text((10, 8), "TEST", fill=1, font=font)  # Color index 1 = white
     
-    # Convert to RLE
+    # Convert to RLE, finding each row's runs with NumPy
     rle = bytearray()
-    pixels = list(img.getdata())
-    
-    for y in range(height):
-        row = pixels[y * width:(y + 1) * width]
-        x = 0
-        while x < width:
-            color = row[x]
-            # Count run length
-            run_length = 1
-            while x + run_length < width and row[x + run_length] == color and run_length < 255:
-                run_length += 1
-            
-            if color == 0:  # Transparent
-                if run_length < 64:
-                    rle += bytes([0x00, run_length])
-                else:
-                    rle += bytes([0x00, 0x40 + (run_length >> 8), run_length & 0xFF])
-            else:  # Color pixel
-                if run_length == 1:
-                    rle += bytes([color])
-                elif run_length < 64:
-                    rle += bytes([0x00, 0x80 + run_length, color])
-                else:
-                    rle += bytes([0x00, 0xC0 + (run_length >> 8), run_length & 0xFF, color])
-            
-            x += run_length
+    pixels = np.asarray(img, dtype=np.uint8)
+    
+    for row in pixels:
+        boundaries = np.flatnonzero(np.concatenate(([True], row[1:] != row[:-1], [True])))
+        for start, end in zip(boundaries[:-1].tolist(), boundaries[1:].tolist()):
+            color = int(row[start])
+            # Runs are written in pieces of at most 255 pixels
+            for offset in range(start, end, 255):
+                _append_rle_run(rle, color, min(255, end - offset))
         
         # End of line
         rle += bytes([0x00, 0x00])
@@ -190,6 +165,22 @@ def create_rle_text_image(width, height):
     return bytes(rle)
 
 
+def _append_rle_run(rle, color, run_length):
+    """Append one run of run_length pixels of the given color to the RLE data."""
+    if color == 0:  # Transparent
+        if run_length < 64:
+            rle += bytes([0x00, run_length])
+        else:
+            rle += bytes([0x00, 0x40 + (run_length >> 8), run_length & 0xFF])
+    else:  # Color pixel
+        if run_length == 1:
+            rle += bytes([color])
+        elif run_length < 64:
+            rle += bytes([0x00, 0x80 + run_length, color])
+        else:
+            rle += bytes([0x00, 0xC0 + (run_length >> 8), run_length & 0xFF, color])
+
+
 
 def main():
     """Generate all test fixtures."""
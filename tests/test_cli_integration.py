@@ -7,20 +7,28 @@ are properly honored and affect the output/behavior as expected.
 
 import json
 import os
-import sys
-import tempfile
-from io import StringIO
-from unittest.mock import MagicMock, patch
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 
+from tvidentify.batch_identifier import find_episode_files
 
+
+@pytest.fixture(scope="class")
+def ffprobe_finds_no_streams(class_mocker):
+    """Mock ffprobe to report no streams (no subtitles) for every test in a class."""
+    result = SimpleNamespace(returncode=0, stdout=json.dumps({"streams": []}))
+    return class_mocker.patch("subprocess.run", return_value=result)
+
+
+@pytest.mark.usefixtures("ffprobe_finds_no_streams")
 class TestSubtitleExtractorCLI:
     """Tests for subtitle_extractor CLI arguments."""
 
-    def test_cli_subtitle_extractor_missing_file_exits_gracefully(self, mocker, capsys):
+    def test_cli_subtitle_extractor_missing_file_exits_gracefully(self, cli_mains, mocker):
         """Non-existent input file exits with error message, no crash."""
-        from tvidentify.subtitle_extractor import main
         
         mocker.patch("sys.argv", [
             "subtitle_extractor",
@@ -28,205 +36,185 @@ class TestSubtitleExtractorCLI:
         ])
         
         # Should not raise an exception
-        main()
+        cli_mains["subtitle_extractor"]()
         
         # The function should complete without crashing
         # (actual error handling is in the function)
 
     def test_cli_subtitle_extractor_json_output_creates_file(
-        self, mocker, mock_ffprobe_english_subtitle
+        self, cli_mains, mocker, mock_ffprobe_english_subtitle, fake_video_proto, tmp_path
     ):
         """--output-dir argument causes JSON file to be written."""
-        from tvidentify.subtitle_extractor import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a fake video file
-            video_file = os.path.join(tmpdir, "test_video.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake video")
-            
-            output_dir = os.path.join(tmpdir, "output")
-            
-            # Mock ffprobe to fail finding subtitles (simpler test)
-            mock_result = MagicMock()
-            mock_result.returncode = 0
-            mock_result.stdout = json.dumps({"streams": []})
-            mocker.patch("subprocess.run", return_value=mock_result)
-            
-            mocker.patch("sys.argv", [
-                "subtitle_extractor",
-                video_file,
-                "--output-dir", output_dir
-            ])
-            
-            main()
-            
-            # Even if no subtitles found, the code path was exercised
-
-    def test_cli_subtitle_extractor_max_frames_argument_parsed(self, mocker):
+        video_file = str(fake_video_proto / "test.mkv")
+        output_dir = str(tmp_path / "output")
+        
+        mocker.patch("sys.argv", [
+            "subtitle_extractor",
+            video_file,
+            "--output-dir", output_dir
+        ])
+        
+        cli_mains["subtitle_extractor"]()
+        
+        # Even if no subtitles found, the code path was exercised
+
+    def test_cli_subtitle_extractor_max_frames_argument_parsed(self, cli_mains, mocker, fake_video_proto):
         """--max-frames argument is parsed and used."""
-        from tvidentify.subtitle_extractor import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_file = os.path.join(tmpdir, "test.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake")
-            
-            # Mock to return empty (no subtitles)
-            mock_result = MagicMock()
-            mock_result.returncode = 0
-            mock_result.stdout = json.dumps({"streams": []})
-            mocker.patch("subprocess.run", return_value=mock_result)
-            
-            mocker.patch("sys.argv", [
-                "subtitle_extractor",
-                video_file,
-                "--max-frames", "10"
-            ])
-            
-            # Should parse without error
-            main()
+        video_file = str(fake_video_proto / "test.mkv")
+        
+        mocker.patch("sys.argv", [
+            "subtitle_extractor",
+            video_file,
+            "--max-frames", "10"
+        ])
+        
+        # Should parse without error
+        cli_mains["subtitle_extractor"]()
 
 
 class TestEpisodeIdentifierCLI:
     """Tests for episode_identifier CLI arguments."""
 
     def test_cli_episode_identifier_provider_google(
-        self, mocker, mock_google_api_key, mock_ffprobe_english_subtitle
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, fake_video_proto, mock_ffprobe_english_subtitle
     ):
         """--provider google routes to Google API."""
-        from tvidentify.episode_identifier import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_file = os.path.join(tmpdir, "test.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake")
-            
-            # Mock extraction to return some subtitles
-            mocker.patch(
-                "tvidentify.episode_identifier.extract_subtitles",
-                return_value=["Test subtitle"]
-            )
-            
-            # Mock check_required_tools to always return True
-            mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
-
-            # Mock the Google client with context manager support
-            mock_response = MagicMock()
-            mock_response.text = '{"season": 1, "episode": 1, "confidence_score": 90}'
-            mock_client_instance = MagicMock()
-            mock_client_instance.models.generate_content.return_value = mock_response
-            mock_client_class = MagicMock()
-            mock_client_class.return_value.__enter__ = MagicMock(return_value=mock_client_instance)
-            mock_client_class.return_value.__exit__ = MagicMock(return_value=False)
-            mock_google = mocker.patch(
-                "tvidentify.episode_identifier.Client",
-                mock_client_class
-            )
-            
-            mocker.patch("sys.argv", [
-                "episode_identifier",
-                video_file,
-                "--series-name", "Test Series",
-                "--provider", "google"
-            ])
-            
-            main()
-            
-            # Verify Google client was used
-            mock_google.assert_called()
+        video_file = str(fake_video_proto / "test.mkv")
+        
+        # Mock extraction to return some subtitles
+        mocker.patch(
+            "tvidentify.subtitle_extractor.extract_subtitles",
+            return_value=["Test subtitle"]
+        )
+        
+        # Mock check_required_tools to always return True
+        mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
+
+        # Mock the Google client
+        mock_google, _ = google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
+        
+        mocker.patch("sys.argv", [
+            "episode_identifier",
+            video_file,
+            "--series-name", "Test Series",
+            "--provider", "google"
+        ])
+        
+        cli_mains["episode_identifier"]()
+        
+        # Verify Google client was used
+        assert mock_google.call_count == 1
 
     def test_cli_episode_identifier_provider_openai(
-        self, mocker, mock_openai_api_key, mock_ffprobe_english_subtitle
+        self, cli_mains, mocker, mock_openai_api_key, fake_video_proto, mock_ffprobe_english_subtitle
     ):
         """--provider openai routes to OpenAI API."""
-        from tvidentify.episode_identifier import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_file = os.path.join(tmpdir, "test.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake")
-            
-            mocker.patch(
-                "tvidentify.episode_identifier.extract_subtitles",
-                return_value=["Test subtitle"]
-            )
-            
-            # Mock check_required_tools to always return True
-            mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
-
-            mock_choice = MagicMock()
-            mock_choice.message.content = '{"season": 1, "episode": 1, "confidence_score": 90}'
-            mock_response = MagicMock()
-            mock_response.choices = [mock_choice]
-            mock_client = MagicMock()
-            mock_client.chat.completions.create.return_value = mock_response
-            # Patch at openai.OpenAI since it's imported locally
-            mock_openai = mocker.patch("openai.OpenAI", return_value=mock_client)
-            
-            mocker.patch("sys.argv", [
-                "episode_identifier",
-                video_file,
-                "--series-name", "Test Series",
-                "--provider", "openai"
-            ])
-            
-            main()
-            
-            mock_openai.assert_called()
+        video_file = str(fake_video_proto / "test.mkv")
+        
+        mocker.patch(
+            "tvidentify.subtitle_extractor.extract_subtitles",
+            return_value=["Test subtitle"]
+        )
+        
+        # Mock check_required_tools to always return True
+        mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
+
+        mock_choice = SimpleNamespace(message=SimpleNamespace(content='{"season": 1, "episode": 1, "confidence_score": 90}'))
+        mock_response = SimpleNamespace(choices=[mock_choice])
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai = mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        mocker.patch("sys.argv", [
+            "episode_identifier",
+            video_file,
+            "--series-name", "Test Series",
+            "--provider", "openai"
+        ])
+        
+        cli_mains["episode_identifier"]()
+        
+        mock_openai.assert_called()
 
     def test_cli_episode_identifier_model_passed_to_api(
-        self, mocker, mock_google_api_key
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, fake_video_proto
     ):
         """--model argument is forwarded to API client."""
-        from tvidentify.episode_identifier import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_file = os.path.join(tmpdir, "test.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake")
-            
-            mocker.patch(
-                "tvidentify.episode_identifier.extract_subtitles",
-                return_value=["Test subtitle"]
-            )
-            
-            # Mock check_required_tools to always return True
-            mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
-
-            # Mock the Google client with context manager support
-            mock_response = MagicMock()
-            mock_response.text = '{"season": 1, "episode": 1, "confidence_score": 90}'
-            mock_client_instance = MagicMock()
-            mock_client_instance.models.generate_content.return_value = mock_response
-            mock_client_class = MagicMock()
-            mock_client_class.return_value.__enter__ = MagicMock(return_value=mock_client_instance)
-            mock_client_class.return_value.__exit__ = MagicMock(return_value=False)
-            mocker.patch("tvidentify.episode_identifier.Client", mock_client_class)
-            
-            mocker.patch("sys.argv", [
-                "episode_identifier",
-                video_file,
-                "--series-name", "Test",
-                "--provider", "google",
-                "--model", "gemini-2.5-pro"
-            ])
-            
-            main()
-            
-            # Verify the model was passed in the call
-            call_args = mock_client_instance.models.generate_content.call_args
-            assert "gemini-2.5-pro" in str(call_args)
+        video_file = str(fake_video_proto / "test.mkv")
+        
+        mocker.patch(
+            "tvidentify.subtitle_extractor.extract_subtitles",
+            return_value=["Test subtitle"]
+        )
+        
+        # Mock check_required_tools to always return True
+        mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
 
+        # Mock the Google client
+        _, mock_client_instance = google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
+        
+        mocker.patch("sys.argv", [
+            "episode_identifier",
+            video_file,
+            "--series-name", "Test",
+            "--provider", "google",
+            "--model", "gemini-2.5-pro"
+        ])
+        
+        cli_mains["episode_identifier"]()
+        
+        # Verify the model was passed in the call
+        call_args = mock_client_instance.models.generate_content.call_args
+        assert "gemini-2.5-pro" in str(call_args)
+
+
+    def test_cli_episode_identifier_expands_glob_patterns(
+        self, cli_mains, mocker, mock_google_api_key, tmp_path
+    ):
+        """A quoted glob pattern is expanded and every match is identified concurrently."""
+        from unittest.mock import AsyncMock
+        
+        video_dir = tmp_path / "videos"
+        video_dir.mkdir()
+        for name in ("ep1.mkv", "ep2.mkv", "notes.txt"):
+            (video_dir / name).write_bytes(b"fake")
+        output_dir = tmp_path / "output"
+        
+        mock_extract = mocker.patch(
+            "tvidentify.subtitle_extractor.extract_subtitles",
+            side_effect=lambda video_file, **kwargs: [f"Subtitle from {os.path.basename(video_file)}"]
+        )
+        mocker.patch("tvidentify.episode_identifier.check_required_tools", return_value=True)
+        mock_identify = mocker.patch(
+            "tvidentify.episode_identifier.identify_episodes",
+            new=AsyncMock(return_value=[{"season": 1, "episode": 1}, {"season": 1, "episode": 2}])
+        )
+        mock_warm_up = mocker.patch("tvidentify.episode_identifier.warm_up_connection")
+        
+        mocker.patch("sys.argv", [
+            "episode_identifier",
+            str(video_dir / "*.mkv"),
+            "--series-name", "Test",
+            "--workers", "2",
+            "--output-dir", str(output_dir)
+        ])
+        
+        cli_mains["episode_identifier"]()
+        
+        assert mock_extract.call_count == 2
+        jobs = mock_identify.call_args[0][0]
+        assert [subtitles for _, subtitles in jobs] == [["Subtitle from ep1.mkv"], ["Subtitle from ep2.mkv"]]
+        assert sorted(os.listdir(output_dir)) == ["ep1_identification.json", "ep2_identification.json"]
+        # The concurrent requests use their own async client, which warm-up can't reach
+        mock_warm_up.assert_not_called()
 
 class TestBatchIdentifierCLI:
     """Tests for batch_identifier CLI arguments."""
 
     def test_cli_batch_identifier_no_rename_by_default(
-        self, mocker, mock_google_api_key, temp_video_dir
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, temp_video_dir
     ):
         """When --rename not specified, files are not renamed."""
-        from tvidentify.batch_identifier import main
         
         # Get list of files before
         files_before = set(os.listdir(temp_video_dir))
@@ -240,15 +228,8 @@ class TestBatchIdentifierCLI:
             return_value=["Test subtitle"]
         )
         
-        # Mock Google client with context manager support
-        mock_response = MagicMock()
-        mock_response.text = '{"season": 1, "episode": 1, "confidence_score": 90}'
-        mock_client_instance = MagicMock()
-        mock_client_instance.models.generate_content.return_value = mock_response
-        mock_client_class = MagicMock()
-        mock_client_class.return_value.__enter__ = MagicMock(return_value=mock_client_instance)
-        mock_client_class.return_value.__exit__ = MagicMock(return_value=False)
-        mocker.patch("tvidentify.episode_identifier.Client", mock_client_class)
+        # Mock Google client
+        google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
         
         mocker.patch("sys.argv", [
             "tvidentify",
@@ -256,17 +237,16 @@ class TestBatchIdentifierCLI:
             "--series-name", "Test Series"
         ])
         
-        main()
+        cli_mains["batch_identifier"]()
         
         # Files should be unchanged (no --rename flag)
         files_after = set(os.listdir(temp_video_dir))
         assert files_before == files_after
 
     def test_cli_batch_identifier_excludes_already_named(
-        self, mocker, mock_google_api_key, temp_video_dir_already_named
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, temp_video_dir_already_named
     ):
         """Files matching the expected format are skipped when --skip-already-named is used."""
-        from tvidentify.batch_identifier import main
         
         # Track which files get processed
         processed_files = []
@@ -283,15 +263,8 @@ class TestBatchIdentifierCLI:
             side_effect=track_extract
         )
         
-        # Mock Google client with context manager support
-        mock_response = MagicMock()
-        mock_response.text = '{"season": 1, "episode": 3, "confidence_score": 90}'
-        mock_client_instance = MagicMock()
-        mock_client_instance.models.generate_content.return_value = mock_response
-        mock_client_class = MagicMock()
-        mock_client_class.return_value.__enter__ = MagicMock(return_value=mock_client_instance)
-        mock_client_class.return_value.__exit__ = MagicMock(return_value=False)
-        mocker.patch("tvidentify.episode_identifier.Client", mock_client_class)
+        # Mock Google client
+        google_client_factory('{"season": 1, "episode": 3, "confidence_score": 90}')
         
         mocker.patch("sys.argv", [
             "tvidentify",
@@ -301,7 +274,7 @@ class TestBatchIdentifierCLI:
             "--skip-already-named"
         ])
         
-        main()
+        cli_mains["batch_identifier"]()
         
         # Only random_file.mkv should be processed (already named files skipped)
         assert "random_file.mkv" in processed_files
@@ -309,76 +282,196 @@ class TestBatchIdentifierCLI:
         assert "Breaking Bad S01E02.mkv" not in processed_files
 
 
+    def test_cli_batch_identifier_duplicates_identified_once_with_workers(
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, temp_video_dir, capsys
+    ):
+        """Concurrent workers identify duplicate files with a single LLM call, keeping the first file as the original."""
+        
+        mocker.patch("tvidentify.batch_identifier.check_required_tools", return_value=True)
+        
+        # Every episode file yields the same subtitles, so all but one are duplicates.
+        # The first file finishes extracting last, and must still be the original.
+        first_file = find_episode_files(temp_video_dir)[0]
+        
+        def extract(video_file, **kwargs):
+            if video_file == first_file:
+                time.sleep(0.05)
+            return ["Test subtitle"]
+        mocker.patch("tvidentify.batch_identifier.extract_subtitles", side_effect=extract)
+        
+        _, mock_client_instance = google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
+        
+        mocker.patch("sys.argv", [
+            "tvidentify",
+            temp_video_dir,
+            "--series-name", "Test Series",
+            "--workers", "4"
+        ])
+        
+        cli_mains["batch_identifier"]()
+        
+        results = json.loads(capsys.readouterr().out)
+        assert len(results) == 3
+        assert "duplicate_of" not in results[0]
+        assert [r["duplicate_of"] for r in results[1:]] == [os.path.basename(first_file)] * 2
+        assert mock_client_instance.models.generate_content.call_count == 1
+
+    def test_cli_batch_identifier_output_dir_writes_summary(
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, temp_video_dir
+    ):
+        """--output-dir writes batch_results.json as a JSON array in input order."""
+        
+        mocker.patch("tvidentify.batch_identifier.check_required_tools", return_value=True)
+        mocker.patch(
+            "tvidentify.batch_identifier.extract_subtitles",
+            side_effect=lambda video_file, *args, **kwargs: [os.path.basename(video_file)]
+        )
+        
+        google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
+        
+        output_dir = os.path.join(temp_video_dir, "output")
+        mocker.patch("sys.argv", [
+            "tvidentify",
+            temp_video_dir,
+            "--series-name", "Test Series",
+            "--output-dir", output_dir
+        ])
+        
+        cli_mains["batch_identifier"]()
+        
+        with open(os.path.join(output_dir, "batch_results.json")) as f:
+            results = json.load(f)
+        assert [r["input_file_name"] for r in results] == [
+            "episode_01.mkv", "episode_02.mkv", "episode_03.mkv"
+        ]
+
+    def test_cli_batch_identifier_reuses_saved_results(
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, temp_video_dir
+    ):
+        """A second run with the same --output-dir reuses saved results without extracting."""
+        
+        mocker.patch("tvidentify.batch_identifier.check_required_tools", return_value=True)
+        mock_extract = mocker.patch(
+            "tvidentify.batch_identifier.extract_subtitles",
+            side_effect=lambda video_file, *args, **kwargs: [os.path.basename(video_file)]
+        )
+        
+        _, mock_client_instance = google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
+        
+        output_dir = os.path.join(temp_video_dir, "output")
+        mocker.patch("sys.argv", [
+            "tvidentify",
+            temp_video_dir,
+            "--series-name", "Test Series",
+            "--output-dir", output_dir
+        ])
+        
+        cli_mains["batch_identifier"]()
+        assert mock_extract.call_count == 3
+        
+        cli_mains["batch_identifier"]()
+        assert mock_extract.call_count == 3
+        assert mock_client_instance.models.generate_content.call_count == 3
+        
+        with open(os.path.join(output_dir, "batch_results.json")) as f:
+            results = json.load(f)
+        assert [r["episode"] for r in results] == [1, 1, 1]
+
+    def test_cli_batch_identifier_detects_duplicates_of_reused_results(
+        self, cli_mains, mocker, mock_google_api_key, google_client_factory, temp_video_dir, fake_large_file
+    ):
+        """A file whose saved result is reused still marks later copies of it as duplicates."""
+        
+        mocker.patch("tvidentify.batch_identifier.check_required_tools", return_value=True)
+        subtitles = {"episode_01.mkv": ["Same"], "episode_02.mkv": ["Other"], "episode_03.mkv": ["Third"]}
+        mocker.patch(
+            "tvidentify.batch_identifier.extract_subtitles",
+            side_effect=lambda video_file, *args, **kwargs: subtitles[os.path.basename(video_file)]
+        )
+        
+        _, mock_client_instance = google_client_factory('{"season": 1, "episode": 1, "confidence_score": 90}')
+        
+        output_dir = os.path.join(temp_video_dir, "output")
+        mocker.patch("sys.argv", [
+            "tvidentify",
+            temp_video_dir,
+            "--series-name", "Test Series",
+            "--output-dir", output_dir
+        ])
+        cli_mains["batch_identifier"]()
+        
+        # episode_03.mkv is replaced by a copy of episode_01.mkv
+        replaced = os.path.join(temp_video_dir, "episode_03.mkv")
+        os.remove(replaced)
+        fake_large_file(replaced, 950_000_000)
+        subtitles["episode_03.mkv"] = ["Same"]
+        cli_mains["batch_identifier"]()
+        
+        with open(os.path.join(output_dir, "batch_results.json")) as f:
+            results = json.load(f)
+        assert "duplicate_of" not in results[0]
+        assert results[2]["duplicate_of"] == "episode_01.mkv"
+        assert mock_client_instance.models.generate_content.call_count == 3
+
 
 class TestFileRenamerCLI:
     """Tests for file_renamer CLI arguments."""
 
-    def test_cli_file_renamer_dry_run_shows_preview(self, mocker, capsys):
+    def test_cli_file_renamer_dry_run_shows_preview(self, cli_mains, mocker, fake_video_dir, capsys):
         """--dry-run outputs preview without modifying files."""
-        from tvidentify.file_renamer import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a batch results file
-            video_file = os.path.join(tmpdir, "episode.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake")
-            
-            batch_results = [{
-                "video_file_path": video_file,
-                "input_file_name": "episode.mkv",
-                "season": 1,
-                "episode": 5
-            }]
-            
-            results_file = os.path.join(tmpdir, "results.json")
-            with open(results_file, 'w') as f:
-                json.dump(batch_results, f)
-            
-            mocker.patch("sys.argv", [
-                "file_renamer",
-                "--batch-results", results_file,
-                "--series-name", "Breaking Bad",
-                "--dry-run"
-            ])
-            
-            main()
-            
-            # Original file should still exist
-            assert os.path.exists(video_file)
-            
-            # Output should mention what would be renamed
-            captured = capsys.readouterr()
-            assert "Breaking Bad S01E05" in captured.out or "would_rename" in captured.out
-
-    def test_cli_file_renamer_custom_format(self, mocker):
+        tmpdir = str(fake_video_dir)
+        video_file = os.path.join(tmpdir, "test.mkv")
+        
+        batch_results = [{
+            "video_file_path": video_file,
+            "input_file_name": "test.mkv",
+            "season": 1,
+            "episode": 5
+        }]
+        
+        results_file = fake_video_dir / "results.json"
+        results_file.write_text(json.dumps(batch_results))
+        
+        mocker.patch("sys.argv", [
+            "file_renamer",
+            "--batch-results", str(results_file),
+            "--series-name", "Breaking Bad",
+            "--dry-run"
+        ])
+        
+        cli_mains["file_renamer"]()
+        
+        # Original file should still exist
+        assert os.path.exists(video_file)
+        
+        # Output should mention what would be renamed
+        captured = capsys.readouterr()
+        assert "Breaking Bad S01E05" in captured.out or "would_rename" in captured.out
+
+    def test_cli_file_renamer_custom_format(self, cli_mains, mocker, fake_video_dir):
         """--rename-format applies custom naming format."""
-        from tvidentify.file_renamer import main
-        
-        with tempfile.TemporaryDirectory() as tmpdir:
-            video_file = os.path.join(tmpdir, "episode.mkv")
-            with open(video_file, 'w') as f:
-                f.write("fake")
-            
-            batch_results = [{
-                "video_file_path": video_file,
-                "input_file_name": "episode.mkv",
-                "season": 2,
-                "episode": 10
-            }]
-            
-            results_file = os.path.join(tmpdir, "results.json")
-            with open(results_file, 'w') as f:
-                json.dump(batch_results, f)
-            
-            mocker.patch("sys.argv", [
-                "file_renamer",
-                "--batch-results", results_file,
-                "--series-name", "The Wire",
-                "--rename-format", "{series} - {season}x{episode:02d}"
-            ])
-            
-            main()
-            
-            # Check for renamed file with custom format
-            expected_name = "The Wire - 2x10.mkv"
-            assert os.path.exists(os.path.join(tmpdir, expected_name))
+        tmpdir = str(fake_video_dir)
+        video_file = os.path.join(tmpdir, "test.mkv")
+        
+        batch_results = [{
+            "video_file_path": video_file,
+            "input_file_name": "test.mkv",
+            "season": 2,
+            "episode": 10
+        }]
+        
+        results_file = fake_video_dir / "results.json"
+        results_file.write_text(json.dumps(batch_results))
+        
+        mocker.patch("sys.argv", [
+            "file_renamer",
+            "--batch-results", str(results_file),
+            "--series-name", "The Wire",
+            "--rename-format", "{series} - {season}x{episode:02d}"
+        ])
+        
+        cli_mains["file_renamer"]()
+        
+        # Check for renamed file with custom format
+        expected_name = "The Wire - 2x10.mkv"
+        assert os.path.exists(os.path.join(tmpdir, expected_name))
@@ -2,42 +2,178 @@
 Tests for episode identification - LLM-based episode matching.
 """
 
+import asyncio
 import json
-from unittest.mock import MagicMock, patch
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from tvidentify.episode_identifier import identify_episode, _parse_json_response
+from tvidentify.episode_identifier import (
+    identify_episode,
+    identify_episodes,
+    identify_episodes_batched,
+    identify_episodes_offline,
+    preprocess_subtitles,
+    RateLimiter,
+    _build_prompt,
+    make_prompt_builder,
+    compile_template,
+    _count_tokens,
+    _parse_json_response,
+    warm_up_connection,
+)
 
 
 class TestParseJsonResponse:
     """Tests for JSON response parsing from LLM output."""
 
-    def test_parses_plain_json(self):
-        """Plain JSON is parsed correctly."""
-        response = '{"season": 1, "episode": 5, "confidence_score": 90}'
-        result = _parse_json_response(response)
-        
-        assert result["season"] == 1
-        assert result["episode"] == 5
-        assert result["confidence_score"] == 90
+    @pytest.mark.parametrize("response, expected", [
+        ('{"season": 1, "episode": 5, "confidence_score": 90}',
+         {"season": 1, "episode": 5, "confidence_score": 90}),
+        ('```json\n{\n  "season": 2,\n  "episode": 5,\n  "confidence_score": 88\n}\n```',
+         {"season": 2, "episode": 5, "confidence_score": 88}),
+        ('Here you go:\n```\n{"season": 4, "episode": 2}\n```',
+         {"season": 4, "episode": 2}),
+        ("this is not json at all", None),
+        ("", None),
+    ], ids=["plain", "markdown", "unlabeled-block", "invalid", "empty"])
+    def test_parses_response(self, response, expected):
+        """Plain and code-block-wrapped JSON is parsed; text without JSON returns None."""
+        assert _parse_json_response(response) == expected
 
-    def test_parses_markdown_wrapped_json(self, mock_llm_response_markdown):
-        """JSON wrapped in markdown code blocks is parsed correctly."""
+    def test_parses_markdown_fixture(self, mock_llm_response_markdown):
+        """The shared markdown-wrapped response fixture is parsed correctly."""
         result = _parse_json_response(mock_llm_response_markdown)
         
         assert result["season"] == 2
         assert result["episode"] == 5
 
-    def test_returns_none_for_invalid_json(self):
-        """Invalid JSON returns None."""
-        result = _parse_json_response("this is not json at all")
-        assert result is None
+    def test_plain_and_markdown_responses_agree(self, mock_llm_response_success):
+        """The same object parses identically bare, padded and wrapped in a code block."""
+        body = json.dumps(mock_llm_response_success)
+        
+        for response in (body, f"  {body}\n", f"```json\n{body}\n```"):
+            assert _parse_json_response(response) == mock_llm_response_success
+
+
+class TestPreprocessSubtitles:
+    """Tests for subtitle cleanup before prompting."""
+
+    def test_strips_tags_short_lines_and_repeats(self):
+        """Bracket tags, very short lines and repeated lines are removed, order is kept."""
+        subtitles = ["[music]", "Say my name.", "Yes", "[door slams] You're goddamn right.", "Say my name."]
+        
+        assert preprocess_subtitles(subtitles) == ["Say my name.", "You're goddamn right."]
+
+    def test_stops_at_max_chars(self):
+        """Subtitles beyond max_chars are dropped."""
+        subtitles = [f"Line number {i}" for i in range(10)]
+        
+        assert preprocess_subtitles(subtitles, max_chars=30) == ["Line number 0", "Line number 1"]
+
+
+class TestBuildPrompt:
+    """Tests for fitting the prompt into the model's context window."""
+
+    def test_oversized_subtitles_are_trimmed_to_fit(self):
+        """Trailing subtitles are dropped until the prompt fits the context window."""
+        subtitles = [f"Line {i}: " + "word " * 20 for i in range(3000)]
+        
+        prompt = _build_prompt("Show", subtitles, "gpt-4", dedupe=False)
+        
+        assert _count_tokens(prompt, "gpt-4") <= 8192 - 1024
+        assert "Line 0:" in prompt
+        assert "Line 2999:" not in prompt
+
+    def test_single_oversized_subtitle_is_cut_to_fit(self):
+        """One subtitle longer than the context window is truncated rather than sent whole."""
+        subtitles = ["Start " + "word " * 40000 + "End"]
+        
+        prompt = _build_prompt("Show", subtitles, "gpt-4", dedupe=False)
+        
+        assert _count_tokens(prompt, "gpt-4") <= 8192 - 1024
+        assert "Start word" in prompt
+        assert "End" not in prompt
+
+    def test_prompt_builder_matches_template(self):
+        """The per-series builder produces exactly the formatted template."""
+        from tvidentify.utils import EPISODE_IDENTIFICATION_PROMPT
+        
+        build = make_prompt_builder("Breaking Bad")
+        
+        assert build("Say my name.") == EPISODE_IDENTIFICATION_PROMPT.format(
+            series_name="Breaking Bad", subtitle_text="Say my name."
+        )
+        assert make_prompt_builder("Breaking Bad") is build
+
+    def test_compiled_template_matches_format(self):
+        """A compiled template renders exactly like str.format, escaped braces included."""
+        from tvidentify.utils import BATCH_EPISODE_IDENTIFICATION_PROMPT, BATCH_ITEM_TEMPLATE
+        
+        fields = {"count": 2, "last_index": 1, "items": "{items}"}
+        assert compile_template(BATCH_EPISODE_IDENTIFICATION_PROMPT)(**fields) == BATCH_EPISODE_IDENTIFICATION_PROMPT.format(**fields)
+        fields = {"index": 0, "series_name": "Lost", "subtitle_text": "Dude."}
+        assert compile_template(BATCH_ITEM_TEMPLATE)(**fields) == BATCH_ITEM_TEMPLATE.format(**fields)
+        assert compile_template("{n:02d}")(n=5) == "05"
+
+    def test_small_prompt_is_unchanged(self):
+        """Subtitles that already fit are all kept."""
+        prompt = _build_prompt("Show", ["Hello there, Walter.", "Say my name."], "gpt-4")
+        
+        assert "Hello there, Walter.\nSay my name." in prompt
+
+
+class TestLazyImports:
+    """Tests that provider SDKs are only imported when used."""
+
+    def test_import_does_not_load_provider_sdks(self):
+        """Importing the module leaves openai and google.genai unloaded."""
+        code = (
+            "import sys, tvidentify.episode_identifier; "
+            "print('openai' in sys.modules, 'google.genai' in sys.modules)"
+        )
+        src_dir = os.path.join(os.path.dirname(__file__), os.pardir, "src")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src_dir, os.environ.get("PYTHONPATH")])))
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, env=env).stdout
+        
+        assert output.split() == ["False", "False"]
+
+
+class TestWarmUpConnection:
+    """Tests for opening the provider connection ahead of the first request."""
 
-    def test_returns_none_for_empty_string(self):
-        """Empty string returns None."""
-        result = _parse_json_response("")
-        assert result is None
+    def test_warm_up_requests_model_list_in_background(self, mocker, mock_perplexity_api_key):
+        """A cheap request is made on the shared client from a background thread."""
+        mock_client = MagicMock()
+        mock_openai = mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        thread = warm_up_connection("perplexity")
+        thread.join(timeout=5)
+        
+        assert mock_openai.call_args.kwargs["base_url"] == "https://api.perplexity.ai"
+        mock_client.models.list.assert_called_once()
+
+    def test_openai_client_uses_http2_when_available(self, mocker, mock_openai_api_key):
+        """With h2 installed, the shared OpenAI client is given an HTTP/2 httpx client."""
+        mocker.patch("tvidentify.episode_identifier.HTTP2_AVAILABLE", True)
+        mock_http_client = mocker.patch("openai.DefaultHttpxClient")
+        mock_openai = mocker.patch("openai.OpenAI")
+        
+        warm_up_connection("openai").join(timeout=5)
+        
+        assert mock_http_client.call_args.kwargs["http2"] is True
+        assert mock_openai.call_args.kwargs["http_client"] is mock_http_client.return_value
+
+    def test_warm_up_skipped_without_api_key(self, mocker, clear_api_keys):
+        """Nothing is started when the provider's API key is missing."""
+        mock_openai = mocker.patch("openai.OpenAI")
+        
+        assert warm_up_connection("openai") is None
+        mock_openai.assert_not_called()
 
 
 class TestIdentifyEpisode:
@@ -96,11 +232,10 @@ class TestIdentifyEpisode:
             "reasoning": "Could not identify"
         }
         
-        mock_response = MagicMock()
-        mock_response.text = json.dumps(null_response)
+        mock_response = SimpleNamespace(text=json.dumps(null_response))
         mock_client = MagicMock()
         mock_client.models.generate_content.return_value = mock_response
-        mocker.patch("tvidentify.episode_identifier.Client", return_value=mock_client)
+        mocker.patch("google.genai.Client", return_value=mock_client)
         
         result = identify_episode(
             "Breaking Bad",
@@ -115,11 +250,10 @@ class TestIdentifyEpisode:
         self, mock_google_api_key, mocker, sample_subtitles
     ):
         """Malformed LLM response is handled gracefully."""
-        mock_response = MagicMock()
-        mock_response.text = "I don't know what episode this is, sorry!"
+        mock_response = SimpleNamespace(text="I don't know what episode this is, sorry!")
         mock_client = MagicMock()
         mock_client.models.generate_content.return_value = mock_response
-        mocker.patch("tvidentify.episode_identifier.Client", return_value=mock_client)
+        mocker.patch("google.genai.Client", return_value=mock_client)
         
         result = identify_episode(
             "Breaking Bad",
@@ -154,7 +288,7 @@ class TestProviderRouting:
         identify_episode("Series", sample_subtitles, provider="google")
         
         # Verify Google client was instantiated
-        mock_google_client.assert_called()
+        assert mock_google_client.call_count == 1
 
     def test_openai_provider_uses_openai_client(
         self, mock_openai_api_key, mock_openai_client, sample_subtitles
@@ -163,7 +297,63 @@ class TestProviderRouting:
         identify_episode("Series", sample_subtitles, provider="openai")
         
         # Verify OpenAI client was instantiated
-        mock_openai_client.assert_called()
+        assert mock_openai_client.call_count == 1
+
+    def test_openai_json_mode_rejection_falls_back_to_plain_request(
+        self, mocker, mock_openai_api_key, sample_subtitles
+    ):
+        """Models that reject response_format are retried, and later called, without it."""
+        import httpx
+        from openai import BadRequestError
+        mocker.patch("tvidentify.episode_identifier._NO_JSON_MODE_MODELS", set())
+        
+        rejection = BadRequestError(
+            "response_format not supported",
+            response=httpx.Response(400, request=httpx.Request("POST", "https://api.openai.com")),
+            body=None
+        )
+        mock_choice = SimpleNamespace(message=SimpleNamespace(content='{"season": 1, "episode": 2}'))
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = [rejection, SimpleNamespace(choices=[mock_choice]), SimpleNamespace(choices=[mock_choice])]
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        first = identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai")
+        second = identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai", use_cache=False)
+        
+        assert first["episode"] == 2 and second["episode"] == 2
+        calls = mock_client.chat.completions.create.call_args_list
+        assert "response_format" in calls[0].kwargs
+        assert "response_format" not in calls[1].kwargs
+        assert "response_format" not in calls[2].kwargs
+
+    def test_cached_result_skips_llm_call(
+        self, mocker, mock_openai_api_key, sample_subtitles
+    ):
+        """A repeated identical request is answered from the on-disk cache."""
+        mock_choice = SimpleNamespace(message=SimpleNamespace(content='{"season": 1, "episode": 2}'))
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = SimpleNamespace(choices=[mock_choice])
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        first = identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai")
+        second = identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai")
+        uncached = identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai", use_cache=False)
+        
+        assert first == second == uncached
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_errors_are_not_cached(
+        self, mocker, mock_openai_api_key, sample_subtitles
+    ):
+        """Failed identifications are retried on the next request."""
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = RuntimeError("boom")
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai")
+        identify_episode("Series", sample_subtitles, model="gpt-4", provider="openai")
+        
+        assert mock_client.chat.completions.create.call_count == 2
 
     def test_unknown_provider_returns_error(
         self, mock_all_api_keys, sample_subtitles
@@ -177,3 +367,304 @@ class TestProviderRouting:
         
         assert "error" in result
         assert "unknown" in result["error"].lower()
+
+
+class TestStreamingEarlyExit:
+    """Tests for stopping streamed responses once the answer is confident."""
+
+    def _stream(self, pieces):
+        """Builds a mock OpenAI stream yielding the given text pieces."""
+        chunks = []
+        for piece in pieces:
+            chunk = MagicMock()
+            chunk.choices[0].delta.content = piece
+            chunks.append(chunk)
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        return stream
+
+    def test_confident_answer_closes_stream_early(
+        self, mocker, mock_openai_api_key, sample_subtitles
+    ):
+        """The stream is closed before the reasoning arrives."""
+        stream = self._stream([
+            '{"season": 3, "episode": 7, ', '"confidence_score": 98, ', '"reasoning": "long"',
+            ' explanation"}'
+        ])
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = stream
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        result = identify_episode("Series", sample_subtitles, model="gpt-4o", provider="openai", early_exit_threshold=90)
+        
+        assert result == {"season": 3, "episode": 7, "confidence_score": 98}
+        assert mock_client.chat.completions.create.call_args.kwargs["stream"] is True
+        stream.close.assert_called_once()
+
+    def test_early_exit_answer_is_not_cached(
+        self, mocker, mock_openai_api_key, sample_subtitles
+    ):
+        """A truncated early-exit answer is not served to a later request without early exit."""
+        stream = self._stream(['{"season": 3, "episode": 7, ', '"confidence_score": 98, ', '"reasoning": "long"}'])
+        full = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+            content='{"season": 3, "episode": 7, "confidence_score": 98, "reasoning": "long"}'
+        ))])
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.side_effect = [stream, full]
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        identify_episode("Series", sample_subtitles, model="gpt-4o", provider="openai", early_exit_threshold=90)
+        result = identify_episode("Series", sample_subtitles, model="gpt-4o", provider="openai")
+        
+        assert result["reasoning"] == "long"
+        assert mock_client.chat.completions.create.call_count == 2
+
+    def test_low_confidence_reads_whole_response(
+        self, mocker, mock_openai_api_key, sample_subtitles
+    ):
+        """Answers below the threshold are read in full, reasoning included."""
+        stream = self._stream([
+            '{"season": 3, "episode": 7, ', '"confidence_score": 40, ', '"reasoning": "a guess"}'
+        ])
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = stream
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        result = identify_episode("Series", sample_subtitles, model="gpt-4o", provider="openai", early_exit_threshold=90)
+        
+        assert result["reasoning"] == "a guess"
+        assert result["confidence_score"] == 40
+
+
+class TestIdentifyEpisodesConcurrently:
+    """Tests for concurrent identification with identify_episodes."""
+
+    @staticmethod
+    def _mock_async_openai(mocker, create):
+        mock_client = MagicMock()
+        mock_client.chat.completions.create = AsyncMock(side_effect=create)
+        mock_client_class = MagicMock()
+        mock_client_class.return_value.__aenter__.return_value = mock_client
+        mock_client_class.return_value.__aexit__.return_value = False
+        mocker.patch("openai.AsyncOpenAI", mock_client_class)
+        return mock_client
+
+    def test_results_returned_in_job_order(self, mocker, mock_openai_api_key):
+        """Results line up with the jobs they were submitted for."""
+        async def create(model, messages, **kwargs):
+            # Answer later jobs first to exercise reordering
+            episode = int(messages[0]["content"].rsplit("line ", 1)[1].split("\n")[0])
+            await asyncio.sleep(0.01 * (3 - episode))
+            choice = SimpleNamespace(message=SimpleNamespace(content=json.dumps({"season": 1, "episode": episode})))
+            return SimpleNamespace(choices=[choice])
+        self._mock_async_openai(mocker, create)
+        
+        jobs = [("Series", [f"line {i}"]) for i in range(3)]
+        results = asyncio.run(identify_episodes(jobs, model="gpt-4", provider="openai", max_concurrency=2))
+        
+        assert [r["episode"] for r in results] == [0, 1, 2]
+
+    def test_failed_request_becomes_error_result(self, mocker, mock_openai_api_key):
+        """An exception from one request yields an error result without failing the rest."""
+        async def create(model, messages, **kwargs):
+            if "bad" in messages[0]["content"]:
+                raise RuntimeError("boom")
+            choice = SimpleNamespace(message=SimpleNamespace(content='{"season": 2, "episode": 3}'))
+            return SimpleNamespace(choices=[choice])
+        self._mock_async_openai(mocker, create)
+        
+        jobs = [("Series", ["good"]), ("Series", ["bad"])]
+        results = asyncio.run(identify_episodes(jobs, model="gpt-4", provider="openai"))
+        
+        assert results[0]["episode"] == 3
+        assert "boom" in results[1]["error"]
+
+
+class TestIdentifyEpisodesBatched:
+    """Tests for packing several episodes into one request."""
+
+    @staticmethod
+    def _mock_google(mocker, texts):
+        mock_client_instance = MagicMock()
+        mock_client_instance.models.generate_content.side_effect = [SimpleNamespace(text=t) for t in texts]
+        mock_client_class = MagicMock(return_value=mock_client_instance)
+        mocker.patch("google.genai.Client", mock_client_class)
+        return mock_client_instance
+
+    def test_batch_uses_one_request_and_reported_indices(self, mocker, mock_google_api_key):
+        """Several episodes share one request and are matched back by index."""
+        client = self._mock_google(mocker, [json.dumps([
+            {"index": 1, "season": 1, "episode": 2},
+            {"index": 0, "season": 1, "episode": 1},
+        ])])
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_batched(jobs, provider="google", rows_per_call=5)
+        
+        assert client.models.generate_content.call_count == 1
+        assert [r["episode"] for r in results] == [1, 2]
+        assert "index" not in results[0]
+        # The single-episode JSON schema doesn't fit an array of answers
+        assert client.models.generate_content.call_args.kwargs.get("config") is None
+
+    def test_openai_batch_is_sent_without_json_mode(self, mocker, mock_openai_api_key):
+        """Batched OpenAI requests go through the provider table as plain completions."""
+        client = MagicMock()
+        client.chat.completions.create.return_value = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(
+            content='[{"index": 0, "season": 2, "episode": 3}, {"index": 1, "season": 2, "episode": 4}]'
+        ))])
+        mocker.patch("tvidentify.episode_identifier._get_openai_client", return_value=client)
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_batched(jobs, model="gpt-4o", provider="openai", rows_per_call=5)
+        
+        assert [r["episode"] for r in results] == [3, 4]
+        client.chat.completions.create.assert_called_once()
+        assert "response_format" not in client.chat.completions.create.call_args.kwargs
+
+    def test_missing_batch_item_falls_back_to_single_request(self, mocker, mock_google_api_key):
+        """Only the item a batched response leaves out is retried on its own."""
+        client = self._mock_google(mocker, [
+            '[{"index": 0, "season": 1, "episode": 1}]',
+            '{"season": 1, "episode": 2}',
+        ])
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_batched(jobs, provider="google", rows_per_call=5)
+        
+        assert client.models.generate_content.call_count == 2
+        assert [r["episode"] for r in results] == [1, 2]
+
+    @pytest.mark.parametrize("bad_item", [
+        {"index": 5, "season": 1, "episode": 9},
+        {"index": "1", "season": 1, "episode": 9},
+        {"index": 1, "season": "one", "episode": 9},
+        {"index": 1, "season": 1, "episode": 9.5},
+        {"season": 1, "episode": 9},
+    ])
+    def test_invalid_batch_item_falls_back_to_single_request(self, mocker, mock_google_api_key, bad_item):
+        """Items with an out-of-range index or non-integer fields are not used as results."""
+        client = self._mock_google(mocker, [
+            json.dumps([{"index": 0, "season": 1, "episode": 1}, bad_item]),
+            '{"season": 1, "episode": 2}',
+        ])
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_batched(jobs, provider="google", rows_per_call=5)
+        
+        assert client.models.generate_content.call_count == 2
+        assert results == [{"season": 1, "episode": 1}, {"season": 1, "episode": 2}]
+
+    def test_batched_results_are_cached_for_later_runs(self, mocker, mock_google_api_key):
+        """Batched answers are saved to, and served from, the single-request result cache."""
+        client = self._mock_google(mocker, [json.dumps([
+            {"index": 0, "season": 1, "episode": 1},
+            {"index": 1, "season": 1, "episode": 2},
+        ])])
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        
+        first = identify_episodes_batched(jobs, provider="google", rows_per_call=5)
+        second = identify_episodes_batched(jobs, provider="google", rows_per_call=5)
+        single = identify_episode("Series", ["second"], provider="google")
+        
+        assert client.models.generate_content.call_count == 1
+        assert first == second
+        assert single == first[1]
+
+    def test_oversized_batch_prompt_is_trimmed_to_context(self, mocker, mock_google_api_key):
+        """Each item's subtitles are trimmed until the batched prompt fits the context window."""
+        client = self._mock_google(mocker, [json.dumps([
+            {"index": 0, "season": 1, "episode": 1},
+            {"index": 1, "season": 1, "episode": 2},
+        ])])
+        mocker.patch.dict("tvidentify.episode_identifier.MODEL_CONTEXT_TOKENS", {"tiny-model": 2500})
+        mocker.patch("tvidentify.episode_identifier._count_tokens", side_effect=lambda prompt, model: len(prompt) // 4)
+        subtitles = [f"Subtitle line number {n}" for n in range(400)]
+        
+        jobs = [("Series", subtitles), ("Series", subtitles)]
+        identify_episodes_batched(jobs, model="tiny-model", provider="google", rows_per_call=5, dedupe=False)
+        
+        prompt = client.models.generate_content.call_args.kwargs["contents"]
+        assert len(prompt) // 4 <= 2500 - 1024
+        assert "Subtitle line number 0\n" in prompt
+        assert "Subtitle line number 399" not in prompt
+
+    def test_fallback_requests_respect_use_cache(self, mocker, mock_google_api_key, isolated_cache_dir):
+        """With use_cache=False, items identified one at a time neither read nor write the disk cache."""
+        load = mocker.patch("tvidentify.episode_identifier._load_cached_result")
+        client = self._mock_google(mocker, [
+            'not json',
+            '{"season": 1, "episode": 1}',
+            '{"season": 1, "episode": 2}',
+        ])
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_batched(jobs, provider="google", rows_per_call=5, use_cache=False)
+        
+        assert client.models.generate_content.call_count == 3
+        assert [r["episode"] for r in results] == [1, 2]
+        load.assert_not_called()
+        assert not isolated_cache_dir.exists()
+
+
+class TestIdentifyEpisodesOffline:
+    """Tests for identification through the provider Batch APIs."""
+
+    def test_openai_batch_results_matched_by_custom_id(self, mocker, mock_openai_api_key):
+        """OpenAI batch output lines are mapped back to jobs by custom_id."""
+        mocker.patch("tvidentify.episode_identifier.time.sleep")
+        mock_client = MagicMock()
+        mock_client.batches.create.return_value = MagicMock(id="batch_1", status="in_progress")
+        mock_client.batches.retrieve.return_value = MagicMock(id="batch_1", status="completed", output_file_id="file_out")
+        output_lines = [
+            {"custom_id": str(i), "response": {"status_code": 200, "body": {
+                "choices": [{"message": {"content": json.dumps({"season": 1, "episode": i + 1})}}]
+            }}, "error": None}
+            for i in (1, 0)
+        ]
+        mock_client.files.content.return_value.text = "\n".join(json.dumps(line) for line in output_lines)
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_offline(jobs, model="gpt-4", provider="openai", poll_interval=0)
+        
+        assert [r["episode"] for r in results] == [1, 2]
+        assert mock_client.batches.create.call_args.kwargs["endpoint"] == "/v1/chat/completions"
+
+    def test_failed_batch_reports_error_for_every_job(self, mocker, mock_openai_api_key):
+        """A batch that ends without completing yields an error result per job."""
+        mocker.patch("tvidentify.episode_identifier.time.sleep")
+        mock_client = MagicMock()
+        mock_client.batches.create.return_value = MagicMock(id="batch_1", status="failed", output_file_id=None)
+        mocker.patch("openai.OpenAI", return_value=mock_client)
+        
+        jobs = [("Series", ["first"]), ("Series", ["second"])]
+        results = identify_episodes_offline(jobs, model="gpt-4", provider="openai", poll_interval=0)
+        
+        assert all("failed" in r["error"] for r in results)
+
+
+class TestRateLimiter:
+    """Tests for the per-minute request/token budget."""
+
+    def test_requests_beyond_rpm_must_wait(self):
+        """Calls past max_rpm in one minute are told to wait."""
+        limiter = RateLimiter(max_rpm=2)
+        
+        assert limiter._reserve(0) == 0
+        assert limiter._reserve(0) == 0
+        assert limiter._reserve(0) > 50
+
+    def test_tokens_beyond_tpm_must_wait(self):
+        """A call that would exceed max_tpm waits; a smaller one still fits."""
+        limiter = RateLimiter(max_tpm=100)
+        
+        assert limiter._reserve(80) == 0
+        assert limiter._reserve(30) > 50
+        assert limiter._reserve(10) == 0
+
+    def test_oversized_call_allowed_when_window_empty(self):
+        """A single call larger than max_tpm is not blocked forever."""
+        limiter = RateLimiter(max_tpm=100)
+        
+        assert limiter._reserve(500) == 0
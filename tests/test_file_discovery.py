@@ -9,13 +9,23 @@ import pytest
 
 from tvidentify.batch_identifier import find_episode_files, is_already_named
 
+# is_already_named cases: (id, filename, series name, rename format or None for the default, expected)
+_NAMED_CASES = (
+    ("exact-match", "Breaking Bad S01E05.mkv", "Breaking Bad", None, True),
+    ("case-insensitive", "breaking bad s01e05.mkv", "Breaking Bad", None, True),
+    ("not-matching", "random_episode_file.mkv", "Breaking Bad", None, False),
+    ("custom-format", "Breaking Bad 1x05.mkv", "Breaking Bad", "{series} {season}x{episode:02d}", True),
+    ("partial-match", "Breaking Bad S01.mkv", "Breaking Bad", None, False),
+    ("wrong-series", "Breaking Bad S01E05.mkv", "Better Call Saul", None, False),
+)
+
 
 class TestFindEpisodeFiles:
     """Tests for finding episode files in directories."""
 
-    def test_finds_all_mkv_files_similar_size(self, temp_video_dir):
+    def test_finds_all_mkv_files_similar_size(self, discovered_files):
         """All similar-sized MKV files are found."""
-        files = find_episode_files(temp_video_dir)
+        files = discovered_files
         
         # Should find the 3 episode files (all ~1GB), not the bonus content
         assert len(files) == 3
@@ -26,9 +36,9 @@ class TestFindEpisodeFiles:
         assert "episode_02.mkv" in basenames
         assert "episode_03.mkv" in basenames
 
-    def test_excludes_bonus_content_by_size(self, temp_video_dir):
+    def test_excludes_bonus_content_by_size(self, discovered_files):
         """Files significantly smaller than the largest are excluded."""
-        files = find_episode_files(temp_video_dir)
+        files = discovered_files
         
         basenames = [os.path.basename(f) for f in files]
         assert "bonus_feature.mkv" not in basenames
@@ -39,22 +49,19 @@ class TestFindEpisodeFiles:
         files = find_episode_files(temp_video_dir_empty)
         assert files == []
 
-    def test_respects_extension_filter(self, temp_video_dir):
+    def test_respects_extension_filter(self, temp_video_dir, fake_large_file):
         """Extension filter limits results to specified extension."""
         # Create an mp4 file
-        mp4_path = os.path.join(temp_video_dir, "video.mp4")
-        with open(mp4_path, 'wb') as f:
-            f.seek(1_000_000_000 - 1)
-            f.write(b'\0')
+        fake_large_file(os.path.join(temp_video_dir, "video.mp4"), 1_000_000_000)
         
         # Should only find the mp4 file
         mp4_files = find_episode_files(temp_video_dir, extension=".mp4")
         assert len(mp4_files) == 1
         assert os.path.basename(mp4_files[0]) == "video.mp4"
 
-    def test_returns_sorted_output(self, temp_video_dir):
+    def test_returns_sorted_output(self, discovered_files):
         """Files are returned in sorted order."""
-        files = find_episode_files(temp_video_dir)
+        files = discovered_files
         basenames = [os.path.basename(f) for f in files]
         
         assert basenames == sorted(basenames)
@@ -63,48 +70,13 @@ class TestFindEpisodeFiles:
 class TestIsAlreadyNamed:
     """Tests for checking if files match the expected naming format."""
 
-    def test_exact_match(self):
-        """Exact format match returns True."""
-        assert is_already_named(
-            "Breaking Bad S01E05.mkv",
-            "Breaking Bad"
-        ) is True
-
-    def test_case_insensitive(self):
-        """Match is case-insensitive."""
-        assert is_already_named(
-            "breaking bad s01e05.mkv",
-            "Breaking Bad"
-        ) is True
-
-    def test_not_matching(self):
-        """Non-matching filename returns False."""
-        assert is_already_named(
-            "random_episode_file.mkv",
-            "Breaking Bad"
-        ) is False
-
-    def test_custom_format(self):
-        """Custom format string works correctly."""
-        assert is_already_named(
-            "Breaking Bad 1x05.mkv",
-            "Breaking Bad",
-            rename_format="{series} {season}x{episode:02d}"
-        ) is True
-
-    def test_partial_match_returns_false(self):
-        """Partial match (missing episode) returns False."""
-        assert is_already_named(
-            "Breaking Bad S01.mkv",
-            "Breaking Bad"
-        ) is False
-
-    def test_wrong_series_name(self):
-        """Wrong series name returns False."""
-        assert is_already_named(
-            "Breaking Bad S01E05.mkv",
-            "Better Call Saul"
-        ) is False
+    @pytest.mark.parametrize("filename, series_name, rename_format, expected",
+                             [case[1:] for case in _NAMED_CASES],
+                             ids=[case[0] for case in _NAMED_CASES])
+    def test_is_already_named(self, filename, series_name, rename_format, expected):
+        """Filenames match the (default or custom) format case-insensitively, and only in full."""
+        kwargs = {"rename_format": rename_format} if rename_format else {}
+        assert is_already_named(filename, series_name, **kwargs) is expected
 
 
 class TestSkipsAlreadyNamedFiles:
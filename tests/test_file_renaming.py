@@ -4,7 +4,6 @@ Tests for file renaming operations.
 
 import json
 import os
-import tempfile
 
 import pytest
 
@@ -14,32 +13,46 @@ from tvidentify.file_renamer import rename_file, rename_files_from_batch_results
 class TestRenameFile:
     """Tests for the rename_file function."""
 
-    def test_rename_applies_format_correctly(self):
+    def test_rename_applies_format_correctly(self, make_file, tmp_path):
         """Rename applies the format string correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create a test file
-            original = os.path.join(tmpdir, "original.mkv")
-            with open(original, 'w') as f:
-                f.write("test")
-            
-            result = rename_file(original, "Breaking Bad", 1, 5)
-            
-            assert result["success"] is True
-            assert result["new_path"].endswith("Breaking Bad S01E05.mkv")
-            assert os.path.exists(result["new_path"])
-            assert not os.path.exists(original)
+        # Create a test file
+        original = make_file("original.mkv")
+        
+        result = rename_file(original, "Breaking Bad", 1, 5)
+        
+        assert result["success"] is True
+        assert result["new_path"] == str(tmp_path / "Breaking Bad S01E05.mkv")
+        # One directory listing shows both that the new name exists and the old one is gone
+        assert set(os.listdir(tmp_path)) == {"Breaking Bad S01E05.mkv"}
+
+    def test_rename_accepts_path_objects(self, make_file, tmp_path):
+        """A pathlib.Path source is renamed like its string form."""
+        from pathlib import Path
+        original = Path(make_file("original.mkv"))
+        
+        result = rename_file(original, "Breaking Bad", 1, 5)
+        
+        assert result["success"] is True
+        assert result["new_path"] == str(tmp_path / "Breaking Bad S01E05.mkv")
 
-    def test_rename_preserves_original_extension(self):
+    def test_rename_preserves_original_extension(self, make_file):
         """Original file extension is preserved."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            original = os.path.join(tmpdir, "video.mp4")
-            with open(original, 'w') as f:
-                f.write("test")
+        original = make_file("video.mp4")
+        
+        result = rename_file(original, "The Wire", 2, 3)
+        
+        assert result["success"] is True
+        assert result["new_path"].endswith(".mp4")
+
+    def test_rename_without_extension_adds_none(self, make_file, tmp_path):
+        """Files without an extension (or dotfiles) are renamed without one."""
+        for name in ("video", ".video"):
+            original = make_file(name)
             
-            result = rename_file(original, "The Wire", 2, 3)
+            result = rename_file(original, "The Wire", 2, 3, "{series} {episode}" + name)
             
             assert result["success"] is True
-            assert result["new_path"].endswith(".mp4")
+            assert result["new_path"] == str(tmp_path / ("The Wire 3" + name))
 
     def test_rename_fails_gracefully_for_missing_file(self):
         """Missing file returns error without crashing."""
@@ -49,87 +62,110 @@ class TestRenameFile:
         assert "error" in result
         assert "not found" in result["error"].lower()
 
-    def test_rename_fails_when_target_exists(self):
+    def test_rename_fails_when_target_exists(self, make_file):
         """When target file already exists, returns error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            original = os.path.join(tmpdir, "original.mkv")
-            target = os.path.join(tmpdir, "Breaking Bad S01E05.mkv")
-            
-            with open(original, 'w') as f:
-                f.write("original")
-            with open(target, 'w') as f:
-                f.write("existing")
-            
-            result = rename_file(original, "Breaking Bad", 1, 5)
-            
-            assert result["success"] is False
-            assert "already exists" in result["error"]
-            # Original file should be untouched
-            assert os.path.exists(original)
+        original = make_file("original.mkv", "original")
+        target = make_file("Breaking Bad S01E05.mkv", "existing")
+        
+        result = rename_file(original, "Breaking Bad", 1, 5)
+        
+        assert result["success"] is False
+        assert "already exists" in result["error"]
+        # Neither file should be touched
+        assert os.path.exists(original)
+        with open(target) as f:
+            assert f.read() == "existing"
+
+    def test_rename_to_same_name_succeeds(self, make_file):
+        """A file already at its target name is not treated as a conflict."""
+        original = make_file("Breaking Bad S01E05.mkv")
+        
+        result = rename_file(original, "Breaking Bad", 1, 5)
+        
+        assert result["success"] is True
+        assert os.path.exists(original)
+
+    def test_rename_over_link_to_same_file_succeeds(self, make_file, tmp_path):
+        """A target that is a hard link to the source is not a conflict, and the source name goes away."""
+        original = make_file("original.mkv")
+        target = str(tmp_path / "Breaking Bad S01E05.mkv")
+        os.link(original, target)
+        
+        result = rename_file(original, "Breaking Bad", 1, 5)
+        
+        assert result["success"] is True
+        assert os.path.exists(target)
+        assert not os.path.exists(original)
+
+    def test_rename_over_case_variant_link_removes_source(self, make_file, tmp_path):
+        """A hard link whose name differs from the source only in case is still a separate name."""
+        original = make_file("breaking bad s01e05.mkv")
+        target = str(tmp_path / "Breaking Bad S01E05.mkv")
+        if os.path.exists(target):
+            pytest.skip("case-insensitive filesystem")
+        os.link(original, target)
+        
+        result = rename_file(original, "Breaking Bad", 1, 5)
+        
+        assert result["success"] is True
+        assert sorted(os.listdir(tmp_path)) == ["Breaking Bad S01E05.mkv"]
 
-    def test_rename_fails_for_null_season(self):
+    def test_rename_fails_for_null_season(self, make_file):
         """Null season returns error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            original = os.path.join(tmpdir, "video.mkv")
-            with open(original, 'w') as f:
-                f.write("test")
-            
-            result = rename_file(original, "Series", None, 5)
-            
-            assert result["success"] is False
-            assert "error" in result
+        original = make_file("video.mkv")
+        
+        result = rename_file(original, "Series", None, 5)
+        
+        assert result["success"] is False
+        assert "error" in result
 
-    def test_rename_fails_for_null_episode(self):
+    def test_rename_fails_for_null_episode(self, make_file):
         """Null episode returns error."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            original = os.path.join(tmpdir, "video.mkv")
-            with open(original, 'w') as f:
-                f.write("test")
-            
-            result = rename_file(original, "Series", 1, None)
-            
-            assert result["success"] is False
-            assert "error" in result
+        original = make_file("video.mkv")
+        
+        result = rename_file(original, "Series", 1, None)
+        
+        assert result["success"] is False
+        assert "error" in result
 
-    def test_custom_format(self):
+    def test_custom_format(self, make_file):
         """Custom format string is applied correctly."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            original = os.path.join(tmpdir, "video.mkv")
-            with open(original, 'w') as f:
-                f.write("test")
-            
-            result = rename_file(
-                original, "The Wire", 2, 5,
-                rename_format="{series} - {season}x{episode:02d}"
-            )
-            
-            assert result["success"] is True
-            assert "The Wire - 2x05.mkv" in result["new_path"]
+        original = make_file("video.mkv")
+        
+        result = rename_file(
+            original, "The Wire", 2, 5,
+            rename_format="{series} - {season}x{episode:02d}"
+        )
+        
+        assert result["success"] is True
+        assert "The Wire - 2x05.mkv" in result["new_path"]
 
 
 class TestRenameFilesFromBatchResults:
     """Tests for batch rename operations."""
 
-    def test_rename_batch_skips_nulls(self):
+    def test_rename_batch_skips_nulls(self, make_file, mocker):
         """Batch rename skips entries with null season/episode."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create test files
-            file1 = os.path.join(tmpdir, "ep1.mkv")
-            file2 = os.path.join(tmpdir, "ep2.mkv")
-            for f in [file1, file2]:
-                with open(f, 'w') as fh:
-                    fh.write("test")
-            
-            batch_results = [
-                {"video_file_path": file1, "season": 1, "episode": 1, "input_file_name": "ep1.mkv"},
-                {"video_file_path": file2, "season": None, "episode": None, "input_file_name": "ep2.mkv"},
-            ]
-            
-            results = rename_files_from_batch_results(batch_results, "Series")
-            
-            # First should succeed, second should be skipped
-            assert results[0]["success"] is True
-            assert results[1]["skipped"] is True
+        # Create test files
+        file1 = make_file("ep1.mkv")
+        file2 = make_file("ep2.mkv")
+        
+        batch_results = [
+            {"video_file_path": file1, "season": 1, "episode": 1, "input_file_name": "ep1.mkv"},
+            {"video_file_path": file2, "season": None, "episode": None, "input_file_name": "ep2.mkv"},
+        ]
+        
+        scandir_spy = mocker.spy(os, "scandir")
+        replace_spy = mocker.spy(os, "replace")
+        
+        results = rename_files_from_batch_results(batch_results, "Series")
+        
+        # First should succeed, second should be skipped
+        assert results[0]["success"] is True
+        assert results[1]["skipped"] is True
+        # Only the resolved entry is renamed, without walking the directory
+        assert replace_spy.call_count == 1
+        scandir_spy.assert_not_called()
 
     def test_rename_batch_skips_duplicates(self):
         """Batch rename skips entries marked as duplicates."""
@@ -146,24 +182,21 @@ class TestRenameFilesFromBatchResults:
         assert results[0]["skipped"] is True
         assert "duplicate" in results[0]["reason"].lower()
 
-    def test_dry_run_returns_preview_without_changes(self):
+    def test_dry_run_returns_preview_without_changes(self, make_file):
         """Dry run mode returns preview without modifying files."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            original = os.path.join(tmpdir, "episode.mkv")
-            with open(original, 'w') as f:
-                f.write("test")
-            
-            batch_results = [
-                {"video_file_path": original, "season": 1, "episode": 5, "input_file_name": "episode.mkv"}
-            ]
-            
-            results = rename_files_from_batch_results(
-                batch_results, "Breaking Bad", dry_run=True
-            )
-            
-            # Result should indicate dry run
-            assert results[0]["dry_run"] is True
-            assert "Breaking Bad S01E05.mkv" in results[0]["would_rename_to"]
-            
-            # Original file should still exist
-            assert os.path.exists(original)
+        original = make_file("episode.mkv")
+        
+        batch_results = [
+            {"video_file_path": original, "season": 1, "episode": 5, "input_file_name": "episode.mkv"}
+        ]
+        
+        results = rename_files_from_batch_results(
+            batch_results, "Breaking Bad", dry_run=True
+        )
+        
+        # Result should indicate dry run
+        assert results[0]["dry_run"] is True
+        assert "Breaking Bad S01E05.mkv" in results[0]["would_rename_to"]
+        
+        # Original file should still exist
+        assert os.path.exists(original)
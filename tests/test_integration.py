@@ -16,32 +16,41 @@ import pytest
 # Mark all tests in this module as integration tests
 pytestmark = pytest.mark.integration
 
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
 
-@pytest.fixture
+
+def requires_fixture(name):
+    """Skips the marked tests at collection time when a generated fixture file is missing."""
+    return pytest.mark.skipif(
+        not (FIXTURES_DIR / name).exists(),
+        reason="Test fixture not found. Run: python tests/generate_fixtures.py"
+    )
+
+
+@pytest.fixture(scope="session")
 def fixtures_dir():
     """Path to test fixtures directory."""
-    return Path(__file__).parent / "fixtures"
+    return FIXTURES_DIR
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def subtitle_test_image(fixtures_dir):
-    """Load the subtitle-style test image as an OpenCV array."""
+    """Load the subtitle-style test image as a read-only OpenCV array, decoded once per session."""
     img_path = fixtures_dir / "subtitle_test.png"
-    if not img_path.exists():
-        pytest.skip("Test fixture not found. Run: python tests/generate_fixtures.py")
-    return cv2.imread(str(img_path), cv2.IMREAD_UNCHANGED)
-
+    img = cv2.imread(str(img_path), cv2.IMREAD_UNCHANGED)
+    # Shared by every test that asks for it; tests that need to modify it must copy it
+    img.setflags(write=False)
+    return img
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sup_test_file(fixtures_dir):
     """Path to the test SUP file."""
     sup_path = fixtures_dir / "test_subtitle.sup"
-    if not sup_path.exists():
-        pytest.skip("Test fixture not found. Run: python tests/generate_fixtures.py")
     return str(sup_path)
 
 
+@requires_fixture("subtitle_test.png")
 class TestTesseractOCR:
     """Tests that require tesseract to be installed."""
 
@@ -57,6 +66,7 @@ class TestTesseractOCR:
         assert "knock" in result.lower() or "one" in result.lower() or "who" in result.lower()
 
 
+@requires_fixture("test_subtitle.sup")
 class TestSubtitleExtraction:
     """Tests for full subtitle extraction from SUP files."""
 
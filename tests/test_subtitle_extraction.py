@@ -2,19 +2,31 @@
 Tests for subtitle extraction pipeline (with mocked ffmpeg/OCR).
 """
 
-import json
+import io
 import os
-import tempfile
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch, call
 
 import pytest
 
 from tvidentify.subtitle_extractor import (
     extract_subtitles,
+    extract_sup_file,
+    extract_text_from_sup,
+    clean_subtitle_text,
+    ocr_image,
+    ocr_images,
+    preprocess_for_ocr,
     find_subtitle_stream,
     get_subtitle_tracks,
 )
-from tvidentify.batch_identifier import get_subtitle_fingerprint
+from tvidentify import batch_identifier
+from tvidentify.batch_identifier import (
+    _prune_fingerprint_store,
+    get_subtitle_fingerprint,
+    load_fingerprint_store,
+    save_fingerprint_store,
+)
 
 
 class TestFindSubtitleStream:
@@ -24,10 +36,7 @@ class TestFindSubtitleStream:
         self, mocker, mock_ffprobe_english_subtitle
     ):
         """When English subtitle exists, it is selected."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_ffprobe_english_subtitle)
-        mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
         
         stream_index = find_subtitle_stream("/fake/video.mkv")
         
@@ -37,10 +46,7 @@ class TestFindSubtitleStream:
         self, mocker, mock_ffprobe_english_subtitle
     ):
         """When a subtitle track is specified, it is used."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_ffprobe_english_subtitle)
-        mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
 
         stream_index = find_subtitle_stream(
             "/fake/video.mkv", subtitle_track_index=3
@@ -52,10 +58,7 @@ class TestFindSubtitleStream:
         self, mocker, mock_ffprobe_no_english_subtitle
     ):
         """When no English subtitle exists, falls back to first available."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_ffprobe_no_english_subtitle)
-        mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_no_english_subtitle)
         
         stream_index = find_subtitle_stream("/fake/video.mkv")
         
@@ -66,10 +69,7 @@ class TestFindSubtitleStream:
         self, mocker, mock_ffprobe_no_subtitles
     ):
         """When no subtitles exist, returns None."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_ffprobe_no_subtitles)
-        mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_no_subtitles)
         
         stream_index = find_subtitle_stream("/fake/video.mkv")
         
@@ -79,10 +79,7 @@ class TestFindSubtitleStream:
         self, mocker, mock_ffprobe_english_subtitle
     ):
         """When a nonexistent track is specified, returns None."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_ffprobe_english_subtitle)
-        mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
 
         stream_index = find_subtitle_stream(
             "/fake/video.mkv", subtitle_track_index=99
@@ -90,6 +87,21 @@ class TestFindSubtitleStream:
 
         assert stream_index is None
 
+    def test_ffprobe_result_is_cached_per_file_version(
+        self, mocker, mock_ffprobe_english_subtitle, tmp_path
+    ):
+        """An unchanged file is probed once; modifying it probes again."""
+        mock_run = mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
+        video = tmp_path / "video.mkv"
+        video.write_bytes(b"v1")
+        
+        assert get_subtitle_tracks(str(video)) == get_subtitle_tracks(str(video))
+        assert mock_run.call_count == 1
+        
+        video.write_bytes(b"v2-longer")
+        get_subtitle_tracks(str(video))
+        assert mock_run.call_count == 2
+
 
 class TestExtractSubtitles:
     """Tests for the main extract_subtitles function."""
@@ -98,13 +110,10 @@ class TestExtractSubtitles:
         self, mocker, mock_ffprobe_no_subtitles
     ):
         """Video with no subtitles returns empty list, no crash."""
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = json.dumps(mock_ffprobe_no_subtitles)
-        mocker.patch("subprocess.run", return_value=mock_result)
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_no_subtitles)
         
-        with tempfile.NamedTemporaryFile(suffix=".mkv") as f:
-            subtitles = extract_subtitles(f.name)
+        mocker.patch("os.path.exists", return_value=True)
+        subtitles = extract_subtitles("/fake/video.mkv")
         
         assert subtitles == []
 
@@ -115,44 +124,435 @@ class TestExtractSubtitles:
 
     def test_extraction_respects_scan_duration(self, mocker, mock_ffprobe_english_subtitle):
         """scan_duration_minutes is passed to ffmpeg."""
-        mock_ffprobe_result = MagicMock()
-        mock_ffprobe_result.returncode = 0
-        mock_ffprobe_result.stdout = json.dumps(mock_ffprobe_english_subtitle)
+        # Only ffprobe goes through subprocess.run; ffmpeg is streamed through Popen
+        mock_run = mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
         
-        mock_ffmpeg_result = MagicMock()
-        mock_ffmpeg_result.returncode = 0
+        # ffmpeg produces no SUP data
+        mock_ffmpeg = mocker.patch("subprocess.Popen")
+        mock_ffmpeg.return_value.stdout = io.BytesIO(b"")
+        mock_ffmpeg.return_value.communicate.return_value = (b"", b"")
+        mock_ffmpeg.return_value.returncode = 0
         
-        call_args = []
-        def capture_run(args, **kwargs):
-            call_args.append(args)
-            if "ffprobe" in args[0]:
-                return mock_ffprobe_result
-            return mock_ffmpeg_result
+        mocker.patch("os.path.exists", return_value=True)
+        extract_subtitles("/fake/video.mkv", scan_duration_minutes=10)
         
-        mocker.patch("subprocess.run", side_effect=capture_run)
+        # Verify ffprobe was called
+        assert mock_run.call_args.args[0][0] == 'ffprobe'
+        ffmpeg_cmd = mock_ffmpeg.call_args.args[0]
+        assert ffmpeg_cmd[ffmpeg_cmd.index('-t') + 1] == '600'
+
+    def test_ocr_reads_ffmpeg_output_as_it_streams(self, mocker, mock_ffprobe_english_subtitle):
+        """SUP data is OCRed straight from ffmpeg's stdout, and ffmpeg is stopped once enough is read."""
+        sup_path = os.path.join(os.path.dirname(__file__), "fixtures", "test_subtitle.sup")
+        if not os.path.exists(sup_path):
+            pytest.skip("Test fixture not found. Run: python tests/generate_fixtures.py")
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
+        mocker.patch("tvidentify.subtitle_extractor.ocr_images", side_effect=lambda batch: ["Hello"] * len(batch))
         
-        # Mock the SUP file extraction to create an empty file
-        mocker.patch("tvidentify.subtitle_extractor.extract_sup_file", return_value=False)
+        with open(sup_path, 'rb') as sup_data:
+            mock_ffmpeg = mocker.patch("subprocess.Popen")
+            mock_ffmpeg.return_value.stdout = sup_data
+            mock_ffmpeg.return_value.communicate.return_value = (b"", b"")
+            mock_ffmpeg.return_value.returncode = -9
+            
+            mocker.patch("os.path.exists", return_value=True)
+            subtitles = extract_subtitles("/fake/video.mkv", max_frames=1)
         
-        with tempfile.NamedTemporaryFile(suffix=".mkv") as f:
-            extract_subtitles(f.name, scan_duration_minutes=10)
+        assert subtitles == ["Hello"]
+        assert mock_ffmpeg.call_args.args[0][-1] == 'pipe:1'
+        mock_ffmpeg.return_value.kill.assert_called_once()
+
+    def test_ffmpeg_failure_returns_empty(self, mocker, mock_ffprobe_english_subtitle):
+        """If ffmpeg exits with an error, no subtitles are returned."""
+        mocker.patch("subprocess.run", return_value=mock_ffprobe_english_subtitle)
         
-        # Verify ffprobe was called
-        assert any("ffprobe" in str(args) for args in call_args)
+        mock_ffmpeg = mocker.patch("subprocess.Popen")
+        mock_ffmpeg.return_value.stdout = io.BytesIO(b"")
+        mock_ffmpeg.return_value.communicate.return_value = (b"", b"Invalid data found")
+        mock_ffmpeg.return_value.returncode = 1
+        mock_ffmpeg.return_value.args = ["ffmpeg"]
+        
+        mocker.patch("os.path.exists", return_value=True)
+        assert extract_subtitles("/fake/video.mkv") == []
+
+
+class TestExtractSupFile:
+    """Tests for saving a subtitle stream to a SUP file."""
+
+    def test_sup_data_from_ffmpeg_is_written_to_file(self, mocker, tmp_path):
+        """The SUP data ffmpeg writes to its stdout ends up in the output file."""
+        proc = MagicMock(stdout=io.BytesIO(b"PG sup data"), returncode=0, args=["ffmpeg"])
+        proc.communicate.return_value = (None, b"")
+        mock_popen = mocker.patch("subprocess.Popen", return_value=proc)
+        output = tmp_path / "track.sup"
+        
+        assert extract_sup_file("/video.mkv", str(output), 3) is True
+        assert output.read_bytes() == b"PG sup data"
+        assert "0:3" in mock_popen.call_args.args[0]
+
+    def test_ffmpeg_failure_returns_false(self, mocker, tmp_path):
+        """A failed ffmpeg run is reported as False."""
+        proc = MagicMock(stdout=io.BytesIO(b""), returncode=1, args=["ffmpeg"])
+        proc.communicate.return_value = (None, b"boom")
+        mocker.patch("subprocess.Popen", return_value=proc)
+        
+        assert extract_sup_file("/video.mkv", str(tmp_path / "track.sup"), 3) is False
+
+
+class TestExtractSubtitlesBatch:
+    """Tests for extracting subtitles from several files at once."""
+
+    def test_results_keep_file_order(self, mocker):
+        """Each file's subtitles come back in input order, with the options passed through."""
+        import time
+        from tvidentify.subtitle_extractor import extract_subtitles_batch
+        def fake_extract(video_file, **kwargs):
+            time.sleep(0.01 if video_file == "a.mkv" else 0)  # first file finishes last
+            return [f"{video_file} {kwargs['max_frames']}"]
+        mocker.patch("tvidentify.subtitle_extractor.extract_subtitles", side_effect=fake_extract)
+        
+        results = extract_subtitles_batch(["a.mkv", "b.mkv", "c.mkv"], max_workers=3, max_frames=5)
+        
+        assert results == [["a.mkv 5"], ["b.mkv 5"], ["c.mkv 5"]]
+
+    def test_ocr_threads_are_capped_at_cpu_count(self, mocker):
+        """Several files share at most one OCR thread per CPU (or OCR_WORKERS, if more)."""
+        from tvidentify.subtitle_extractor import batch_ocr_workers
+        mocker.patch("tvidentify.subtitle_extractor.OCR_WORKERS", 4)
+        mocker.patch("os.cpu_count", return_value=8)
+        
+        assert batch_ocr_workers(1) == 4
+        assert batch_ocr_workers(2) == 8
+        assert batch_ocr_workers(16) == 8
+
+
+class TestExtractTextFromSup:
+    """Tests for OCR of the images in a SUP file."""
+
+    def _mock_images(self, mocker, count):
+        """Makes the SUP file yield `count` images whose OCR text is 'Line <n>' (empty for n=1)."""
+        import time
+        mocker.patch("tvidentify.subtitle_extractor.PGSReader")
+        mocker.patch("tvidentify.subtitle_extractor._iter_subtitle_bitmaps", return_value=iter((n, 1) for n in range(count)))
+        
+        ocred = []
+        def fake_ocr(batch):
+            time.sleep(0.002 * (count - batch[0]))  # later batches finish first
+            ocred.extend(batch)
+            return ["" if n == 1 else f"Line {n}" for n in batch]
+        mocker.patch("tvidentify.subtitle_extractor.ocr_images", side_effect=fake_ocr)
+        return ocred
+
+    def test_parallel_ocr_keeps_display_order(self, mocker):
+        """Results come back in display order, skipping empty OCR results."""
+        self._mock_images(mocker, 6)
+        mocker.patch("tvidentify.subtitle_extractor.OCR_BATCH_SIZE", 2)
+        
+        subtitles = extract_text_from_sup("test.sup", workers=3)
+        
+        assert subtitles == ["Line 0", "Line 2", "Line 3", "Line 4", "Line 5"]
+
+    def test_failed_batch_is_retried_one_image_at_a_time(self, mocker):
+        """When a batch's OCR fails, only the image that fails on its own is lost."""
+        mocker.patch("tvidentify.subtitle_extractor.PGSReader")
+        mocker.patch("tvidentify.subtitle_extractor._iter_subtitle_bitmaps", return_value=iter((n, 1) for n in range(4)))
+        def fake_ocr(batch):
+            if 2 in batch:
+                raise RuntimeError("tesseract crashed")
+            return [f"Line {n}" for n in batch]
+        mocker.patch("tvidentify.subtitle_extractor.ocr_images", side_effect=fake_ocr)
+        mocker.patch("tvidentify.subtitle_extractor.OCR_BATCH_SIZE", 4)
+        
+        subtitles = extract_text_from_sup("test.sup", workers=1)
+        
+        assert subtitles == ["Line 0", "Line 1", "Line 3"]
+
+    def test_max_subtitles_stops_ocr_early(self, mocker):
+        """No more than a small window of images past the limit is OCRed."""
+        ocred = self._mock_images(mocker, 50)
+        
+        subtitles = extract_text_from_sup("test.sup", max_subtitles=3, workers=2)
+        
+        assert subtitles == ["Line 0", "Line 2", "Line 3"]
+        assert len(ocred) < 10
+
+    def test_session_threads_are_reused_across_files(self, mocker):
+        """OCR for several files runs on the session's threads, which outlive each file."""
+        import threading
+        from tvidentify.subtitle_extractor import SubtitleExtractionSession
+        mocker.patch("tvidentify.subtitle_extractor.PGSReader")
+        ocr_threads = set()
+        def fake_ocr(batch):
+            ocr_threads.add(threading.current_thread().name)
+            return [f"Line {n}" for n in batch]
+        mocker.patch("tvidentify.subtitle_extractor.ocr_images", side_effect=fake_ocr)
+        
+        with SubtitleExtractionSession(ocr_workers=1) as session:
+            for _ in range(2):
+                mocker.patch("tvidentify.subtitle_extractor._iter_subtitle_bitmaps", return_value=iter([(0, 1)]))
+                assert extract_text_from_sup("test.sup", executor=session.ocr_executor) == ["Line 0"]
+        
+        assert len(ocr_threads) == 1
+        assert ocr_threads.pop().startswith("ocr")
+
+    def test_repeated_images_are_ocred_once(self, mocker):
+        """Consecutive repeats of an image (including its fade steps) are OCRed once and their text repeated."""
+        import numpy as np
+        mocker.patch("tvidentify.subtitle_extractor.PGSReader")
+        text = np.zeros((40, 200), dtype=np.uint8)
+        text[10:30, 20:180:10] = 255
+        faded = text // 2
+        other = np.zeros((40, 200), dtype=np.uint8)
+        other[5:35, 100:] = 255
+        mocker.patch("tvidentify.subtitle_extractor._iter_alpha_images",
+                     return_value=iter([text, faded, text, other]))
+        ocr = mocker.patch("tvidentify.subtitle_extractor.ocr_images",
+                           side_effect=lambda batch: [f"Image {len(batch)}"] * len(batch))
+        
+        subtitles = extract_text_from_sup("test.sup", workers=1)
+        
+        ocred = [image for ocr_call in ocr.call_args_list for image in ocr_call.args[0]]
+        assert len(ocred) == 2
+        assert ocred[0] is text and ocred[1] is other
+        assert subtitles == ["Image 2"] * 4
+
+    def test_similar_images_of_the_same_size_are_each_ocred(self, mocker):
+        """Different subtitles that differ in only a few pixels are not merged."""
+        import numpy as np
+        mocker.patch("tvidentify.subtitle_extractor.PGSReader")
+        first = np.zeros((40, 200), dtype=np.uint8)
+        first[10:30, 20:180:10] = 255
+        second = first.copy()
+        second[10:14, 20:24] = 0
+        mocker.patch("tvidentify.subtitle_extractor._iter_alpha_images",
+                     return_value=iter([first, second]))
+        ocr = mocker.patch("tvidentify.subtitle_extractor.ocr_images",
+                           side_effect=lambda batch: [f"Line {i}" for i in range(len(batch))])
+        
+        subtitles = extract_text_from_sup("test.sup", workers=1)
+        
+        ocred = [image for ocr_call in ocr.call_args_list for image in ocr_call.args[0]]
+        assert len(ocred) == 2
+        assert ocred[0] is first and ocred[1] is second
+        assert subtitles == ["Line 0", "Line 1"]
+
+
+class TestCleanSubtitleText:
+    """Tests for cleaning up OCR output."""
+
+    def test_fixes_pipes_and_strips_tags(self):
+        """Line-start pipes become I, SDH tags and notes are removed, whitespace collapses."""
+        text = "|t's me.\n|'m here. | said\n[Door slams] ♪  Hello  (music)"
+        
+        assert clean_subtitle_text(text) == "It's me. I'm here. | said Hello"
+
+
+class TestSubtitleBitmaps:
+    """Tests for reading subtitle images out of a SUP file."""
+
+    def test_blank_images_are_skipped(self, mocker):
+        """Transparent and near-transparent images never reach OCR."""
+        import numpy as np
+        from tvidentify.subtitle_extractor import _iter_alpha_images
+        blank = np.zeros((40, 200), dtype=np.uint8)
+        speck = blank.copy()
+        speck[0:5, 0:5] = 255
+        text = blank.copy()
+        text[10:30, 20:120] = 255
+        mocker.patch("tvidentify.subtitle_extractor.make_alpha_image", side_effect=[blank, speck, text])
+        pgs = MagicMock()
+        pgs.iter_displaysets.return_value = [MagicMock(has_image=True)] * 3
+        
+        assert [alpha is text for alpha in _iter_alpha_images(pgs)] == [True]
+
+
+class TestPreprocessForOcr:
+    """Tests for preparing subtitle images for tesseract."""
+
+    def _alpha_with_glyphs(self, glyph_height):
+        """Builds an alpha channel with two opaque 'glyphs' of the given height."""
+        import numpy as np
+        alpha = np.zeros((60, 200), dtype=np.uint8)
+        alpha[5:5 + glyph_height, 10:20] = 255
+        alpha[5:5 + glyph_height, 30:38] = 255
+        return alpha
+
+    def test_small_text_is_upscaled(self):
+        """10px glyphs are upscaled 3x (plus the 20px border)."""
+        processed = preprocess_for_ocr(self._alpha_with_glyphs(10))
+        
+        assert processed.shape == (60 * 3 + 40, 200 * 3 + 40)
+        assert processed[0, 0] == 255  # white background, black text
+
+    def test_tall_text_is_not_resized(self):
+        """Glyphs already near the target height are left at their size."""
+        processed = preprocess_for_ocr(self._alpha_with_glyphs(40))
+        
+        assert processed.shape == (60 + 40, 200 + 40)
+
+    def test_bgr_image_is_thresholded_and_inverted(self):
+        """Light pixels of a BGR image become black text on white; the 200 cutoff is kept."""
+        import numpy as np
+        bgr = np.zeros((60, 200, 3), dtype=np.uint8)
+        bgr[5:45, 10:20] = 255
+        bgr[5:45, 30:40] = 200
+        
+        processed = preprocess_for_ocr(bgr)
+        
+        assert processed.shape == (60 + 40, 200 + 40)
+        assert processed[25, 35] == 0
+        assert processed[25, 55] == 255
+        assert processed[25, 75] == 255
+
+    def test_upscaled_image_matches_resize_then_border(self):
+        """Resizing into the padded canvas gives the same pixels as resizing, then adding a border."""
+        import cv2
+        import numpy as np
+        alpha = self._alpha_with_glyphs(10)
+        
+        expected = cv2.copyMakeBorder(
+            cv2.resize(255 - alpha, (600, 180), interpolation=cv2.INTER_LINEAR),
+            20, 20, 20, 20, cv2.BORDER_CONSTANT, value=255,
+        )
+        np.testing.assert_array_equal(preprocess_for_ocr(alpha), expected)
+
+
+class TestOcrImages:
+    """Tests for OCR of several images with one tesseract run."""
+
+    def test_one_tesseract_run_for_all_images(self, mocker):
+        """The images are read from an image list and the output split on form feeds."""
+        import numpy as np
+        mocker.patch("tvidentify.subtitle_extractor.tesserocr", None)
+        mock_run = mocker.patch(
+            "subprocess.run",
+            return_value=SimpleNamespace(stdout="First line\n\x0c\x0cl'm third\n\x0c".encode())
+        )
+        
+        texts = ocr_images([np.zeros((10, 40), dtype=np.uint8)] * 3)
+        
+        assert texts == ["First line", "", "I'm third"]
+        mock_run.assert_called_once()
+        assert mock_run.call_args[0][0][1].endswith("imagelist.txt")
+
+    def test_unexpected_page_count_falls_back_to_single_images(self, mocker):
+        """If tesseract's output can't be split per image, each image is OCRed alone."""
+        import numpy as np
+        mocker.patch("tvidentify.subtitle_extractor.tesserocr", None)
+        mocker.patch("subprocess.run", return_value=SimpleNamespace(stdout=b"garbled\x0c"))
+        mock_ocr_image = mocker.patch("tvidentify.subtitle_extractor.ocr_image", return_value="Text")
+        
+        texts = ocr_images([np.zeros((10, 40), dtype=np.uint8)] * 2)
+        
+        assert texts == ["Text", "Text"]
+        assert mock_ocr_image.call_count == 2
+
+
+class TestOcrImagesEasyOcr:
+    """Tests for batched OCR with the optional EasyOCR backend."""
+
+    def test_images_are_padded_and_read_in_one_call(self, mocker):
+        """Images of different sizes go to EasyOCR as one equally-sized batch."""
+        import numpy as np
+        from tvidentify.subtitle_extractor import ocr_images_easyocr
+        reader = MagicMock()
+        reader.readtext_batched.return_value = [["First line"], ["l'm second", "(Music) line two"]]
+        mocker.patch("tvidentify.subtitle_extractor._get_easyocr_reader", return_value=reader)
+        
+        texts = ocr_images_easyocr([np.zeros((10, 40), dtype=np.uint8), np.zeros((30, 90), dtype=np.uint8)])
+        
+        assert texts == ["First line", "I'm second line two"]
+        reader.readtext_batched.assert_called_once()
+        batch = reader.readtext_batched.call_args.args[0]
+        assert len({img.shape for img in batch}) == 1
+
+    def test_missing_easyocr_is_reported(self, mocker):
+        """Asking for EasyOCR without it installed fails cleanly before running ffmpeg."""
+        mocker.patch("tvidentify.subtitle_extractor.EASYOCR_AVAILABLE", False)
+        mock_probe = mocker.patch("tvidentify.subtitle_extractor.find_subtitle_stream")
+        
+        mocker.patch("os.path.exists", return_value=True)
+        assert extract_subtitles("/fake/video.mkv", ocr_backend="easyocr") == []
+        mock_probe.assert_not_called()
+
+
+class TestAlphaImage:
+    """Tests for decoding PGS subtitle images."""
+
+    def test_alpha_image_matches_full_image_alpha(self):
+        """make_alpha_image gives the same alpha channel as make_image, without the colour image."""
+        import numpy as np
+        from tvidentify.imagemaker import make_alpha_image, make_image
+        from tvidentify.pgsreader import PGSReader
+        
+        sup_path = os.path.join(os.path.dirname(__file__), "fixtures", "test_subtitle.sup")
+        if not os.path.exists(sup_path):
+            pytest.skip("Test fixture not found. Run: python tests/generate_fixtures.py")
+        
+        display_sets = [ds for ds in PGSReader(sup_path).iter_displaysets() if ds.has_image]
+        assert display_sets
+        for ds in display_sets:
+            expected = np.array(make_image(ds.ods[0], ds.pds[0]).convert("RGBA"))[:, :, 3]
+            np.testing.assert_array_equal(make_alpha_image(ds.ods[0], ds.pds[0]), expected)
+
+
+class TestOcrImage:
+    """Tests for OCR of a single subtitle image."""
+
+    def test_tesserocr_session_used_when_installed(self, mocker):
+        """With tesserocr available, OCR runs in-process and pytesseract is not called."""
+        import numpy as np
+        mock_tesserocr = mocker.patch("tvidentify.subtitle_extractor.tesserocr")
+        mocker.patch("tvidentify.subtitle_extractor._tesserocr_local", MagicMock(api=None))
+        mock_tesserocr.PyTessBaseAPI.return_value.GetUTF8Text.return_value = "l'm here\n"
+        mock_pytesseract = mocker.patch("tvidentify.subtitle_extractor.pytesseract")
+        
+        image = np.zeros((10, 40, 4), dtype=np.uint8)
+        first = ocr_image(image)
+        second = ocr_image(image)
+        
+        assert first == second == "I'm here"
+        mock_tesserocr.PyTessBaseAPI.assert_called_once()
+        mock_pytesseract.image_to_string.assert_not_called()
+
+    def test_image_is_piped_to_tesseract_without_tesserocr(self, mocker):
+        """Without tesserocr, the image goes to tesseract's stdin as a PGM, not via a file."""
+        import numpy as np
+        mocker.patch("tvidentify.subtitle_extractor.tesserocr", None)
+        mock_run = mocker.patch("subprocess.run", return_value=SimpleNamespace(stdout=b"l'm here\n\x0c"))
+        
+        text = ocr_image(np.zeros((10, 40), dtype=np.uint8))
+        
+        assert text == "I'm here"
+        command = mock_run.call_args.args[0]
+        assert command[1:3] == ['stdin', 'stdout']
+        assert mock_run.call_args.kwargs["input"].startswith(b"P5")
+
+    def test_tesseract_process_alone_gets_the_omp_thread_limit(self, mocker):
+        """tesseract runs with OMP_THREAD_LIMIT=1 without it being set for the whole process."""
+        import numpy as np
+        mocker.patch("tvidentify.subtitle_extractor.tesserocr", None)
+        mocker.patch.dict("os.environ", clear=True)
+        mock_run = mocker.patch("subprocess.run", return_value=SimpleNamespace(stdout=b"Hello\n\x0c"))
+        
+        ocr_image(np.zeros((10, 40), dtype=np.uint8))
+        
+        assert mock_run.call_args.kwargs["env"]["OMP_THREAD_LIMIT"] == "1"
+        assert "OMP_THREAD_LIMIT" not in os.environ
+
+
+@pytest.fixture
+def patched_extract(mocker):
+    """Patches extract_subtitles as seen by batch_identifier; set its return_value or side_effect."""
+    return mocker.patch.object(batch_identifier, "extract_subtitles")
 
 
 class TestSubtitleFingerprint:
     """Tests for subtitle fingerprinting (duplicate detection)."""
 
-    def test_fingerprint_returns_consistent_hash(self, mocker):
+    def test_fingerprint_returns_consistent_hash(self, patched_extract):
         """Same subtitles produce the same fingerprint."""
-        subtitles = ["Line one", "Line two", "Line three"]
-        
-        # Mock extract_subtitles to return our fixed subtitles
-        mocker.patch(
-            "tvidentify.batch_identifier.extract_subtitles",
-            return_value=subtitles
-        )
+        patched_extract.return_value = ["Line one", "Line two", "Line three"]
         
         fp1, subs1 = get_subtitle_fingerprint("/video1.mkv", 0, 0, 15)
         fp2, subs2 = get_subtitle_fingerprint("/video2.mkv", 0, 0, 15)
@@ -160,49 +560,158 @@ class TestSubtitleFingerprint:
         assert fp1 == fp2
         assert subs1 == subs2
 
-    def test_fingerprint_detects_duplicates(self, mocker):
+    def test_fingerprint_detects_duplicates(self, patched_extract):
         """Two files with same subtitles have same fingerprint."""
-        subtitles = ["I am the one who knocks!", "Say my name."]
-        
-        mocker.patch(
-            "tvidentify.batch_identifier.extract_subtitles",
-            return_value=subtitles
-        )
+        patched_extract.return_value = ["I am the one who knocks!", "Say my name."]
         
         fp1, _ = get_subtitle_fingerprint("/episode_copy1.mkv", 0, 0, 15)
         fp2, _ = get_subtitle_fingerprint("/episode_copy2.mkv", 0, 0, 15)
         
         assert fp1 == fp2
 
-    def test_fingerprint_different_for_different_content(self, mocker):
+    def test_fingerprint_different_for_different_content(self, patched_extract):
         """Different subtitles produce different fingerprints."""
-        call_count = [0]
-        
-        def mock_extract(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return ["Episode one dialogue"]
-            else:
-                return ["Episode two dialogue"]
-        
-        mocker.patch(
-            "tvidentify.batch_identifier.extract_subtitles",
-            side_effect=mock_extract
-        )
+        patched_extract.side_effect = [["Episode one dialogue"], ["Episode two dialogue"]]
         
         fp1, _ = get_subtitle_fingerprint("/episode1.mkv", 0, 0, 15)
         fp2, _ = get_subtitle_fingerprint("/episode2.mkv", 0, 0, 15)
         
         assert fp1 != fp2
 
-    def test_fingerprint_returns_none_for_no_subtitles(self, mocker):
+    def test_fingerprint_respects_subtitle_boundaries(self, patched_extract):
+        """Subtitles that join to the same text still produce different fingerprints."""
+        patched_extract.side_effect = [["ab", "c"], ["a", "bc"]]
+        
+        fp1, _ = get_subtitle_fingerprint("/episode1.mkv", 0, 0, 15)
+        fp2, _ = get_subtitle_fingerprint("/episode2.mkv", 0, 0, 15)
+        
+        assert isinstance(fp1, bytes)
+        assert fp1 != fp2
+
+    def test_fingerprint_returns_none_for_no_subtitles(self, patched_extract):
         """When extraction fails, returns (None, None)."""
-        mocker.patch(
-            "tvidentify.batch_identifier.extract_subtitles",
-            return_value=[]
-        )
+        patched_extract.return_value = []
         
         fp, subs = get_subtitle_fingerprint("/video.mkv", 0, 0, 15)
         
         assert fp is None
         assert subs is None
+
+
+class TestDuplicateDetection:
+    """Tests for sharing one identification between files with the same fingerprint."""
+
+    @staticmethod
+    def _args():
+        return SimpleNamespace(
+            skip_already_named=False, rename=False, output_dir=None, no_cache=True,
+            subtitle_track=0, offset=0, scan_duration=15, max_frames=10, ocr_backend="tesseract",
+            series_name="Series", model="gemini-2.5-flash", provider="google", dedupe=True,
+            early_exit_threshold=None,
+        )
+
+    def test_duplicate_of_file_without_result_is_identified_itself(self, mocker):
+        """A file waiting on a fingerprint whose owner ends without a result identifies itself."""
+        import threading
+        fingerprint = b"\x00" * 16
+        mocker.patch.object(batch_identifier, "get_subtitle_fingerprint", side_effect=[
+            (fingerprint, []),
+            (fingerprint, ["Line one"]),
+        ])
+        mock_identify = mocker.patch.object(
+            batch_identifier, "identify_episode", return_value={"season": 1, "episode": 2}
+        )
+        cache = batch_identifier._FingerprintCache()
+        args = self._args()
+        results = {}
+        
+        def process(index, name):
+            results[index] = batch_identifier._process_video_file(index, name, args, cache)
+        
+        threads = [threading.Thread(target=process, args=(i, name), daemon=True)
+                   for i, name in enumerate(["/first.mkv", "/second.mkv"])]
+        for thread in threads:
+            thread.start()
+            thread.join(timeout=5)
+        
+        assert not any(thread.is_alive() for thread in threads)
+        assert results[0]["error"] == "Could not extract subtitles."
+        assert "duplicate_of" not in results[1]
+        assert results[1]["episode"] == 2
+        mock_identify.assert_called_once()
+
+
+class TestFingerprintStore:
+    """Tests for the persistent fingerprint cache."""
+
+    def test_store_hit_skips_extraction(self, patched_extract, tmp_path):
+        """An unchanged file is fingerprinted from the store without extraction."""
+        video = tmp_path / "episode.mkv"
+        video.write_bytes(b"fake")
+        patched_extract.return_value = ["Line one", "Line two"]
+        store = {}
+        
+        fp1, subs1 = get_subtitle_fingerprint(str(video), 0, 0, 15, store=store)
+        fp2, subs2 = get_subtitle_fingerprint(str(video), 0, 0, 15, store=store)
+        
+        assert patched_extract.call_count == 1
+        assert fp1 == fp2
+        assert subs1 == subs2
+
+    def test_store_misses_when_settings_change(self, patched_extract, tmp_path):
+        """Different extraction settings do not reuse a cached entry."""
+        video = tmp_path / "episode.mkv"
+        video.write_bytes(b"fake")
+        patched_extract.return_value = ["Line one"]
+        store = {}
+        
+        get_subtitle_fingerprint(str(video), 0, 0, 15, store=store)
+        get_subtitle_fingerprint(str(video), 0, 5, 15, store=store)
+        
+        assert patched_extract.call_count == 2
+
+    @pytest.mark.parametrize("entry", [
+        {"fingerprint": "not hex"},
+        {"fingerprint": "00ff", "subtitles": []},
+        {"fingerprint": "00ff", "subtitles": [1, 2]},
+    ])
+    def test_unusable_store_entry_is_a_miss(self, patched_extract, tmp_path, entry):
+        """A malformed or empty cached entry is re-extracted and replaced instead of used."""
+        video = tmp_path / "episode.mkv"
+        video.write_bytes(b"fake")
+        patched_extract.return_value = ["Line one"]
+        store = {}
+        get_subtitle_fingerprint(str(video), 0, 0, 15, store=store)
+        (key,) = store
+        store[key] = entry
+        
+        fp, subs = get_subtitle_fingerprint(str(video), 0, 0, 15, store=store)
+        
+        assert subs == ["Line one"]
+        assert store[key]["fingerprint"] == fp.hex()
+        assert patched_extract.call_count == 2
+
+    def test_prune_drops_entries_for_missing_or_changed_files(self, patched_extract, tmp_path):
+        """Entries whose file was removed or modified are dropped; others are kept."""
+        patched_extract.return_value = ["Line one"]
+        store = {}
+        for name in ("kept.mkv", "deleted.mkv", "changed.mkv"):
+            (tmp_path / name).write_bytes(b"fake")
+            get_subtitle_fingerprint(str(tmp_path / name), 0, 0, 15, store=store)
+        store["older-format"] = {"fingerprint": "00ff", "subtitles": ["Line one"]}
+        (tmp_path / "deleted.mkv").unlink()
+        (tmp_path / "changed.mkv").write_bytes(b"longer fake")
+        
+        pruned = _prune_fingerprint_store(store)
+        
+        assert [entry["path"] for entry in pruned.values()] == [str(tmp_path / "kept.mkv")]
+
+    def test_store_round_trips_through_disk(self, tmp_path):
+        """Saved stores load back unchanged; missing files load as empty."""
+        path = str(tmp_path / "nested" / "fingerprints.json")
+        assert load_fingerprint_store(path) == {}
+        
+        store = {"key": {"fingerprint": "00ff", "subtitles": ["Line one"]}}
+        save_fingerprint_store(store, path)
+        
+        assert load_fingerprint_store(path) == store